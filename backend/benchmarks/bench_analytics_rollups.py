@@ -0,0 +1,131 @@
+"""
+Dashboard analytics: aggregates over the raw tables vs. the hourly / daily rollups.
+For each dataset size, seeds a scratch SQLite database (same synthetic data as
+bench_query_plans) with the indexes in place and applies the rollup migration, which
+backfills the rollups from the seeded rows. Then times the summary and a 30-day timeline
+the way the routes used to compute them (eight aggregates; one COUNT per day) and from
+the rollups (one query each), and checks both give the same numbers.
+
+Usage (from backend/):
+    python benchmarks/bench_analytics_rollups.py [--sizes 100000,1000000] [--runs 10]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+DAYS = 30
+
+
+async def raw_summary(db) -> dict:
+    from sqlalchemy import func, select
+    from models.entities import Conversation, Message
+
+    async def scalar(stmt):
+        return (await db.execute(stmt)).scalar() or 0
+
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    count_conversations = select(func.count()).select_from(Conversation)
+    count_messages = select(func.count()).select_from(Message)
+    sentiment_sum, sentiment_count = (await db.execute(
+        select(func.sum(Message.sentiment_score), func.count(Message.sentiment_score))
+    )).one()
+    emotions = await db.execute(
+        select(Message.emotion, func.count()).where(Message.emotion.isnot(None))
+        .group_by(Message.emotion).order_by(func.count().desc()).limit(5)
+    )
+    return {
+        "total_conversations": await scalar(count_conversations),
+        "active_conversations": await scalar(count_conversations.where(Conversation.status == "active")),
+        "escalated_conversations": await scalar(count_conversations.where(Conversation.status == "escalated")),
+        "conversations_today": await scalar(count_conversations.where(Conversation.started_at >= today)),
+        "total_messages": await scalar(count_messages),
+        "urgent_messages": await scalar(count_messages.where(Message.is_urgent == True)),  # noqa: E712
+        "avg_sentiment": round(sentiment_sum / sentiment_count, 4) if sentiment_count else 0.0,
+        "top_emotions": dict(emotions.all()),
+    }
+
+
+async def raw_timeline(db) -> list:
+    from sqlalchemy import func, select
+    from models.entities import Conversation
+
+    data = []
+    for i in range(DAYS - 1, -1, -1):
+        day_start = (datetime.utcnow() - timedelta(days=i)).replace(hour=0, minute=0, second=0, microsecond=0)
+        count = await db.execute(
+            select(func.count()).select_from(Conversation).where(
+                Conversation.started_at >= day_start, Conversation.started_at < day_start + timedelta(days=1),
+            )
+        )
+        data.append((day_start.strftime("%Y-%m-%d"), count.scalar() or 0))
+    return data
+
+
+async def rollup_timeline(db) -> list:
+    from services import analytics_rollups
+    end = analytics_rollups.truncate(datetime.utcnow(), "day") + timedelta(days=1)
+    data = await analytics_rollups.timeline(db, end - timedelta(days=DAYS), end, "day")
+    return [(d["date"], d["conversations"]) for d in data]
+
+
+async def measure(runs: int) -> dict:
+    from models.database import async_session, engine
+    from services import analytics_rollups
+
+    out = {}
+    for name, fn in (
+        ("summary (raw)", raw_summary), ("summary (rollup)", analytics_rollups.summary),
+        ("timeline (raw)", raw_timeline), ("timeline (rollup)", rollup_timeline),
+    ):
+        timings = []
+        for _ in range(runs + 1):  # first run warms the connection and page cache
+            async with async_session() as db:
+                started = time.perf_counter()
+                result = await fn(db)
+                timings.append((time.perf_counter() - started) * 1000)
+        out[name] = (statistics.median(timings[1:]), result)
+    await engine.dispose()
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="100000,1000000", help="message counts, comma separated")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    scratch = tempfile.TemporaryDirectory()
+    path = os.path.join(scratch.name, "rollups.db")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+    from loguru import logger
+    logger.remove()
+    from bench_query_plans import migrate, seed  # after DATABASE_URL: it imports the app's engine
+
+    print(f"{'messages':>10}{'backfill s':>12}{'summary raw':>13}{'rollup':>9}"
+          f"{'timeline raw':>14}{'rollup':>9}  same results")
+    for size in (int(s) for s in args.sizes.split(",")):
+        if os.path.exists(path):
+            os.remove(path)
+        migrate(path, "0005")
+        seed(path, size)
+        started = time.perf_counter()
+        migrate(path, "head")
+        backfill = time.perf_counter() - started
+        r = asyncio.run(measure(args.runs))
+        same = r["summary (raw)"][1] == r["summary (rollup)"][1] and r["timeline (raw)"][1] == r["timeline (rollup)"][1]
+        print(f"{size:>10}{backfill:>12.2f}{r['summary (raw)'][0]:>13.2f}{r['summary (rollup)'][0]:>9.2f}"
+              f"{r['timeline (raw)'][0]:>14.2f}{r['timeline (rollup)'][0]:>9.2f}  {same}")
+    print(f"\nms: median per call; timeline covers {DAYS} days. backfill: rollup migration.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Cold-month archival: database size and hot-table queries before vs. after, and archive reads.
+Seeds a scratch SQLite database (same synthetic data as bench_query_plans, spread over a
+year), times a few queries that still touch the raw messages table, then archives every
+month older than --retention months with services.archival and reports the archival
+time, archive size, database size (after VACUUM) and the same queries on the hot set,
+plus on-demand reads from the archive: one month, and one conversation's messages.
+
+Usage (from backend/):
+    python benchmarks/bench_archival.py [--sizes 100000,1000000] [--retention 3] [--runs 5]
+"""
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+QUERIES = {
+    "urgent messages": "SELECT count(*) FROM messages WHERE is_urgent = 1",
+    "top emotions": "SELECT emotion, count(*) FROM messages WHERE emotion IS NOT NULL"
+                    " GROUP BY emotion ORDER BY count(*) DESC LIMIT 5",
+    "last 7 days": "SELECT count(*) FROM messages WHERE created_at >= datetime('now', '-7 days')",
+}
+
+
+def time_queries(path: str, runs: int) -> dict:
+    db = sqlite3.connect(path)
+    out = {}
+    for name, sql in QUERIES.items():
+        timings = []
+        for _ in range(runs + 1):  # first run warms the page cache
+            started = time.perf_counter()
+            db.execute(sql).fetchall()
+            timings.append((time.perf_counter() - started) * 1000)
+        out[name] = statistics.median(timings[1:])
+    db.close()
+    return out
+
+
+def size_mb(path: str) -> float:
+    db = sqlite3.connect(path)
+    db.execute("VACUUM")
+    db.close()
+    return os.path.getsize(path) / 2**20
+
+
+async def run_archive() -> list:
+    from models.database import engine
+    from services import archival
+    manifests = await archival.archive()
+    await engine.dispose()
+    return manifests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="100000,1000000", help="message counts, comma separated")
+    parser.add_argument("--retention", type=int, default=3, help="full months kept in the database")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    scratch = tempfile.TemporaryDirectory()
+    path = os.path.join(scratch.name, "archival.db")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+    os.environ["ARCHIVE_RETENTION_MONTHS"] = str(args.retention)
+    from loguru import logger
+    logger.remove()
+    from bench_query_plans import migrate, seed  # after DATABASE_URL: it imports the app's engine
+    from config import settings
+    from services import archival
+
+    for size in (int(s) for s in args.sizes.split(",")):
+        if os.path.exists(path):
+            os.remove(path)
+        settings.ARCHIVE_DIR = os.path.join(scratch.name, f"archive-{size}")
+        migrate(path, "head")
+        conversations = seed(path, size, days=365)
+        before_mb, before = size_mb(path), time_queries(path, args.runs)
+
+        started = time.perf_counter()
+        manifests = asyncio.run(run_archive())
+        elapsed = time.perf_counter() - started
+        after_mb, after = size_mb(path), time_queries(path, args.runs)
+        rows = sum(m["rows"] for m in manifests)
+        archive_mb = sum(m["bytes"] for m in manifests) / 2**20
+
+        month = min(m["month"] for m in manifests)
+        first = datetime.strptime(month, "%Y-%m")
+        started = time.perf_counter()
+        month_rows = sum(1 for _ in archival.read_archive("messages", first, archival.add_months(first, 1)))
+        month_ms = (time.perf_counter() - started) * 1000
+        oldest = min(conversations, key=lambda c: c[7])[0]
+        started = time.perf_counter()
+        conversation_rows = sum(1 for _ in archival.read_archive("messages", conversation_id=oldest))
+        conversation_ms = (time.perf_counter() - started) * 1000
+
+        print(f"\n{size} messages, {len(manifests)} months archived ({rows} rows, both tables) in {elapsed:.1f}s")
+        print(f"  database {before_mb:.1f} MB -> {after_mb:.1f} MB; archive files {archive_mb:.1f} MB")
+        print(f"  {'query':<18}{'before ms':>11}{'after ms':>10}")
+        for name in QUERIES:
+            print(f"  {name:<18}{before[name]:>11.2f}{after[name]:>10.2f}")
+        print(f"  archive read: month {month} ({month_rows} rows) {month_ms:.0f} ms;"
+              f" one conversation ({conversation_rows} rows, full scan) {conversation_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Conversation list page: per-row COUNT queries vs. the stored message_count.
+For each dataset size, seeds a scratch SQLite database (same synthetic data as
+bench_query_plans), applies the message_count migration and times one list page the
+way the endpoint used to build it (page query + one COUNT per conversation) and the
+way it does now (one query), through the app's async SQLAlchemy stack.
+
+Usage (from backend/):
+    python benchmarks/bench_conversation_list.py [--sizes 1000,100000,1000000] [--limit 50] [--runs 20]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, select  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from bench_query_plans import migrate, seed  # noqa: E402
+from models.entities import Conversation, Message  # noqa: E402
+
+
+async def page_per_row_counts(db, limit: int):
+    conversations = (await db.execute(
+        select(Conversation).order_by(Conversation.started_at.desc()).limit(limit)
+    )).scalars().all()
+    counts = []
+    for conv in conversations:
+        counts.append((await db.execute(
+            select(func.count()).select_from(Message).where(Message.conversation_id == conv.id)
+        )).scalar())
+    return counts
+
+
+async def page_stored_count(db, limit: int):
+    conversations = (await db.execute(
+        select(Conversation).order_by(Conversation.started_at.desc()).limit(limit)
+    )).scalars().all()
+    return [conv.message_count for conv in conversations]
+
+
+async def measure(path: str, limit: int, runs: int) -> dict:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session = async_sessionmaker(engine, expire_on_commit=False)
+    out = {}
+    for name, page in (("per-row counts", page_per_row_counts), ("stored count", page_stored_count)):
+        timings = []
+        for _ in range(runs + 1):  # first run warms the connection and page cache
+            async with session() as db:
+                started = time.perf_counter()
+                counts = await page(db, limit)
+                timings.append((time.perf_counter() - started) * 1000)
+        out[name] = (statistics.median(timings[1:]), counts)
+    await engine.dispose()
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1000,100000,1000000", help="message counts, comma separated")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'messages':>10}{'backfill s':>12}{'per-row ms':>12}{'stored ms':>11}{'speedup':>10}  counts match")
+    for size in (int(s) for s in args.sizes.split(",")):
+        with tempfile.TemporaryDirectory() as scratch:
+            path = os.path.join(scratch, "list.db")
+            migrate(path, "0003")
+            seed(path, size)
+            started = time.perf_counter()
+            migrate(path, "head")
+            backfill = time.perf_counter() - started
+            result = asyncio.run(measure(path, args.limit, args.runs))
+        (old, old_counts), (new, new_counts) = result["per-row counts"], result["stored count"]
+        print(f"{size:>10}{backfill:>12.2f}{old:>12.2f}{new:>11.2f}{old / new:>9.1f}x  {old_counts == new_counts}")
+    print(f"\nms: median time to build one page of {args.limit} conversations; backfill: migration 0004.")
+
+
+if __name__ == "__main__":
+    main()
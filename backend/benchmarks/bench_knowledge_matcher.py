@@ -0,0 +1,111 @@
+"""
+Per-turn cost of the demo/knowledge responder lookups — legacy per-key regex loops
+vs. the precompiled KeywordMatcher tables.
+
+Usage (from backend/):
+    python benchmarks/bench_knowledge_matcher.py [--turns 2000]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import ai_service  # noqa: E402
+from services.response_pack import get_pack  # noqa: E402
+
+PACK = get_pack()
+
+CORPUS = [
+    "hi there",
+    "what is the capital of france",
+    "tell me about artificial intelligence",
+    "how does faiss work in this project",
+    "i want a refund for my order",
+    "what is quantum physics",
+    "explain the database design please",
+    "who is einstein",
+    "my password is not working",
+    "what's the weather like today",
+    "tell me a random fact about space",
+    "what are your business hours",
+    "i feel really stressed about my exam",
+    "can you tell me something nobody knows",
+]
+
+
+# ── Legacy implementations (as shipped before the precompiled tables) ──
+def _legacy_kw(text, key):
+    return bool(re.compile(r'\b' + re.escape(key) + r'\b', re.IGNORECASE).search(text))
+
+
+def _legacy_find_capital(text):
+    for country in PACK.capitals:
+        if country != 'default' and _legacy_kw(text, country):
+            return PACK.capitals[country]
+    if re.search(r'\bcapital\b', text, re.IGNORECASE):
+        return PACK.capitals['default']
+    return None
+
+
+def _legacy_knowledge_key(text):
+    for key in sorted(PACK.knowledge, key=len, reverse=True):
+        if _legacy_kw(text, key):
+            return key
+    return None
+
+
+def _legacy_support_key(text):
+    for key in PACK.support:
+        if _legacy_kw(text, key):
+            return key
+    return None
+
+
+def legacy_turn(text):
+    return _legacy_find_capital(text), _legacy_knowledge_key(text), _legacy_support_key(text)
+
+
+def compiled_turn(text):
+    return (
+        ai_service._find_capital(text),
+        PACK.knowledge_matcher.longest(text),
+        PACK.support_matcher.first(text),
+    )
+
+
+def _bench(fn, texts):
+    start = time.perf_counter()
+    for t in texts:
+        fn(t)
+    return (time.perf_counter() - start) / len(texts) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--turns", type=int, default=2000)
+    args = parser.parse_args()
+
+    # Results must be identical before we compare speed
+    for text in CORPUS:
+        assert legacy_turn(text) == compiled_turn(text), text
+
+    rng = random.Random(7)
+    texts = [rng.choice(CORPUS) for _ in range(args.turns)]
+
+    legacy_us = _bench(legacy_turn, texts)
+    compiled_us = _bench(compiled_turn, texts)
+
+    print(f"keys: knowledge={len(PACK.knowledge_matcher)} "
+          f"capitals={len(PACK.capital_matcher)} support={len(PACK.support_matcher)}")
+    print(f"legacy    : {legacy_us:9.1f} µs/turn")
+    print(f"compiled  : {compiled_us:9.1f} µs/turn")
+    print(f"speed-up  : {legacy_us / compiled_us:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Tail-latency benchmark for hedged LLM requests against local stand-in servers.
+Starts two OpenAI-compatible stub servers with injected latency (a fast body and a
+slow tail, plus optional errors), then runs the same workload with hedging off and on
+and reports p50 / p95 / p99 and hedge / failover counts.
+
+Usage (from backend/):
+    python benchmarks/bench_llm_hedging.py [--requests 300] [--tail 0.08] [--tail-ms 1500] [--errors 0.02]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uvicorn  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from loguru import logger  # noqa: E402
+
+from config import settings  # noqa: E402
+from services import llm_providers  # noqa: E402
+
+
+def stub_app(name: str, rng: random.Random, base_ms: float, tail: float, tail_ms: float, errors: float) -> FastAPI:
+    """An OpenAI-compatible /v1/chat/completions stub with injected latency and failures."""
+    app = FastAPI()
+
+    @app.post("/v1/chat/completions")
+    async def completions(body: dict):
+        delay = tail_ms if rng.random() < tail else rng.uniform(0.5, 1.5) * base_ms
+        await asyncio.sleep(delay / 1000)
+        if rng.random() < errors:
+            return JSONResponse({"error": {"message": "injected failure", "type": "server_error"}}, status_code=500)
+        return {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", name),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": f"answer from {name}"},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 4, "total_tokens": 14},
+        }
+
+    return app
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def start_server(app: FastAPI) -> tuple:
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="error"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    return server, task, f"http://127.0.0.1:{port}/v1"
+
+
+async def run(requests: int, concurrency: int) -> list:
+    sem = asyncio.Semaphore(concurrency)
+    latencies, failures = [], 0
+
+    async def one(i: int):
+        nonlocal failures
+        async with sem:
+            started = time.perf_counter()
+            try:
+                await llm_providers.hedged_complete([{"role": "user", "content": f"question {i}"}])
+            except Exception:
+                failures += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return latencies, failures
+
+
+def pct(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--base-ms", type=float, default=60)
+    parser.add_argument("--tail", type=float, default=0.08, help="share of requests hitting the slow tail")
+    parser.add_argument("--tail-ms", type=float, default=1500)
+    parser.add_argument("--errors", type=float, default=0.02, help="primary error rate")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    logger.remove()  # per-request hedge / failover logs would drown the table
+
+    rng = random.Random(args.seed)
+    primary = await start_server(stub_app("primary", rng, args.base_ms, args.tail, args.tail_ms, args.errors))
+    backup = await start_server(stub_app("backup", rng, args.base_ms * 1.5, args.tail / 2, args.tail_ms, 0.0))
+
+    settings.OPENAI_BASE_URL = primary[2]
+    settings.OPENAI_API_KEY = "stub"
+    settings.OPENAI_MODEL = "stub-primary"
+    settings.LLM_BACKUP_MODEL = "stub-backup"
+    settings.LLM_BACKUP_BASE_URL = backup[2]
+    settings.LLM_HEDGE_MIN_DELAY_SECONDS = 0.05
+    settings.LLM_HEDGE_DEFAULT_DELAY_SECONDS = 0.5
+
+    print(f"{'mode':<10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'failed':>8}"
+          f"{'hedges':>8}{'failovers':>11}{'hedge wins':>12}")
+    for hedge in (False, True):
+        settings.LLM_HEDGE_ENABLED = hedge
+        llm_providers.reset_providers()
+        llm_providers._stats.update(requests=0, hedges=0, hedge_wins=0, failovers=0)
+        # Warm the latency window so the hedge delay tracks the observed p95
+        await run(settings.LLM_HEDGE_MIN_SAMPLES * 2, args.concurrency)
+        llm_providers._stats.update(requests=0, hedges=0, hedge_wins=0, failovers=0)
+
+        latencies, failed = await run(args.requests, args.concurrency)
+        s = llm_providers._stats
+        print(f"{'hedged' if hedge else 'single':<10}{statistics.median(latencies):>10.1f}"
+              f"{pct(latencies, 0.95):>10.1f}{pct(latencies, 0.99):>10.1f}{max(latencies):>10.1f}"
+              f"{failed:>8}{s['hedges']:>8}{s['failovers']:>11}{s['hedge_wins']:>12}")
+
+    for server, task, _ in (primary, backup):
+        server.should_exit = True
+        await task
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
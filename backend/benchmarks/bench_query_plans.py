@@ -0,0 +1,184 @@
+"""
+Query plans and latencies of the hot read paths before and after the index migration.
+Builds a scratch SQLite database at the revision before the indexes (0002), seeds it
+with synthetic conversations, messages and analytics events, times the analytics and
+conversation-list queries and prints their plans, then upgrades to head and repeats.
+
+Usage (from backend/):
+    python benchmarks/bench_query_plans.py [--messages 1000000] [--runs 5] [--keep path.db]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+
+from models.database import _ALEMBIC_INI  # noqa: E402
+
+EMOTIONS = ["very_positive", "positive", "neutral", "negative", "very_negative"]
+STATUSES = ["active"] * 2 + ["closed"] * 7 + ["escalated"]
+
+NOW = datetime.utcnow().replace(microsecond=0)
+TODAY = NOW.replace(hour=0, minute=0, second=0)
+DEEP_OFFSET = 20_000  # conversation list page reached by offset vs. by cursor
+
+
+def migrate(path: str, revision: str):
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        cfg = Config(_ALEMBIC_INI)
+        cfg.attributes["connection"] = conn
+        command.upgrade(cfg, revision)
+    engine.dispose()
+
+
+def seed(path: str, n_messages: int, per_conversation: int = 20, days: int = 90):
+    rng = random.Random(42)
+    db = sqlite3.connect(path)
+    db.execute("PRAGMA journal_mode = OFF")
+    db.execute("PRAGMA synchronous = OFF")
+    n_conv = max(1, n_messages // per_conversation)
+    conversations = []
+    for _ in range(n_conv):
+        started = NOW - timedelta(seconds=rng.randint(0, days * 86400))
+        conversations.append((str(uuid.uuid4()), "web", "en", rng.choice(STATUSES), 0.0, 0, 0.0, started))
+    db.executemany(
+        "INSERT INTO conversations (id, channel, language, status, sentiment_avg, sentiment_count,"
+        " sentiment_sum, started_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", conversations,
+    )
+
+    def messages():
+        for i in range(n_messages):
+            conv_id, started = conversations[i % n_conv][0], conversations[i % n_conv][7]
+            user = i % 2 == 0
+            yield (
+                str(uuid.uuid4()), conv_id, "user" if user else "assistant", "message text",
+                rng.uniform(-1, 1) if user else None,
+                rng.choice(EMOTIONS) if user else None,
+                user and rng.random() < 0.03,
+                started + timedelta(seconds=i // n_conv * 5),
+            )
+
+    db.executemany(
+        "INSERT INTO messages (id, conversation_id, role, content, sentiment_score, emotion, is_urgent,"
+        " created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", messages(),
+    )
+    db.executemany(
+        "INSERT INTO analytics_events (id, event_type, conversation_id, created_at) VALUES (?, ?, ?, ?)",
+        (
+            (str(uuid.uuid4()), "text_interaction", c[0], c[7] + timedelta(seconds=rng.randint(0, 600)))
+            for c in conversations for _ in range(per_conversation // 2)
+        ),
+    )
+    db.commit()
+    db.close()
+    return conversations
+
+
+def queries(sample_conversation: str, deep_key: tuple):
+    day_start = TODAY - timedelta(days=3)
+    return {
+        "active conversations": ("SELECT count(*) FROM conversations WHERE status = ?", ("active",)),
+        "conversations today": ("SELECT count(*) FROM conversations WHERE started_at >= ?", (TODAY,)),
+        "timeline day": (
+            "SELECT count(*) FROM conversations WHERE started_at >= ? AND started_at < ?",
+            (day_start, day_start + timedelta(days=1)),
+        ),
+        "urgent messages": ("SELECT count(*) FROM messages WHERE is_urgent = 1", ()),
+        "top emotions": (
+            "SELECT emotion, count(*) FROM messages WHERE emotion IS NOT NULL"
+            " GROUP BY emotion ORDER BY count(*) DESC LIMIT 5", (),
+        ),
+        "list page (newest)": (
+            "SELECT * FROM conversations ORDER BY started_at DESC, id DESC LIMIT 50 OFFSET 0", (),
+        ),
+        "list page (status)": (
+            "SELECT * FROM conversations WHERE status = ? ORDER BY started_at DESC, id DESC LIMIT 50", ("escalated",),
+        ),
+        "deep page (offset)": (
+            f"SELECT * FROM conversations ORDER BY started_at DESC, id DESC LIMIT 50 OFFSET {DEEP_OFFSET}", (),
+        ),
+        "deep page (cursor)": (
+            "SELECT * FROM conversations WHERE (started_at, id) < (?, ?)"
+            " ORDER BY started_at DESC, id DESC LIMIT 50", deep_key,
+        ),
+        "message count (1 conv)": (
+            "SELECT count(*) FROM messages WHERE conversation_id = ?", (sample_conversation,),
+        ),
+        "conversation history": (
+            "SELECT * FROM messages WHERE conversation_id = ? ORDER BY created_at", (sample_conversation,),
+        ),
+        "events last 24h": (
+            "SELECT count(*) FROM analytics_events WHERE created_at >= ?", (NOW - timedelta(days=1),),
+        ),
+    }
+
+
+def measure(path: str, sample_conversation: str, deep_key: tuple, runs: int) -> dict:
+    db = sqlite3.connect(path)
+    db.execute("ANALYZE")
+    out = {}
+    for name, (sql, params) in queries(sample_conversation, deep_key).items():
+        params = tuple(p.isoformat(" ") if isinstance(p, datetime) else p for p in params)
+        plan = "; ".join(row[3] for row in db.execute("EXPLAIN QUERY PLAN " + sql, params))
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            db.execute(sql, params).fetchall()
+            timings.append((time.perf_counter() - started) * 1000)
+        out[name] = (statistics.median(timings), plan)
+    db.close()
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--keep", default=None, help="write the seeded database here instead of a temp dir")
+    args = parser.parse_args()
+
+    scratch = tempfile.TemporaryDirectory()
+    path = args.keep or os.path.join(scratch.name, "plans.db")
+    if os.path.exists(path):
+        os.remove(path)
+
+    migrate(path, "0002")
+    started = time.perf_counter()
+    conversations = seed(path, args.messages)
+    print(f"seeded {len(conversations)} conversations / {args.messages} messages "
+          f"in {time.perf_counter() - started:.1f}s\n")
+    sample = conversations[len(conversations) // 2][0]
+    # Sort key of the row just before the deep page, i.e. the cursor a client would hold
+    newest = sorted(((c[7], c[0]) for c in conversations), reverse=True)
+    deep_key = newest[min(DEEP_OFFSET, len(newest)) - 1]
+
+    before = measure(path, sample, deep_key, args.runs)
+    started = time.perf_counter()
+    migrate(path, "head")
+    print(f"index migration: {time.perf_counter() - started:.1f}s\n")
+    after = measure(path, sample, deep_key, args.runs)
+
+    print(f"{'query':<26}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+    for name in before:
+        b, a = before[name][0], after[name][0]
+        print(f"{name:<26}{b:>12.2f}{a:>12.2f}{b / a if a else float('inf'):>9.1f}x")
+    print("\nplans (before -> after):")
+    for name in before:
+        print(f"  {name}:\n    {before[name][1]}\n    {after[name][1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Import-time and per-worker memory cost of the demo engine's knowledge data.
+Each measurement runs in a fresh interpreter so module caches don't leak between them.
+
+Usage (from backend/):
+    python benchmarks/bench_response_pack.py [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PROBE = r"""
+import json, sys, time, tracemalloc
+sys.path.insert(0, {backend!r})
+tracemalloc.start()
+t0 = time.perf_counter()
+from services import ai_service
+t1 = time.perf_counter()
+import_mem = tracemalloc.get_traced_memory()[0]
+from services.response_pack import get_pack
+get_pack()
+t2 = time.perf_counter()
+loaded_mem = tracemalloc.get_traced_memory()[0]
+ai_service._demo_response("tell me about artificial intelligence", [])
+t3 = time.perf_counter()
+print(json.dumps({{
+    "import_ms": (t1 - t0) * 1000,
+    "import_kib": import_mem / 1024,
+    "first_load_ms": (t2 - t1) * 1000,
+    "loaded_kib": loaded_mem / 1024,
+    "first_turn_ms": (t3 - t2) * 1000,
+}}))
+"""
+
+
+def _probe() -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(backend=BACKEND)],
+        cwd=BACKEND, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    runs = [_probe() for _ in range(args.runs)]
+    print(f"{'metric':<16}{'median':>12}{'min':>12}{'max':>12}")
+    for key in runs[0]:
+        values = [r[key] for r in runs]
+        print(f"{key:<16}{statistics.median(values):>12.1f}{min(values):>12.1f}{max(values):>12.1f}")
+    print("import_* covers `import services.ai_service` (incl. its dependencies);")
+    print("loaded_* adds the lazily loaded response pack and its matcher index.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Fuzz + latency benchmark for the cost-bounded math evaluator.
+Throws random and adversarial expressions at the evaluator and the demo engine's
+arithmetic handler, and fails if any single turn exceeds the latency budget.
+
+Usage (from backend/):
+    python benchmarks/bench_safe_math.py [--cases 20000] [--budget-ms 5] [--seed 1]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import safe_math  # noqa: E402
+from services.ai_service import _try_math, _try_math_async  # noqa: E402
+
+ADVERSARIAL = [
+    "9 ^ 9 ^ 9",
+    "9 ** 9 ** 9",
+    "99999999 ^ 99999999",
+    "2 ^ 4096",
+    "2 ^ 4097",
+    "(2 ** 64) ** (2 ** 64)",
+    "-(-(-(-(-(-(-(-(-(-(-(-(-(-(-(-(-(-(1))))))))))))))))))",
+    "(" * 40 + "1" + ")" * 40,
+    "1" + " + 1" * 100,
+    "9" * 199,
+    "9" * 5000,
+    "10.0 ** 400",
+    "1e308 * 10",
+    "0 ** -1",
+    "(-8) ** 0.5",
+    "7 % 0",
+    "123456789 * 987654321 * 123456789 * 987654321",
+    "what is 12 ^ 1000 ^ 2",
+    "compute 4 ^ 4 ^ 4 ^ 4",
+]
+
+_OPS = ["+", "-", "*", "/", "%", "**"]
+
+
+def _random_expr(rng: random.Random, depth: int = 0) -> str:
+    if depth > 4 or rng.random() < 0.3:
+        return str(rng.choice([rng.randint(0, 10), rng.randint(0, 10 ** rng.randint(1, 30)), rng.random() * 1000]))
+    op = rng.choice(_OPS)
+    return f"({_random_expr(rng, depth + 1)} {op} {_random_expr(rng, depth + 1)})"
+
+
+def _time_call(fn, arg):
+    start = time.perf_counter()
+    try:
+        fn(arg)
+    except Exception:
+        pass
+    return (time.perf_counter() - start) * 1000
+
+
+async def _time_async(arg):
+    start = time.perf_counter()
+    try:
+        await _try_math_async(arg)
+    except Exception:
+        pass
+    return (time.perf_counter() - start) * 1000
+
+
+def _report(label, samples):
+    samples = sorted(samples)
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    print(f"{label:<22} n={len(samples):<6} p50={statistics.median(samples):.4f}ms "
+          f"p99={p99:.4f}ms max={samples[-1]:.4f}ms")
+    return samples[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cases", type=int, default=20000)
+    parser.add_argument("--budget-ms", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    fuzz = [_random_expr(rng) for _ in range(args.cases)]
+
+    worst = 0.0
+    worst = max(worst, _report("evaluate (fuzz)", [_time_call(safe_math.evaluate, e) for e in fuzz]))
+    worst = max(worst, _report("evaluate (adversarial)", [_time_call(safe_math.evaluate, e) for e in ADVERSARIAL]))
+    worst = max(worst, _report("_try_math (adversarial)", [_time_call(_try_math, e) for e in ADVERSARIAL]))
+
+    async def _async_suite():
+        return [await _time_async(e) for e in ADVERSARIAL + fuzz[:2000]]
+
+    worst = max(worst, _report("_try_math_async", asyncio.run(_async_suite())))
+
+    rejected = sum(1 for e in ADVERSARIAL if _try_math(e) == _try_math("9 ^ 9 ^ 9"))
+    print(f"adversarial inputs rejected as too large: {rejected}/{len(ADVERSARIAL)}")
+
+    if worst > args.budget_ms:
+        print(f"FAIL: worst-case {worst:.3f}ms exceeds budget {args.budget_ms}ms")
+        sys.exit(1)
+    print(f"OK: worst-case {worst:.3f}ms within budget {args.budget_ms}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Throughput and parity of the lexicon sentiment scorer against TextBlob.
+Builds a local corpus from the bundled phrases (STT demo phrases, routing sample
+turns, response-pack answers) plus templated customer messages with intensifiers,
+negations and exclamations, then times TextBlob per message, the lexicon scorer per
+message (cold and memoized) and in batches, and reports how closely the scores and
+emotion labels agree.
+
+Usage (from backend/):
+    python benchmarks/bench_sentiment.py [--messages 20000] [--batch-size 1000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+from loguru import logger  # noqa: E402
+from textblob import TextBlob  # noqa: E402
+
+from services import sentiment_lexicon  # noqa: E402
+from services.sentiment_service import _emotion  # noqa: E402
+from services.stt_service import DEMO_PHRASES  # noqa: E402
+from services.tts_prewarm import canned_phrases  # noqa: E402
+
+_TEMPLATES = [
+    "{mod} {adj} {noun}{end}",
+    "the {noun} was {neg} {adj}{end}",
+    "i {feel} the {noun}, it is {mod} {adj}{end}",
+    "why is my {noun} {neg} {mod} {adj}? {feel} it{end}",
+    "your {noun} is {adj} and {adj}{end}",
+]
+_WORDS = {
+    "mod": ["very", "really", "extremely", "quite", "so", "pretty", "a bit", "totally"],
+    "adj": ["good", "bad", "great", "terrible", "slow", "helpful", "awful", "fine", "broken", "happy"],
+    "noun": ["order", "delivery", "support", "account", "refund", "app", "agent", "service"],
+    "neg": ["not", "never", "no", "not a", ""],
+    "feel": ["love", "hate", "like", "don't like", "can't stand", "appreciate"],
+    "end": ["", "!", "!!", ".", " :)", " :(", "?"],
+}
+
+
+def build_corpus(n: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    base = list(DEMO_PHRASES)
+    try:
+        from benchmarks.eval_model_routing import SAMPLE_TURNS
+        base += [t["text"] for t in SAMPLE_TURNS]
+    except ImportError:
+        pass
+    base += [t for phrases in canned_phrases().values() for t in phrases]
+    corpus = list(base)
+    while len(corpus) < n:
+        template = rng.choice(_TEMPLATES)
+        corpus.append(" ".join(
+            template.format(**{k: rng.choice(v) for k, v in _WORDS.items()}).split()
+        ).capitalize())
+    return corpus[:n]
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    logger.remove()
+
+    corpus = build_corpus(args.messages)
+    unique = len(set(corpus))
+    print(f"corpus: {len(corpus)} messages, {unique} unique, lexicon {len(sentiment_lexicon._VOCAB)} tokens\n")
+
+    baseline, t_blob = _timed(lambda: np.array([TextBlob(t).sentiment.polarity for t in corpus]))
+    single, t_single = _timed(lambda: np.array([sentiment_lexicon.score.__wrapped__(t) for t in corpus]))
+    sentiment_lexicon.score.cache_clear()
+    _, t_cached = _timed(lambda: [sentiment_lexicon.score(t) for t in corpus])
+    batched, t_batch = _timed(lambda: np.concatenate([
+        sentiment_lexicon.score_batch(corpus[i:i + args.batch_size])
+        for i in range(0, len(corpus), args.batch_size)
+    ]))
+
+    print(f"{'scorer':<28}{'total s':>10}{'us/msg':>10}{'speedup':>10}")
+    for name, seconds in (
+        ("TextBlob per message", t_blob),
+        ("lexicon per message", t_single),
+        ("lexicon + LRU cache", t_cached),
+        (f"lexicon batch ({args.batch_size})", t_batch),
+    ):
+        print(f"{name:<28}{seconds:>10.3f}{seconds / len(corpus) * 1e6:>10.1f}{t_blob / seconds:>9.1f}x")
+
+    print(f"\nbatch vs per-message path: max |diff| {np.abs(batched - single).max():.2e}")
+    diff = np.abs(batched - baseline)
+    labels = np.mean([_emotion(a) == _emotion(b) for a, b in zip(batched, baseline)])
+    print(f"parity vs TextBlob: mean |diff| {diff.mean():.4f}, "
+          f"exact (<1e-6) {np.mean(diff < 1e-6):.1%}, emotion label agreement {labels:.1%}")
+    worst = np.argsort(diff)[::-1][:5]
+    for i in worst:
+        if diff[i] > 1e-6:
+            print(f"  {baseline[i]:+.3f} vs {batched[i]:+.3f}  {corpus[i]!r}")
+    print(f"cache: {sentiment_lexicon.cache_stats()}")
+
+
+if __name__ == "__main__":
+    main()
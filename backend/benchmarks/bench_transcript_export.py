@@ -0,0 +1,83 @@
+"""
+Transcript export memory: streamed through a server-side cursor vs. loaded up front.
+Seeds scratch SQLite databases (same synthetic data as bench_query_plans), then exports
+every transcript to /dev/null twice — with services.transcript_export, and the way a
+one-shot dump would do it (fetch all rows, then encode) — reporting time, output size
+and peak Python heap (tracemalloc) for each.
+
+Usage (from backend/):
+    python benchmarks/bench_transcript_export.py [--sizes 100000,1000000] [--format ndjson|csv] [--gzip]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+
+async def streamed(fmt: str, compress: bool) -> int:
+    from services.transcript_export import stream_export
+    written = 0
+    async for chunk in stream_export(fmt, compress):
+        written += len(chunk)
+    return written
+
+
+async def loaded(fmt: str, compress: bool) -> int:
+    from models.database import async_session
+    from services.transcript_export import _CSVEncoder, _NDJSONEncoder, _query
+    async with async_session() as db:
+        rows = (await db.execute(_query(None, None, None))).all()
+    encoder = _NDJSONEncoder() if fmt == "ndjson" else _CSVEncoder()
+    data = (encoder.header() + "".join(encoder.row(r) for r in rows)).encode()
+    return len(zlib.compress(data, 6, 31) if compress else data)
+
+
+async def measure(fmt: str, compress: bool) -> dict:
+    from models.database import engine
+    out = {}
+    for name, fn in (("streamed", streamed), ("loaded", loaded)):
+        tracemalloc.start()
+        started = time.perf_counter()
+        size = await fn(fmt, compress)
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        out[name] = (elapsed, size, peak / 2**20)
+    await engine.dispose()
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="100000,1000000", help="message counts, comma separated")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--gzip", action="store_true")
+    args = parser.parse_args()
+
+    scratch = tempfile.TemporaryDirectory()
+    path = os.path.join(scratch.name, "export.db")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+    from loguru import logger
+    logger.remove()
+    from bench_query_plans import migrate, seed  # after DATABASE_URL: it imports the app's engine
+
+    print(f"{'messages':>10}{'mode':>10}{'seconds':>9}{'output MB':>11}{'peak heap MB':>14}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        if os.path.exists(path):
+            os.remove(path)
+        migrate(path, "head")
+        seed(path, size)
+        for mode, (elapsed, written, peak) in asyncio.run(measure(args.format, args.gzip)).items():
+            print(f"{size:>10}{mode:>10}{elapsed:>9.2f}{written / 2**20:>11.1f}{peak:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Turn persistence latency: commit per turn vs. write-behind batching.
+Simulates concurrent sessions that each persist a turn (two messages, one analytics
+event, the sentiment aggregate update) against a scratch database, first committing
+every turn inline as the handlers used to, then through the write-behind queue. Reports
+the time a handler spends persisting (what the user waits for), total throughput and
+the number of transactions.
+
+Usage (from backend/):
+    python benchmarks/bench_write_behind.py [--sessions 50] [--turns 20] [--database-url sqlite+aiosqlite:///...]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+
+def _configure(database_url: str):
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["DEBUG"] = "false"
+
+
+async def _run(mode: str, sessions: int, turns: int) -> dict:
+    from sqlalchemy import func, select, text
+    from models.database import async_session, engine, init_db
+    from models.entities import Base, Message
+    from services.write_behind import WriteBehindQueue, conversation_row, event_row, message_row
+    from config import settings
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))  # so init_db migrates afresh
+    await init_db()
+
+    queue = WriteBehindQueue(settings.WRITE_BEHIND_QUEUE_SIZE, settings.WRITE_BEHIND_FLUSH_MS,
+                             settings.WRITE_BEHIND_MAX_ROWS)
+    if mode == "write-behind":
+        queue.start()
+    sentiment = {"sentiment_score": 0.25, "emotion": "positive", "is_urgent": False}
+    latencies = []
+
+    async def session(i: int):
+        conversation_id = f"{mode}-{i}"
+        await queue.persist(conversations=[conversation_row(conversation_id)])
+        for t in range(turns):
+            started = time.perf_counter()
+            await queue.persist(
+                messages=[
+                    message_row(conversation_id, "user", f"question {t}", sentiment=sentiment),
+                    message_row(conversation_id, "assistant", f"answer {t}"),
+                ],
+                events=[event_row("text_interaction", {"emotion": "positive"}, conversation_id)],
+                aggregates=[(conversation_id, sentiment)],
+            )
+            latencies.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(0)  # other sessions' turns interleave
+
+    started = time.perf_counter()
+    await asyncio.gather(*(session(i) for i in range(sessions)))
+    acked = time.perf_counter() - started
+    await queue.stop()
+    total = time.perf_counter() - started
+
+    async with async_session() as db:
+        stored = (await db.execute(select(func.count(Message.id)))).scalar()
+    latencies.sort()
+    return {
+        "mode": mode,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        "acked_s": acked,
+        "total_s": total,
+        "transactions": queue.batches,
+        "stored": stored,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--database-url", default=None, help="default: a scratch SQLite file")
+    args = parser.parse_args()
+
+    scratch = tempfile.TemporaryDirectory()
+    _configure(args.database_url or f"sqlite+aiosqlite:///{os.path.join(scratch.name, 'bench.db')}")
+    from loguru import logger
+    logger.remove()
+
+    results = [asyncio.run(_run(mode, args.sessions, args.turns)) for mode in ("inline", "write-behind")]
+    print(f"{args.sessions} sessions x {args.turns} turns\n")
+    print(f"{'mode':<14}{'p50 ms':>9}{'p95 ms':>9}{'acked s':>10}{'total s':>10}{'commits':>9}{'messages':>10}")
+    for r in results:
+        print(f"{r['mode']:<14}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['acked_s']:>10.2f}"
+              f"{r['total_s']:>10.2f}{r['transactions']:>9}{r['stored']:>10}")
+    print("\np50/p95: time a handler waits to persist one turn; acked: all turns handed off;")
+    print("total: until every row is committed (write-behind includes the final drain).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Offline evaluation of complexity-based model routing: latency and cost per tier.
+Replays a set of user turns twice — everything on the full model with the fixed
+500-token cap (baseline), then routed by services.model_router — and reports turns,
+latency, completion tokens and cost per tier for each run.
+
+By default the turns run against a local OpenAI-compatible stub whose speed depends
+on the model (fast vs. full) and whose reply length depends on the turn and the cap.
+Pass --base-url / --api-key to replay against a real endpoint instead.
+
+Usage (from backend/):
+    python benchmarks/eval_model_routing.py [--turns turns.jsonl] [--voice] [--base-url URL --api-key KEY]
+
+A turns file has one JSON object per line: {"text": "...", "rag": false}.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import openai  # noqa: E402
+import uvicorn  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from config import settings  # noqa: E402
+from services import model_router, sentiment_service  # noqa: E402,F401  (registers urgency cues)
+from services.ai_service import SYSTEM_PROMPT  # noqa: E402
+
+# USD per 1M tokens (input, output)
+PRICES = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+}
+
+SAMPLE_TURNS = [
+    {"text": "hi"},
+    {"text": "ok thanks"},
+    {"text": "yes please"},
+    {"text": "no that's all, bye"},
+    {"text": "got it"},
+    {"text": "what are your business hours?"},
+    {"text": "can I talk to someone?"},
+    {"text": "where is my order", "rag": True},
+    {"text": "what is the return window", "rag": True},
+    {"text": "do you ship to Canada?", "rag": True},
+    {"text": "Hello there, can you tell me about your premium plans"},
+    {"text": "how do I reset my password? I tried the link twice and it expired."},
+    {"text": "why was I charged twice on my invoice and how do I get a refund?"},
+    {"text": "explain the difference between the standard and premium plans", "rag": True},
+    {"text": "my app keeps crashing with an error when I upload a photo, what should I do?"},
+    {"text": "I want to dispute a charge from last month and cancel my subscription"},
+    {"text": "my account was hacked, this is urgent, please help me right now"},
+    {"text": "someone is using my card, emergency"},
+    {"text": "compare the warranty policy for refurbished and new devices in detail", "rag": True},
+    {"text": "I have been waiting for two weeks for my replacement and nobody answers my emails, "
+             "the tracking page shows nothing and I need the device for work on Monday. What are my options?"},
+]
+
+# Stub model speeds: (time to first token ms, tokens per second)
+STUB_SPEED = {"fast": (150, 180.0), "full": (450, 60.0)}
+
+
+def stub_app(fast_model: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/v1/chat/completions")
+    async def completions(body: dict):
+        model = body["model"]
+        prompt_chars = sum(len(m["content"]) for m in body["messages"])
+        last = body["messages"][-1]["content"]
+        # A natural reply grows with the question; the cap truncates it
+        natural = 25 + 9 * len(last.split())
+        completion = min(body.get("max_tokens") or 500, natural)
+        ttft_ms, rate = STUB_SPEED["fast" if model == fast_model else "full"]
+        await asyncio.sleep(ttft_ms / 1000 + completion / rate)
+        return {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_chars // 4,
+                "completion_tokens": completion,
+                "total_tokens": prompt_chars // 4 + completion,
+            },
+        }
+
+    return app
+
+
+async def start_stub(app: FastAPI) -> tuple:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="error"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    return server, task, f"http://127.0.0.1:{port}/v1"
+
+
+def cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    price_in, price_out = PRICES.get(model, PRICES["gpt-4o"])
+    return (prompt_tokens * price_in + completion_tokens * price_out) / 1_000_000
+
+
+async def replay(client: openai.AsyncOpenAI, turns: list, routed: bool, voice: bool, concurrency: int) -> dict:
+    tiers: dict = {}
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(turn: dict):
+        context = "Knowledge context: (retrieved passage)" if turn.get("rag") else None
+        if routed:
+            route = model_router.classify_turn(turn["text"], context, voice=voice)
+        else:
+            route = {"tier": "full", "model": settings.OPENAI_MODEL, "max_tokens": 500}
+        messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+        if context:
+            messages.append({"role": "system", "content": context})
+        messages.append({"role": "user", "content": turn["text"]})
+
+        async with sem:
+            started = time.perf_counter()
+            response = await client.chat.completions.create(
+                model=route["model"], messages=messages, temperature=0.7, max_tokens=route["max_tokens"],
+            )
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+        t = tiers.setdefault(route["tier"], {"model": route["model"], "latency": [], "completion": 0, "cost": 0.0})
+        t["latency"].append(elapsed_ms)
+        t["completion"] += response.usage.completion_tokens
+        t["cost"] += cost(route["model"], response.usage.prompt_tokens, response.usage.completion_tokens)
+
+    await asyncio.gather(*(one(turn) for turn in turns))
+    return tiers
+
+
+def report(title: str, tiers: dict, total_turns: int):
+    print(f"\n{title}")
+    print(f"{'tier':<6}{'model':<16}{'turns':>7}{'avg ms':>10}{'p95 ms':>10}{'avg out tok':>13}{'$ / 1k turns':>14}")
+    all_latency, all_cost = [], 0.0
+    for tier, t in sorted(tiers.items()):
+        n = len(t["latency"])
+        ordered = sorted(t["latency"])
+        print(f"{tier:<6}{t['model']:<16}{n:>7}{statistics.mean(ordered):>10.0f}"
+              f"{ordered[min(n - 1, int(n * 0.95))]:>10.0f}{t['completion'] / n:>13.0f}"
+              f"{t['cost'] / n * 1000:>14.3f}")
+        all_latency += t["latency"]
+        all_cost += t["cost"]
+    print(f"{'all':<22}{total_turns:>7}{statistics.mean(all_latency):>10.0f}"
+          f"{sorted(all_latency)[min(total_turns - 1, int(total_turns * 0.95))]:>10.0f}"
+          f"{'':>13}{all_cost / total_turns * 1000:>14.3f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--turns", help="JSONL file of turns (default: built-in sample)")
+    parser.add_argument("--voice", action="store_true", help="route as voice turns (VOICE_MAX_TOKENS cap)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--base-url", help="OpenAI-compatible endpoint to replay against instead of the stub")
+    parser.add_argument("--api-key", default=os.environ.get("OPENAI_API_KEY", ""))
+    args = parser.parse_args()
+
+    if args.turns:
+        with open(args.turns, encoding="utf-8") as f:
+            turns = [json.loads(line) for line in f if line.strip()]
+    else:
+        turns = SAMPLE_TURNS
+
+    stub = None
+    base_url = args.base_url
+    if not base_url:
+        stub = await start_stub(stub_app(settings.FAST_MODEL))
+        base_url = stub[2]
+    client = openai.AsyncOpenAI(api_key=args.api_key or "stub", base_url=base_url, max_retries=0)
+
+    print(f"{len(turns)} turns against {'local stub' if stub else base_url}"
+          f" — full model {settings.OPENAI_MODEL}, fast model {settings.FAST_MODEL}")
+    baseline = await replay(client, turns, routed=False, voice=args.voice, concurrency=args.concurrency)
+    routed = await replay(client, turns, routed=True, voice=args.voice, concurrency=args.concurrency)
+    report("Baseline (every turn on the full model, max_tokens=500)", baseline, len(turns))
+    report("Routed", routed, len(turns))
+
+    if stub:
+        stub[0].should_exit = True
+        await stub[1]
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
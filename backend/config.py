@@ -25,11 +25,105 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str = ""
     OPENAI_MODEL: str = "gpt-4o"
     WHISPER_MODEL: str = "whisper-1"
+    OPENAI_BASE_URL: str = ""  # any OpenAI-compatible endpoint; empty = api.openai.com
+
+    # ── Model Routing ────────────────────────────────────
+    MODEL_ROUTER_ENABLED: bool = True
+    FAST_MODEL: str = "gpt-4o-mini"  # simple turns; empty sends everything to OPENAI_MODEL
+    MODEL_ROUTER_THRESHOLD: int = 2  # complexity score at which a turn gets OPENAI_MODEL
+    FAST_MAX_TOKENS: int = 150
+    FULL_MAX_TOKENS: int = 500
+    VOICE_MAX_TOKENS: int = 200  # cap for spoken replies on either tier
+
+    # ── Speech-to-Text Provider ──────────────────────────
+    STT_PROVIDER: str = "openai"  # openai / offline
+    STT_OFFLINE_WORKERS: int = 2
+    STT_OFFLINE_QUEUE: int = 8  # recordings waiting beyond the busy workers; more are rejected
+    STT_OFFLINE_TIMEOUT_SECONDS: float = 60.0
+    STT_OFFLINE_MODEL: str = "base"  # faster-whisper model, used when that package is installed
+
+    # ── Speech-to-Text Segmentation ──────────────────────
+    STT_SEGMENT_THRESHOLD_BYTES: int = 128_000  # smaller uploads are never split
+    STT_SEGMENT_SECONDS: float = 20.0  # target segment length; cuts land on the quietest frame
+    STT_SEGMENT_OVERLAP_SECONDS: float = 0.5
+    STT_SESSION_CONCURRENCY: int = 3  # concurrent segment uploads per session
+    STT_MAX_UPLOAD_BYTES: int = 24 * 1024 * 1024  # Whisper rejects files over 25MB
+
+    # ── Response Routing ─────────────────────────────────
+    LOCAL_ROUTER_ENABLED: bool = True
+    LOCAL_ROUTER_MIN_CONFIDENCE: float = 0.8
+    MATH_EVAL_TIMEOUT_SECONDS: float = 0.25
+
+    # ── Response Data Pack ───────────────────────────────
+    RESPONSE_PACK_PATH: str = ""  # empty = bundled data/response_pack.json
+    RESPONSE_PACK_RELOAD_SECONDS: float = 5.0  # 0 disables hot reload
+
+    # ── Write-Behind Persistence ─────────────────────────
+    WRITE_BEHIND_ENABLED: bool = True
+    WRITE_BEHIND_FLUSH_MS: float = 50.0
+    WRITE_BEHIND_MAX_ROWS: int = 500  # flush early once this many rows are queued
+    WRITE_BEHIND_QUEUE_SIZE: int = 10000  # queued turns before producers wait
+    WRITE_BEHIND_RETRY_MAX_SECONDS: float = 60.0  # transient DB errors retried this long, then dead-lettered
+    WRITE_BEHIND_DEAD_LETTER_PATH: str = "./data/write_behind_dead_letter.ndjson"
+
+    # ── Analytics Rollups ────────────────────────────────
+    ROLLUP_HOURLY_RETENTION_DAYS: int = 35  # older hourly rows are compacted; daily rows are kept
+    ROLLUP_COMPACT_INTERVAL_SECONDS: int = 3600
+    ANALYTICS_CACHE_BACKEND: str = "auto"  # auto (redis when REDIS_URL is set) / redis / memory / off
+    ANALYTICS_CACHE_TTL_SECONDS: int = 30
+
+    # ── Transcript Export ────────────────────────────────
+    EXPORT_BATCH_SIZE: int = 1000  # rows fetched per server-side cursor round trip
+
+    # ── Partitioning / Archival ──────────────────────────
+    ARCHIVE_DIR: str = "./data/archive"
+    ARCHIVE_RETENTION_MONTHS: int = 0  # full months kept besides the current one; 0 disables archival
+    ARCHIVE_INTERVAL_SECONDS: int = 86400
+    PARTITION_MONTHS_AHEAD: int = 3  # PostgreSQL: future monthly partitions kept created
+
+    # ── Request Coalescing ───────────────────────────────
+    SINGLEFLIGHT_MAX_WAITERS: int = 256
+
+    # ── LLM Admission ────────────────────────────────────
+    LLM_MAX_CONCURRENCY: int = 16
+    LLM_TOKENS_PER_MINUTE: int = 90000
+    LLM_QUEUE_TIMEOUT_SECONDS: float = 8.0
+
+    # ── LLM Providers / Hedging ──────────────────────────
+    LLM_BACKUP_MODEL: str = ""  # empty disables the backup provider
+    LLM_BACKUP_BASE_URL: str = ""
+    LLM_BACKUP_API_KEY: str = ""  # defaults to OPENAI_API_KEY
+    LLM_REQUEST_TIMEOUT_SECONDS: float = 20.0
+    LLM_HEDGE_ENABLED: bool = True
+    LLM_HEDGE_DEFAULT_DELAY_SECONDS: float = 3.0  # until enough latency samples exist
+    LLM_HEDGE_MIN_DELAY_SECONDS: float = 0.5
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+    LLM_LATENCY_WINDOW: int = 200
+
+    # ── Circuit Breakers ─────────────────────────────────
+    CIRCUIT_FAILURE_RATE: float = 0.5  # failure share in the window that opens a breaker
+    CIRCUIT_MIN_CALLS: int = 5
+    CIRCUIT_WINDOW_SECONDS: float = 30.0
+    CIRCUIT_OPEN_SECONDS: float = 30.0  # cool-down before a half-open probe
+
+    # ── Sentiment ────────────────────────────────────────
+    SENTIMENT_CACHE_SIZE: int = 4096  # memoized utterance scores
+    SENTIMENT_BACKFILL_BATCH: int = 1000
+    SENTIMENT_EWMA_ALPHA: float = 0.3  # weight of the newest turn in a conversation's trend
 
     # ── ElevenLabs TTS ───────────────────────────────────
     ELEVENLABS_API_KEY: str = ""
     ELEVENLABS_VOICE_ID: str = "21m00Tcm4TlvDq8ikWAM"
 
+    # ── TTS Cache ────────────────────────────────────────
+    TTS_CACHE_ENABLED: bool = True
+    TTS_CACHE_DIR: str = "./data/tts_cache"
+    TTS_CACHE_MAX_MB: float = 512.0
+    TTS_CACHE_MEMORY_MB: float = 32.0
+    TTS_PREWARM_ON_STARTUP: bool = False  # synthesizes uncached canned phrases (uses ElevenLabs credits)
+    TTS_PREWARM_GROUPS: str = "conversational,support,emotions"  # or "all"
+    TTS_PREWARM_CONCURRENCY: int = 4
+
     # ── Twilio ───────────────────────────────────────────
     TWILIO_ACCOUNT_SID: str = ""
     TWILIO_AUTH_TOKEN: str = ""
@@ -43,6 +137,15 @@ class Settings(BaseSettings):
     ERP_API_URL: str = ""
     ERP_API_KEY: str = ""
 
+    # ── Fraud Detection ──────────────────────────────────
+    FRAUD_PATTERNS_PATH: str = ""  # optional JSON of extra {category: {weight, phrases}}
+    FRAUD_WINDOW_TURNS: int = 8  # recent turns whose categories combine
+    FRAUD_HALF_LIFE_TURNS: float = 4.0
+    FRAUD_MEDIUM_SCORE: float = 0.75
+    FRAUD_HIGH_SCORE: float = 2.0
+    FRAUD_MAX_SESSIONS: int = 10000
+    FRAUD_STATE_TTL_SECONDS: float = 1800.0  # idle conversations are forgotten
+
     # ── FAISS / Vector ───────────────────────────────────
     VECTOR_STORE_PATH: str = "./data/vector_store"
 
@@ -4,6 +4,9 @@ CRM integration placeholder.
 
 from loguru import logger
 from config import settings
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+_crm_breaker = CircuitBreaker("crm")
 
 
 async def push_conversation_to_crm(conversation_id: str, summary: str, sentiment: float) -> dict:
@@ -12,20 +15,32 @@ async def push_conversation_to_crm(conversation_id: str, summary: str, sentiment
         logger.info("CRM integration not configured — skipping")
         return {"status": "skipped", "reason": "CRM not configured"}
 
-    # TODO: Implement actual CRM API call
-    # async with httpx.AsyncClient() as client:
-    #     response = await client.post(
-    #         f"{settings.CRM_API_URL}/conversations",
-    #         headers={"Authorization": f"Bearer {settings.CRM_API_KEY}"},
-    #         json={"conversation_id": conversation_id, "summary": summary, "sentiment": sentiment},
-    #     )
-    #     return response.json()
+    async def _push() -> dict:
+        # TODO: Implement actual CRM API call
+        # async with httpx.AsyncClient() as client:
+        #     response = await client.post(
+        #         f"{settings.CRM_API_URL}/conversations",
+        #         headers={"Authorization": f"Bearer {settings.CRM_API_KEY}"},
+        #         json={"conversation_id": conversation_id, "summary": summary, "sentiment": sentiment},
+        #     )
+        #     return response.json()
+
+        logger.info(f"CRM push placeholder: conversation={conversation_id}")
+        return {"status": "ok", "conversation_id": conversation_id}
 
-    logger.info(f"CRM push placeholder: conversation={conversation_id}")
-    return {"status": "ok", "conversation_id": conversation_id}
+    try:
+        return await _crm_breaker.call(_push)
+    except CircuitOpenError:
+        return {"status": "skipped", "reason": "CRM unavailable"}
 
 
 async def get_customer_profile(phone_number: str) -> dict:
     """Retrieve customer profile from CRM."""
-    logger.info(f"CRM lookup placeholder: phone={phone_number}")
-    return {"name": "Unknown", "tier": "standard", "history": []}
+    async def _lookup() -> dict:
+        logger.info(f"CRM lookup placeholder: phone={phone_number}")
+        return {"name": "Unknown", "tier": "standard", "history": []}
+
+    try:
+        return await _crm_breaker.call(_lookup)
+    except CircuitOpenError:
+        return {"name": "Unknown", "tier": "standard", "history": []}
@@ -4,6 +4,9 @@ ERP system integration placeholder.
 
 from loguru import logger
 from config import settings
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+_erp_breaker = CircuitBreaker("erp")
 
 
 async def create_ticket(conversation_id: str, subject: str, priority: str = "normal") -> dict:
@@ -12,11 +15,23 @@ async def create_ticket(conversation_id: str, subject: str, priority: str = "nor
         logger.info("ERP integration not configured — skipping")
         return {"status": "skipped"}
 
-    logger.info(f"ERP ticket placeholder: conv={conversation_id}, subj={subject}")
-    return {"status": "created", "ticket_id": f"TKT-{conversation_id[:8]}"}
+    async def _create() -> dict:
+        logger.info(f"ERP ticket placeholder: conv={conversation_id}, subj={subject}")
+        return {"status": "created", "ticket_id": f"TKT-{conversation_id[:8]}"}
+
+    try:
+        return await _erp_breaker.call(_create)
+    except CircuitOpenError:
+        return {"status": "skipped", "reason": "ERP unavailable"}
 
 
 async def get_order_status(order_id: str) -> dict:
     """Look up order status from ERP."""
-    logger.info(f"ERP order lookup placeholder: order={order_id}")
-    return {"order_id": order_id, "status": "processing", "eta": "2-3 business days"}
+    async def _lookup() -> dict:
+        logger.info(f"ERP order lookup placeholder: order={order_id}")
+        return {"order_id": order_id, "status": "processing", "eta": "2-3 business days"}
+
+    try:
+        return await _erp_breaker.call(_lookup)
+    except CircuitOpenError:
+        return {"order_id": order_id, "status": "unknown", "eta": None}
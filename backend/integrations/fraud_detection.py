@@ -1,37 +1,154 @@
 """
-Fraud pattern detection placeholder.
+Streaming fraud scoring across conversation turns.
+Fraud phrases are grouped into weighted categories and compiled into the shared
+text_signals trie, so matching cost depends on message length, not on how many
+phrases are registered (FRAUD_PATTERNS_PATH can add thousands). Each conversation
+keeps a small fixed-size state — a ring of recent turns' category bitmasks and a
+decaying risk score — updated in O(1) per turn, so a request spread over several
+turns ("account number" now, "wire transfer" later) is still caught. A single turn
+with two or more distinct fraud phrases is rated high outright, whatever their category.
 """
 
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, List
+import numpy as np
+from config import settings
 from loguru import logger
+from services import text_signals
 
-FRAUD_PATTERNS = [
-    "give me your password",
-    "social security",
-    "credit card number",
-    "wire transfer",
-    "send money",
-    "account number",
-    "routing number",
-]
+# category -> (weight, phrases)
+FRAUD_CATEGORIES = {
+    "credentials": (1.0, [
+        "give me your password", "your password", "pin number", "one time password",
+        "otp", "verification code", "security code", "cvv",
+    ]),
+    "identity": (1.0, [
+        "social security", "ssn", "date of birth", "mother's maiden name", "passport number",
+    ]),
+    "card": (1.0, ["credit card number", "card number", "card details", "expiry date"]),
+    "banking": (1.0, ["account number", "routing number", "sort code", "iban", "bank login"]),
+    "transfer": (1.0, [
+        "wire transfer", "send money", "gift card", "gift cards", "bitcoin",
+        "crypto wallet", "western union", "money order",
+    ]),
+    "pressure": (0.5, [
+        "act now", "account suspended", "account will be closed", "legal action",
+        "arrest warrant", "final notice",
+    ]),
+}
+
+_MAX_CATEGORIES = 32  # one bit each in a uint32 mask
+
+
+def _load_patterns() -> Dict[str, tuple]:
+    """Built-in categories plus any from FRAUD_PATTERNS_PATH ({category: {weight, phrases}})."""
+    categories = {name: (w, list(p)) for name, (w, p) in FRAUD_CATEGORIES.items()}
+    if settings.FRAUD_PATTERNS_PATH:
+        with open(settings.FRAUD_PATTERNS_PATH, encoding="utf-8") as f:
+            extra = json.load(f)
+        for name, spec in extra.items():
+            weight, phrases = categories.get(name, (1.0, []))
+            categories[name] = (float(spec.get("weight", weight)), phrases + list(spec.get("phrases", [])))
+    if len(categories) > _MAX_CATEGORIES:
+        raise ValueError(f"At most {_MAX_CATEGORIES} fraud categories are supported")
+    return categories
+
+
+_categories = _load_patterns()
+_CATEGORY_NAMES = list(_categories)
+_WEIGHTS = np.array([w for w, _ in _categories.values()], dtype=np.float32)
+_PHRASE_BIT: Dict[str, int] = {}
+for _bit, (_, _phrases) in enumerate(_categories.values()):
+    for _phrase in _phrases:
+        _PHRASE_BIT.setdefault(_phrase, _bit)
+
+# Label = phrase, so a scan reports the phrases that matched
+text_signals.register_family("fraud", list(_PHRASE_BIT))
+logger.info(f"Fraud patterns: {len(_PHRASE_BIT)} phrases in {len(_CATEGORY_NAMES)} categories")
+
+_DECAY = 0.5 ** (1.0 / settings.FRAUD_HALF_LIFE_TURNS)
+
+
+class _FraudState:
+    """Fixed-size per-conversation state: ring of category masks + decaying score."""
+
+    __slots__ = ("masks", "turn", "score", "last_seen")
+
+    def __init__(self, window: int):
+        self.masks = np.zeros(window, dtype=np.uint32)
+        self.turn = 0
+        self.score = 0.0
+        self.last_seen = time.monotonic()
+
+    def update(self, mask: int) -> int:
+        """Record one turn; returns the union of categories seen within the window."""
+        self.masks[self.turn % len(self.masks)] = mask
+        self.turn += 1
+        self.score = self.score * _DECAY + float(_WEIGHTS[_bits(mask)].sum())
+        self.last_seen = time.monotonic()
+        return int(np.bitwise_or.reduce(self.masks))
+
+
+def _bits(mask: int) -> List[int]:
+    return [b for b in range(len(_CATEGORY_NAMES)) if mask >> b & 1]
+
+
+# conversation_id -> state, least recently active first
+_states: "OrderedDict[str, _FraudState]" = OrderedDict()
+
+
+def _state_for(conversation_id: str) -> _FraudState:
+    state = _states.get(conversation_id)
+    if state is not None:
+        _states.move_to_end(conversation_id)
+        return state
+
+    # Drop idle conversations and keep the table bounded
+    cutoff = time.monotonic() - settings.FRAUD_STATE_TTL_SECONDS
+    while _states and (
+        len(_states) >= settings.FRAUD_MAX_SESSIONS or next(iter(_states.values())).last_seen < cutoff
+    ):
+        _states.popitem(last=False)
+    state = _states[conversation_id] = _FraudState(settings.FRAUD_WINDOW_TURNS)
+    return state
+
+
+def end_session(conversation_id: str):
+    """Forget a conversation's fraud state when its session ends."""
+    _states.pop(conversation_id, None)
 
 
 async def check_fraud(text: str, conversation_id: str) -> dict:
     """
-    Scan text for potential fraud patterns.
+    Scan a turn for fraud patterns and fold it into the conversation's risk.
     Returns a risk assessment.
     """
-    lower = text.lower()
-    detected = [p for p in FRAUD_PATTERNS if p in lower]
+    detected = list(text_signals.scan(text)["fraud"])
+    mask = 0
+    for phrase in detected:
+        mask |= 1 << _PHRASE_BIT[phrase]
+
+    # Phrases inside a longer match ("card number" in "credit card number") are one mention
+    distinct = [p for p in detected if not any(p != q and p in q for q in detected)]
+
+    state = _state_for(conversation_id)
+    window_mask = state.update(mask)
+    window_categories = [_CATEGORY_NAMES[b] for b in _bits(window_mask)]
 
     risk_level = "low"
-    if len(detected) >= 2:
+    if (state.score >= settings.FRAUD_HIGH_SCORE or len(distinct) >= 2
+            or (mask and len(window_categories) >= 2)):
         risk_level = "high"
-    elif len(detected) == 1:
+    elif state.score >= settings.FRAUD_MEDIUM_SCORE:
         risk_level = "medium"
 
     result = {
         "risk_level": risk_level,
+        "risk_score": round(state.score, 3),
         "patterns_detected": detected,
+        "window_categories": window_categories,
         "flagged": risk_level in ("medium", "high"),
         "conversation_id": conversation_id,
     }
@@ -40,3 +157,14 @@ async def check_fraud(text: str, conversation_id: str) -> dict:
         logger.warning(f"Fraud alert: {result}")
 
     return result
+
+
+def fraud_stats() -> dict:
+    return {
+        "phrases": len(_PHRASE_BIT),
+        "categories": len(_CATEGORY_NAMES),
+        "tracked_conversations": len(_states),
+        "half_life_turns": settings.FRAUD_HALF_LIFE_TURNS,
+        "window_turns": settings.FRAUD_WINDOW_TURNS,
+        "decay_per_turn": round(_DECAY, 4),
+    }
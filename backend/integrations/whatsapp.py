@@ -4,6 +4,9 @@ WhatsApp Business API integration placeholder.
 
 from loguru import logger
 from config import settings
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+_whatsapp_breaker = CircuitBreaker("whatsapp")
 
 
 async def send_whatsapp_message(phone_number: str, message: str) -> dict:
@@ -12,9 +15,15 @@ async def send_whatsapp_message(phone_number: str, message: str) -> dict:
         logger.info("WhatsApp integration not configured — skipping")
         return {"status": "skipped"}
 
-    # TODO: Implement actual WhatsApp API call
-    logger.info(f"WhatsApp send placeholder: to={phone_number}, msg={message[:50]}...")
-    return {"status": "sent", "to": phone_number}
+    async def _send() -> dict:
+        # TODO: Implement actual WhatsApp API call
+        logger.info(f"WhatsApp send placeholder: to={phone_number}, msg={message[:50]}...")
+        return {"status": "sent", "to": phone_number}
+
+    try:
+        return await _whatsapp_breaker.call(_send)
+    except CircuitOpenError:
+        return {"status": "skipped", "reason": "WhatsApp unavailable"}
 
 
 async def handle_whatsapp_webhook(payload: dict) -> dict:
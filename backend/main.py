@@ -8,6 +8,7 @@ import os
 # Ensure backend dir is on path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -19,6 +20,11 @@ from loguru import logger
 from config import settings
 from models.database import init_db
 from services.vector_service import load_index
+from services.tts_prewarm import parse_groups, prewarm as prewarm_tts
+from services.stt_providers import shutdown_stt
+from services.write_behind import write_behind
+from services.analytics_rollups import run_compaction
+from services.archival import run_archival
 from middleware.error_handler import global_exception_handler
 from middleware.logging_middleware import logging_middleware
 
@@ -40,7 +46,21 @@ async def lifespan(app: FastAPI):
     await init_db()
     load_index()
     logger.info("Database initialized, vector index loaded")
+    if settings.WRITE_BEHIND_ENABLED:
+        write_behind.start()
+    compaction_task = asyncio.create_task(run_compaction())
+    archival_task = asyncio.create_task(run_archival())  # upcoming partitions + cold months
+    prewarm_task = None
+    if settings.TTS_PREWARM_ON_STARTUP:
+        # Runs in the background; the app serves requests while canned audio fills the cache
+        prewarm_task = asyncio.create_task(prewarm_tts(parse_groups(settings.TTS_PREWARM_GROUPS)))
     yield
+    if prewarm_task is not None:
+        prewarm_task.cancel()
+    compaction_task.cancel()
+    archival_task.cancel()
+    shutdown_stt()
+    await write_behind.stop()  # commit turns acknowledged but not yet written
     logger.info("Shutting down")
 
 
@@ -0,0 +1,41 @@
+"""Running sentiment aggregates on conversations
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COLUMNS = [
+    sa.Column("sentiment_count", sa.Integer(), nullable=False, server_default="0"),
+    sa.Column("sentiment_sum", sa.Float(), nullable=False, server_default="0"),
+    sa.Column("sentiment_min", sa.Float(), nullable=True),
+    sa.Column("sentiment_ewma", sa.Float(), nullable=True),
+    sa.Column("last_emotion", sa.String(30), nullable=True),
+]
+
+
+def upgrade() -> None:
+    # Databases created with create_all after the columns were added already have them
+    existing = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("conversations")}
+    with op.batch_alter_table("conversations") as batch:
+        for column in _COLUMNS:
+            if column.name not in existing:
+                batch.add_column(column.copy())
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("conversations") as batch:
+        for column in reversed(_COLUMNS):
+            batch.drop_column(column.name)
@@ -0,0 +1,43 @@
+"""Indexes for the conversation list, history and analytics queries
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# name -> (table, columns); comments name the query each serves
+INDEXES = {
+    # Messages of one conversation in order; also per-conversation counts
+    "ix_messages_conversation_created": ("messages", ["conversation_id", "created_at"]),
+    # Analytics: urgent message count
+    "ix_messages_is_urgent": ("messages", ["is_urgent"]),
+    # Analytics: top emotions (GROUP BY emotion)
+    "ix_messages_emotion": ("messages", ["emotion"]),
+    # Conversation list filtered by status, newest first; active / escalated counts
+    "ix_conversations_status_started": ("conversations", ["status", "started_at"]),
+    # Conversation list newest first; today's count and timeline date ranges
+    "ix_conversations_started_at": ("conversations", ["started_at"]),
+    # Event reporting by time range
+    "ix_analytics_events_created_at": ("analytics_events", ["created_at"]),
+}
+
+
+def upgrade() -> None:
+    for name, (table, columns) in INDEXES.items():
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, (table, _) in reversed(list(INDEXES.items())):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,35 @@
+"""Denormalized message count on conversations
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    existing = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("conversations")}
+    if "message_count" not in existing:
+        with op.batch_alter_table("conversations") as batch:
+            batch.add_column(sa.Column("message_count", sa.Integer(), nullable=False, server_default="0"))
+    # Backfill; each correlated count is answered from ix_messages_conversation_created
+    op.execute(
+        "UPDATE conversations SET message_count = "
+        "(SELECT count(*) FROM messages WHERE messages.conversation_id = conversations.id)"
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("conversations") as batch:
+        batch.drop_column("message_count")
@@ -0,0 +1,36 @@
+"""Extend the conversation list indexes with id for keyset pagination
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The list orders by (started_at, id); with id in the index a cursor page is one
+# range seek and the ORDER BY needs no sort
+_INDEXES = {
+    "ix_conversations_status_started": (["status", "started_at"], ["status", "started_at", "id"]),
+    "ix_conversations_started_at": (["started_at"], ["started_at", "id"]),
+}
+
+
+def upgrade() -> None:
+    for name, (_, columns) in _INDEXES.items():
+        op.drop_index(name, table_name="conversations")
+        op.create_index(name, "conversations", columns)
+
+
+def downgrade() -> None:
+    for name, (columns, _) in _INDEXES.items():
+        op.drop_index(name, table_name="conversations")
+        op.create_index(name, "conversations", columns)
@@ -0,0 +1,79 @@
+"""Hourly and daily analytics rollups, backfilled from existing rows
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TABLES = {"analytics_hourly": "hour", "analytics_daily": "day"}
+_MEASURES = ["conversations", "messages", "urgent_messages", "sentiment_sum", "sentiment_count"]
+
+conversations = sa.table(
+    "conversations", sa.column("id"), sa.column("channel"), sa.column("status"), sa.column("started_at"),
+)
+messages = sa.table(
+    "messages", sa.column("conversation_id"), sa.column("emotion"), sa.column("is_urgent"),
+    sa.column("sentiment_score"), sa.column("created_at"),
+)
+
+
+def _bucket(column, granularity: str):
+    if op.get_bind().dialect.name == "postgresql":
+        return sa.func.date_trunc(granularity, column)
+    # SQLAlchemy's SQLite DateTime text format, so backfilled keys match later upserts
+    fmt = "%Y-%m-%d %H:00:00.000000" if granularity == "hour" else "%Y-%m-%d 00:00:00.000000"
+    return sa.func.strftime(fmt, column)
+
+
+def upgrade() -> None:
+    for name, granularity in _TABLES.items():
+        table = op.create_table(
+            name,
+            sa.Column("bucket", sa.DateTime(), primary_key=True),
+            sa.Column("channel", sa.String(50), primary_key=True),
+            sa.Column("status", sa.String(20), primary_key=True),
+            sa.Column("emotion", sa.String(30), primary_key=True),
+            sa.Column("conversations", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("messages", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("urgent_messages", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("sentiment_sum", sa.Float(), nullable=False, server_default="0"),
+            sa.Column("sentiment_count", sa.Integer(), nullable=False, server_default="0"),
+        )
+
+        bucket = _bucket(conversations.c.started_at, granularity)
+        op.execute(table.insert().from_select(
+            ["bucket", "channel", "status", "emotion", "conversations"],
+            sa.select(bucket, conversations.c.channel, conversations.c.status, sa.literal(""), sa.func.count())
+            .group_by(bucket, conversations.c.channel, conversations.c.status),
+        ))
+
+        bucket = _bucket(messages.c.created_at, granularity)
+        emotion = sa.func.coalesce(messages.c.emotion, "")
+        op.execute(table.insert().from_select(
+            ["bucket", "channel", "status", "emotion"] + _MEASURES[1:],
+            sa.select(
+                bucket, conversations.c.channel, sa.literal(""), emotion, sa.func.count(),
+                sa.func.sum(sa.case((messages.c.is_urgent == sa.true(), 1), else_=0)),
+                sa.func.coalesce(sa.func.sum(messages.c.sentiment_score), 0.0),
+                sa.func.count(messages.c.sentiment_score),
+            )
+            .select_from(messages.join(conversations, conversations.c.id == messages.c.conversation_id))
+            .group_by(bucket, conversations.c.channel, emotion),
+        ))
+
+
+def downgrade() -> None:
+    for name in reversed(list(_TABLES)):
+        op.drop_table(name)
@@ -0,0 +1,104 @@
+"""Partition messages and analytics_events by month (PostgreSQL)
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 00:00:00
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_MONTHS_AHEAD = 3  # services.archival.ensure_partitions keeps extending this at runtime
+
+
+def _columns(table: str) -> list:
+    if table == "messages":
+        return [
+            sa.Column("id", sa.String(36), nullable=False),
+            sa.Column("conversation_id", sa.String(36), sa.ForeignKey("conversations.id"), nullable=False),
+            sa.Column("role", sa.String(20), nullable=False),
+            sa.Column("content", sa.Text(), nullable=False),
+            sa.Column("sentiment_score", sa.Float(), nullable=True),
+            sa.Column("emotion", sa.String(30), nullable=True),
+            sa.Column("is_urgent", sa.Boolean(), nullable=False),
+            sa.Column("audio_url", sa.String(500), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+        ]
+    return [
+        sa.Column("id", sa.String(36), nullable=False),
+        sa.Column("event_type", sa.String(50), nullable=False),
+        sa.Column("event_data", sa.Text(), nullable=True),
+        sa.Column("conversation_id", sa.String(36), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    ]
+
+
+# table -> {index: columns}, as created by 0003
+_INDEXES = {
+    "messages": {
+        "ix_messages_conversation_created": ["conversation_id", "created_at"],
+        "ix_messages_is_urgent": ["is_urgent"],
+        "ix_messages_emotion": ["emotion"],
+    },
+    "analytics_events": {"ix_analytics_events_created_at": ["created_at"]},
+}
+
+
+def _add_months(month: datetime, n: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + n
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def _rebuild(table: str, partitioned: bool) -> None:
+    """Recreate `table` (partitioned or plain) and move its rows over."""
+    old = f"{table}_old"
+    op.rename_table(table, old)
+    op.execute(f"ALTER INDEX {table}_pkey RENAME TO {old}_pkey")
+
+    if partitioned:
+        # The partition key has to be part of the primary key
+        op.create_table(table, *_columns(table), sa.PrimaryKeyConstraint("id", "created_at"),
+                        postgresql_partition_by="RANGE (created_at)")
+        oldest = op.get_bind().execute(sa.text(f"SELECT min(created_at) FROM {old}")).scalar()
+        now = datetime.utcnow()
+        month = datetime((oldest or now).year, (oldest or now).month, 1)
+        last = _add_months(datetime(now.year, now.month, 1), _MONTHS_AHEAD)
+        while month <= last:
+            op.execute(
+                f"CREATE TABLE {table}_{month:%Y_%m} PARTITION OF {table}"
+                f" FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{_add_months(month, 1):%Y-%m-%d}')"
+            )
+            month = _add_months(month, 1)
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    else:
+        op.create_table(table, *_columns(table), sa.PrimaryKeyConstraint("id"))
+
+    columns = ", ".join(c.name for c in _columns(table))
+    op.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {old}")
+    op.drop_table(old)  # partitions are dropped with their parent
+    for name, index_columns in _INDEXES[table].items():
+        op.create_index(name, table, index_columns)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return  # SQLite has no partitioning; services.archival cuts cold months out by time range
+    for table in _INDEXES:
+        _rebuild(table, partitioned=True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table in _INDEXES:
+        _rebuild(table, partitioned=False)
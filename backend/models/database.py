@@ -2,6 +2,10 @@
 Async SQLAlchemy engine, session factory, and base model.
 """
 
+import asyncio
+import fcntl
+import os
+from sqlalchemy import inspect, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from config import settings
@@ -40,8 +44,46 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+_ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+_BASELINE_REVISION = "0001"  # the schema create_all used to produce
+_MIGRATION_LOCK_KEY = 0x6D696772  # pg_advisory_xact_lock key of the migrator ("migr")
+
+
+def _upgrade(connection):
+    from alembic import command
+    from alembic.config import Config
+
+    cfg = Config(_ALEMBIC_INI)
+    cfg.attributes["connection"] = connection
+    tables = set(inspect(connection).get_table_names())
+    if "conversations" in tables and "alembic_version" not in tables:
+        # Created by create_all before migrations existed: adopt it at the baseline
+        command.stamp(cfg, _BASELINE_REVISION)
+    command.upgrade(cfg, "head")
+
+
 async def init_db():
-    """Create all tables (for development convenience)."""
-    async with engine.begin() as conn:
-        from models.entities import User, Conversation, Message, AnalyticsEvent  # noqa
-        await conn.run_sync(Base.metadata.create_all)
+    """Bring the schema up to date (alembic upgrade head).
+
+    Every uvicorn worker calls this at startup, so the stamp and upgrade run under a
+    cross-process lock: a transaction-scoped advisory lock on PostgreSQL, an flock on a
+    file beside the database on SQLite. The first worker migrates; the others wait,
+    then find the schema already at head.
+    """
+    if engine.dialect.name == "postgresql":
+        async with engine.begin() as conn:
+            await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _MIGRATION_LOCK_KEY})
+            await conn.run_sync(_upgrade)
+        return
+    database = engine.url.database
+    if not database or database == ":memory:":
+        async with engine.begin() as conn:
+            await conn.run_sync(_upgrade)
+        return
+    with open(os.path.abspath(database) + ".migrate.lock", "w") as f:
+        await asyncio.to_thread(fcntl.flock, f, fcntl.LOCK_EX)
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(_upgrade)
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
@@ -4,7 +4,7 @@ SQLAlchemy ORM entities.
 
 import uuid
 from datetime import datetime
-from sqlalchemy import String, Text, Float, Boolean, DateTime, ForeignKey, Integer
+from sqlalchemy import String, Text, Float, Boolean, DateTime, ForeignKey, Integer, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from models.database import Base
 
@@ -29,6 +29,10 @@ class User(Base):
 
 class Conversation(Base):
     __tablename__ = "conversations"
+    __table_args__ = (
+        Index("ix_conversations_status_started", "status", "started_at", "id"),
+        Index("ix_conversations_started_at", "started_at", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
     user_id: Mapped[str] = mapped_column(ForeignKey("users.id"), nullable=True)
@@ -36,6 +40,14 @@ class Conversation(Base):
     language: Mapped[str] = mapped_column(String(10), default="en")
     status: Mapped[str] = mapped_column(String(20), default="active")  # active / escalated / closed
     sentiment_avg: Mapped[float] = mapped_column(Float, default=0.0)
+    # Kept in step with the messages table on every insert / delete (services.conversation_aggregates)
+    message_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    # Running aggregate over user-message sentiment, updated with each turn's write
+    sentiment_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    sentiment_sum: Mapped[float] = mapped_column(Float, default=0.0, server_default="0")
+    sentiment_min: Mapped[float] = mapped_column(Float, nullable=True)
+    sentiment_ewma: Mapped[float] = mapped_column(Float, nullable=True)
+    last_emotion: Mapped[str] = mapped_column(String(30), nullable=True)
     started_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     ended_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
 
@@ -44,7 +56,14 @@ class Conversation(Base):
 
 
 class Message(Base):
+    # On PostgreSQL partitioned by month on created_at, primary key (id, created_at);
+    # cold months are archived to files (migration 0007, services.archival)
     __tablename__ = "messages"
+    __table_args__ = (
+        Index("ix_messages_conversation_created", "conversation_id", "created_at"),
+        Index("ix_messages_is_urgent", "is_urgent"),
+        Index("ix_messages_emotion", "emotion"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
     conversation_id: Mapped[str] = mapped_column(ForeignKey("conversations.id"), nullable=False)
@@ -60,10 +79,37 @@ class Message(Base):
 
 
 class AnalyticsEvent(Base):
+    # Partitioned and archived like messages
     __tablename__ = "analytics_events"
+    __table_args__ = (Index("ix_analytics_events_created_at", "created_at"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
     event_type: Mapped[str] = mapped_column(String(50), nullable=False)
     event_data: Mapped[str] = mapped_column(Text, nullable=True)
     conversation_id: Mapped[str] = mapped_column(String(36), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class _RollupColumns:
+    """
+    Shared shape of the analytics rollups (services.analytics_rollups). Conversation
+    facts carry status and emotion ''; message facts carry status '' and their emotion.
+    """
+
+    bucket: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    channel: Mapped[str] = mapped_column(String(50), primary_key=True)
+    status: Mapped[str] = mapped_column(String(20), primary_key=True)
+    emotion: Mapped[str] = mapped_column(String(30), primary_key=True)
+    conversations: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    messages: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    urgent_messages: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    sentiment_sum: Mapped[float] = mapped_column(Float, default=0.0, server_default="0")
+    sentiment_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+
+
+class AnalyticsHourly(_RollupColumns, Base):
+    __tablename__ = "analytics_hourly"
+
+
+class AnalyticsDaily(_RollupColumns, Base):
+    __tablename__ = "analytics_daily"
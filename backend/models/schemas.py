@@ -58,20 +58,32 @@ class ConversationResponse(BaseModel):
     language: str
     status: str
     sentiment_avg: float
+    sentiment_min: Optional[float] = None
+    sentiment_ewma: Optional[float] = None
+    last_emotion: Optional[str] = None
     started_at: datetime
     ended_at: Optional[datetime] = None
-    messages: List[MessageResponse] = []
+    message_count: int = 0  # messages: GET /api/conversations/{id}/messages
 
     class Config:
         from_attributes = True
 
 
+class MessageWindow(BaseModel):
+    messages: List[MessageResponse]  # oldest first
+    before_cursor: Optional[str] = None  # set when older messages exist
+    after_cursor: Optional[str] = None  # set when newer messages exist
+
+
 class ConversationListItem(BaseModel):
     id: str
     channel: str
     language: str
     status: str
     sentiment_avg: float
+    sentiment_min: Optional[float] = None
+    sentiment_ewma: Optional[float] = None
+    last_emotion: Optional[str] = None
     started_at: datetime
     message_count: int = 0
 
@@ -79,6 +91,11 @@ class ConversationListItem(BaseModel):
         from_attributes = True
 
 
+class ConversationPage(BaseModel):
+    items: List[ConversationListItem]
+    next_cursor: Optional[str] = None  # None on the last page
+
+
 # ── Analytics ────────────────────────────────────────────
 class AnalyticsSummary(BaseModel):
     total_conversations: int = 0
@@ -2,10 +2,28 @@
 Admin settings endpoints.
 """
 
-from fastapi import APIRouter, Depends
+import json
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from models.entities import User
 from models.schemas import SettingsUpdate
 from services.auth_service import require_admin
+from services.response_router import get_router_stats
+from services.model_router import get_model_router_stats
+from services.response_pack import pack_info, reload_pack
+from services.singleflight import singleflight_stats
+from services.llm_scheduler import scheduler as llm_scheduler
+from services.llm_providers import provider_stats
+from services.circuit_breaker import breaker_stats
+from services.tts_cache import tts_cache
+from services.stt_providers import stt_stats
+from services.sentiment_lexicon import cache_stats as sentiment_cache_stats
+from integrations.fraud_detection import fraud_stats
+from services.write_behind import write_behind
+from services.analytics_cache import cache_stats as analytics_cache_stats
+from services.archival import ARCHIVED_TABLES, archival_stats, list_archives, read_archive
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
@@ -38,3 +56,52 @@ async def update_settings(
         _app_settings["escalation_threshold"] = update.escalation_threshold
 
     return {"status": "updated", "settings": _app_settings}
+
+
+@router.get("/metrics")
+async def get_metrics(admin: User = Depends(require_admin)):
+    """Runtime counters for the response pipeline."""
+    return {
+        "response_router": get_router_stats(),
+        "model_router": get_model_router_stats(),
+        "response_pack": pack_info(),
+        "singleflight": singleflight_stats(),
+        "llm_scheduler": llm_scheduler.stats(),
+        "llm_providers": provider_stats(),
+        "circuit_breakers": breaker_stats(),
+        "stt": stt_stats(),
+        "tts_cache": tts_cache.stats(),
+        "sentiment": sentiment_cache_stats(),
+        "fraud": fraud_stats(),
+        "write_behind": write_behind.stats(),
+        "analytics_cache": analytics_cache_stats(),
+        "archival": archival_stats(),
+    }
+
+
+@router.post("/response-pack/reload")
+async def reload_response_pack(admin: User = Depends(require_admin)):
+    """Re-read the knowledge / canned-response data pack from disk."""
+    return {"status": "reloaded", "pack": reload_pack().info()}
+
+
+@router.get("/archives")
+async def get_archives(admin: User = Depends(require_admin)):
+    """Manifests of the months moved out of the database by the archival job."""
+    return {"archives": list_archives()}
+
+
+@router.get("/archives/{table}")
+async def query_archive(
+    table: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    conversation_id: Optional[str] = None,
+    admin: User = Depends(require_admin),
+):
+    """Stream archived rows created in [start, end) as NDJSON, decompressed on the fly."""
+    if table not in ARCHIVED_TABLES:
+        raise HTTPException(status_code=404, detail=f"table must be one of: {', '.join(ARCHIVED_TABLES)}")
+    # A plain iterator: the gzip reads run in the threadpool, off the event loop
+    rows = (json.dumps(row) + "\n" for row in read_archive(table, start, end, conversation_id))
+    return StreamingResponse(rows, media_type="application/x-ndjson")
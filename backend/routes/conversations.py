@@ -2,50 +2,87 @@
 Conversation history CRUD endpoints.
 """
 
+from datetime import datetime
+from typing import Optional, Union
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select, func
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 from models.database import get_db
 from models.entities import Conversation, Message, User
-from models.schemas import ConversationResponse, ConversationListItem
-from services.auth_service import get_current_user
+from models.schemas import ConversationResponse, ConversationListItem, ConversationPage, MessageWindow
+from services.auth_service import get_current_user, require_admin
+from services import analytics_cache
+from services.analytics_rollups import record_conversation_delete
+from services.conversation_aggregates import delete_messages
+from services.pagination import decode_cursor, encode_cursor
+from services.transcript_export import FORMATS, stream_export
 
 router = APIRouter(prefix="/api/conversations", tags=["conversations"])
 
+_MAX_WINDOW = 500
 
-@router.get("/", response_model=list[ConversationListItem])
+
+@router.get("/", response_model=Union[list[ConversationListItem], ConversationPage])
 async def list_conversations(
     skip: int = 0,
     limit: int = 50,
     status: str = None,
+    cursor: Optional[str] = None,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    query = select(Conversation).order_by(Conversation.started_at.desc())
+    """
+    Newest first. With `cursor` (empty for the first page, then each page's
+    next_cursor) returns {items, next_cursor} using keyset paging, which costs the
+    same at any depth; without it, the original skip/limit list.
+    """
+    # id breaks ties between equal start times so pages never overlap or skip rows
+    query = select(Conversation).order_by(Conversation.started_at.desc(), Conversation.id.desc())
     if status:
         query = query.where(Conversation.status == status)
-    query = query.offset(skip).limit(limit)
 
-    result = await db.execute(query)
-    conversations = result.scalars().all()
+    # message_count is stored on the row, so a page is a single query
+    if cursor is None:
+        result = await db.execute(query.offset(skip).limit(limit))
+        return result.scalars().all()
+
+    limit = max(limit, 1)
+    if cursor:
+        try:
+            started_at, last_id = decode_cursor(cursor, datetime, str)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.where(tuple_(Conversation.started_at, Conversation.id) < tuple_(started_at, last_id))
+    rows = (await db.execute(query.limit(limit + 1))).scalars().all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].started_at, rows[-1].id)
+    return {"items": rows, "next_cursor": next_cursor}
 
-    items = []
-    for conv in conversations:
-        msg_count = await db.execute(
-            select(func.count(Message.id)).where(Message.conversation_id == conv.id)
-        )
-        items.append(ConversationListItem(
-            id=conv.id,
-            channel=conv.channel,
-            language=conv.language,
-            status=conv.status,
-            sentiment_avg=conv.sentiment_avg,
-            started_at=conv.started_at,
-            message_count=msg_count.scalar() or 0,
-        ))
 
-    return items
+@router.get("/export")
+async def export_conversations(
+    format: str = "ndjson",
+    gzip: bool = False,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    status: str = None,
+    admin: User = Depends(require_admin),
+):
+    """
+    Stream transcripts of conversations started in [start, end) as NDJSON or CSV,
+    optionally gzip-compressed. Memory use doesn't grow with the export size.
+    """
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(FORMATS)}")
+    filename = f"transcripts.{format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        stream_export(format, gzip, start, end, status),
+        media_type="application/gzip" if gzip else FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.get("/{conversation_id}", response_model=ConversationResponse)
@@ -54,17 +91,64 @@ async def get_conversation(
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(Conversation)
-        .options(selectinload(Conversation.messages))
-        .where(Conversation.id == conversation_id)
-    )
-    conv = result.scalar_one_or_none()
+    # Metadata only; messages are paged through /{conversation_id}/messages
+    conv = await db.get(Conversation, conversation_id)
     if not conv:
         raise HTTPException(status_code=404, detail="Conversation not found")
     return conv
 
 
+@router.get("/{conversation_id}/messages", response_model=MessageWindow)
+async def get_messages(
+    conversation_id: str,
+    limit: int = 50,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    A window of up to `limit` messages, oldest first: the latest ones by default,
+    those older than `before` or newer than `after` (cursors from a previous window).
+    """
+    if before and after:
+        raise HTTPException(status_code=400, detail="Pass either before or after, not both")
+    if not await db.get(Conversation, conversation_id):
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    limit = min(max(limit, 1), _MAX_WINDOW)
+
+    key = tuple_(Message.created_at, Message.id)
+    try:
+        cursor = decode_cursor(before or after, datetime, str) if before or after else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # Range seek on ix_messages_conversation_created, one extra row to learn if more exist
+    query = select(Message).where(Message.conversation_id == conversation_id)
+    if after:
+        query = query.where(key > tuple_(*cursor)).order_by(Message.created_at, Message.id)
+    else:
+        if before:
+            query = query.where(key < tuple_(*cursor))
+        query = query.order_by(Message.created_at.desc(), Message.id.desc())
+    rows = (await db.execute(query.limit(limit + 1))).scalars().all()
+    more = len(rows) > limit
+    rows = rows[:limit]
+    if not after:
+        rows.reverse()
+
+    def edge(message: Message) -> str:
+        return encode_cursor(message.created_at, message.id)
+
+    older = more if not after else True  # the `after` cursor's own message is older
+    newer = more if after else before is not None
+    return {
+        "messages": rows,
+        "before_cursor": edge(rows[0]) if rows and older else None,
+        "after_cursor": edge(rows[-1]) if rows and newer else None,
+    }
+
+
 @router.delete("/{conversation_id}")
 async def delete_conversation(
     conversation_id: str,
@@ -78,5 +162,9 @@ async def delete_conversation(
     if not conv:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
+    await delete_messages(db, Message.conversation_id == conversation_id)
+    await record_conversation_delete(db, conv)
     await db.delete(conv)
+    await db.commit()
+    await analytics_cache.bump()
     return {"status": "deleted", "conversation_id": conversation_id}
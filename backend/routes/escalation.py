@@ -10,6 +10,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from models.database import get_db
 from models.entities import Conversation, AnalyticsEvent, User
 from models.schemas import EscalationRequest, EscalationResponse
+from services import analytics_cache
+from services.analytics_rollups import set_status
 from services.auth_service import get_current_user
 from integrations.crm import push_conversation_to_crm
 from integrations.erp import create_ticket
@@ -33,8 +35,8 @@ async def escalate(
     if not conv:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
-    # Mark as escalated
-    conv.status = "escalated"
+    # Mark as escalated (a concurrent escalation of the same conversation counts once)
+    await set_status(db, conv, "escalated")
     conv.ended_at = datetime.utcnow()
 
     escalation_id = str(uuid.uuid4())
@@ -50,6 +52,9 @@ async def escalate(
         conversation_id=req.conversation_id,
     )
     db.add(event)
+    # Commit before invalidating so a recompute can't cache the pre-escalation numbers
+    await db.commit()
+    await analytics_cache.bump()
 
     # Trigger integrations
     await push_conversation_to_crm(req.conversation_id, req.reason, conv.sentiment_avg)
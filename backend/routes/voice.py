@@ -5,24 +5,29 @@ Real-time voice WebSocket endpoint + text chat REST endpoint + SSE streaming end
 import json
 import uuid
 import asyncio
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Request
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict
 from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 
-from models.database import async_session
-from models.entities import Conversation, Message, AnalyticsEvent
+from config import settings
 from services.stt_service import transcribe_audio, DEMO_PHRASES
-from services.ai_service import generate_response
+from services.stt_providers import STTBusyError
+from services.llm_scheduler import SchedulerTimeout, priority_for
+from services.response_router import route_response
 from services.tts_service import synthesize_speech_base64
 from services.sentiment_service import analyze_sentiment
+from services.write_behind import conversation_row, event_row, message_row, write_behind
 from services.vector_service import search as vector_search
-from integrations.fraud_detection import check_fraud
+from integrations.fraud_detection import check_fraud, end_session as end_fraud_session
 
 router = APIRouter(tags=["voice"])
 
+_BUSY_MESSAGE = "The assistant is busy right now. Please try again in a moment."
+
 # In-memory chat histories keyed by session_id
 _chat_sessions: Dict[str, List[Dict[str, str]]] = {}
 
@@ -52,15 +57,13 @@ async def text_chat(req: TextChatRequest):
     Works without microphone or Whisper.
     """
     session_id = req.session_id or str(uuid.uuid4())
+    received_at = datetime.utcnow()
 
     # Get or create chat history
     if session_id not in _chat_sessions:
         _chat_sessions[session_id] = []
         # Create conversation in DB
-        async with async_session() as db:
-            conv = Conversation(id=session_id, channel="web")
-            db.add(conv)
-            await db.commit()
+        await write_behind.persist(conversations=[conversation_row(session_id)])
 
     chat_history = _chat_sessions[session_id]
 
@@ -75,39 +78,29 @@ async def text_chat(req: TextChatRequest):
 
     # 4. Build chat history and get GPT response
     chat_history.append({"role": "user", "content": req.message})
-    ai_text = await generate_response(
-        chat_history, knowledge_context=kb_context, language=req.language
-    )
-    chat_history.append({"role": "assistant", "content": ai_text})
-
-    # 5. Persist messages
-    async with async_session() as db:
-        user_msg = Message(
-            conversation_id=session_id,
-            role="user",
-            content=req.message,
-            sentiment_score=sentiment["sentiment_score"],
-            emotion=sentiment["emotion"],
-            is_urgent=sentiment["is_urgent"],
-        )
-        ai_msg = Message(
-            conversation_id=session_id,
-            role="assistant",
-            content=ai_text,
+    try:
+        ai_text = await route_response(
+            chat_history, knowledge_context=kb_context, language=req.language,
+            priority=priority_for("text", sentiment["is_urgent"]),
         )
-        db.add_all([user_msg, ai_msg])
+    except SchedulerTimeout:
+        chat_history.pop()  # unanswered: the user resends it
+        raise HTTPException(status_code=503, detail=_BUSY_MESSAGE)
+    chat_history.append({"role": "assistant", "content": ai_text})
 
-        event = AnalyticsEvent(
-            event_type="text_interaction",
-            event_data=json.dumps({
-                "emotion": sentiment["emotion"],
-                "is_urgent": sentiment["is_urgent"],
-                "fraud_risk": fraud["risk_level"],
-            }),
-            conversation_id=session_id,
-        )
-        db.add(event)
-        await db.commit()
+    # 5. Persist messages (queued; committed by the write-behind writer)
+    await write_behind.persist(
+        messages=[
+            message_row(session_id, "user", req.message, received_at, sentiment),
+            message_row(session_id, "assistant", ai_text),
+        ],
+        events=[event_row("text_interaction", {
+            "emotion": sentiment["emotion"],
+            "is_urgent": sentiment["is_urgent"],
+            "fraud_risk": fraud["risk_level"],
+        }, session_id)],
+        aggregates=[(session_id, sentiment)],
+    )
 
     logger.info(f"Text chat [{session_id[:8]}]: '{req.message[:50]}' -> '{ai_text[:50]}'")
 
@@ -136,13 +129,11 @@ async def stream_chat(req: StreamChatRequest):
     Streams the AI response word-by-word in real time.
     """
     session_id = req.session_id or str(uuid.uuid4())
+    received_at = datetime.utcnow()
 
     if session_id not in _chat_sessions:
         _chat_sessions[session_id] = []
-        async with async_session() as db:
-            conv = Conversation(id=session_id, channel="web")
-            db.add(conv)
-            await db.commit()
+        await write_behind.persist(conversations=[conversation_row(session_id)])
 
     chat_history = _chat_sessions[session_id]
 
@@ -151,24 +142,24 @@ async def stream_chat(req: StreamChatRequest):
     kb_context = await vector_search(req.message)
 
     chat_history.append({"role": "user", "content": req.message})
-    ai_text = await generate_response(
-        chat_history, knowledge_context=kb_context, language=req.language
-    )
+    try:
+        ai_text = await route_response(
+            chat_history, knowledge_context=kb_context, language=req.language,
+            priority=priority_for("text", sentiment["is_urgent"]),
+        )
+    except SchedulerTimeout:
+        chat_history.pop()  # unanswered: the user resends it
+        raise HTTPException(status_code=503, detail=_BUSY_MESSAGE)
     chat_history.append({"role": "assistant", "content": ai_text})
 
     # Persist to DB
-    async with async_session() as db:
-        user_msg = Message(
-            conversation_id=session_id,
-            role="user",
-            content=req.message,
-            sentiment_score=sentiment["sentiment_score"],
-            emotion=sentiment["emotion"],
-            is_urgent=sentiment["is_urgent"],
-        )
-        ai_msg = Message(conversation_id=session_id, role="assistant", content=ai_text)
-        db.add_all([user_msg, ai_msg])
-        await db.commit()
+    await write_behind.persist(
+        messages=[
+            message_row(session_id, "user", req.message, received_at, sentiment),
+            message_row(session_id, "assistant", ai_text),
+        ],
+        aggregates=[(session_id, sentiment)],
+    )
 
     async def event_generator():
         # Send metadata first
@@ -210,17 +201,25 @@ async def voice_websocket(websocket: WebSocket, session_id: str = None):
     conversation_id = session_id or str(uuid.uuid4())
     chat_history: list[dict] = []
 
-    async with async_session() as db:
-        conv = Conversation(id=conversation_id, channel="web")
-        db.add(conv)
-        await db.commit()
+    await write_behind.persist(conversations=[conversation_row(conversation_id)])
 
     try:
         while True:
             data = await websocket.receive_bytes()
+            received_at = datetime.utcnow()
             logger.info(f"Received {len(data)} bytes of audio")
 
-            transcript = await transcribe_audio(data)
+            try:
+                transcript = await transcribe_audio(data, session_id=conversation_id)
+            except STTBusyError as e:
+                await websocket.send_json({"type": "error", "code": "stt_busy", "message": str(e)})
+                continue
+            except Exception as e:
+                logger.error(f"STT failed: {e}")
+                await websocket.send_json({"type": "error", "code": "stt_error", "message": str(e)})
+                continue
+            if not transcript and settings.STT_PROVIDER.lower() == "offline":
+                continue  # no speech in the recording; offline results are never substituted
             if not transcript:
                 # Last-resort fallback: pick a demo phrase so the conversation
                 # always continues even without a real Whisper API key
@@ -233,38 +232,31 @@ async def voice_websocket(websocket: WebSocket, session_id: str = None):
             kb_context = await vector_search(transcript)
 
             chat_history.append({"role": "user", "content": transcript})
-            ai_text = await generate_response(chat_history, knowledge_context=kb_context)
+            try:
+                ai_text = await route_response(
+                    chat_history, knowledge_context=kb_context,
+                    priority=priority_for("voice", sentiment["is_urgent"]),
+                )
+            except SchedulerTimeout:
+                chat_history.pop()
+                await websocket.send_json({"type": "error", "code": "llm_busy", "message": _BUSY_MESSAGE})
+                continue
             chat_history.append({"role": "assistant", "content": ai_text})
 
             audio_b64 = await synthesize_speech_base64(ai_text)
 
-            async with async_session() as db:
-                user_msg = Message(
-                    conversation_id=conversation_id,
-                    role="user",
-                    content=transcript,
-                    sentiment_score=sentiment["sentiment_score"],
-                    emotion=sentiment["emotion"],
-                    is_urgent=sentiment["is_urgent"],
-                )
-                ai_msg = Message(
-                    conversation_id=conversation_id,
-                    role="assistant",
-                    content=ai_text,
-                )
-                db.add_all([user_msg, ai_msg])
-
-                event = AnalyticsEvent(
-                    event_type="voice_interaction",
-                    event_data=json.dumps({
-                        "emotion": sentiment["emotion"],
-                        "is_urgent": sentiment["is_urgent"],
-                        "fraud_risk": fraud["risk_level"],
-                    }),
-                    conversation_id=conversation_id,
-                )
-                db.add(event)
-                await db.commit()
+            await write_behind.persist(
+                messages=[
+                    message_row(conversation_id, "user", transcript, received_at, sentiment),
+                    message_row(conversation_id, "assistant", ai_text),
+                ],
+                events=[event_row("voice_interaction", {
+                    "emotion": sentiment["emotion"],
+                    "is_urgent": sentiment["is_urgent"],
+                    "fraud_risk": fraud["risk_level"],
+                }, conversation_id)],
+                aggregates=[(conversation_id, sentiment)],
+            )
 
             await websocket.send_json({
                 "type": "response",
@@ -285,3 +277,5 @@ async def voice_websocket(websocket: WebSocket, session_id: str = None):
             await websocket.send_json({"type": "error", "message": str(e)})
         except Exception:
             pass
+    finally:
+        end_fraud_session(conversation_id)
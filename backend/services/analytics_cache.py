@@ -0,0 +1,160 @@
+"""
+Response cache for the analytics routes.
+Serialized responses are cached for ANALYTICS_CACHE_TTL_SECONDS under the route and
+its query string, tagged with a data version. Writes that change the numbers (turns
+committed by the write-behind writer, escalations, deletes, rollup rebuilds) bump the
+version, which retires every cached response at once. With Redis (REDIS_URL) the
+entries and the version are shared by all workers and a lookup is one MGET; the
+in-memory backend is per process, so other workers see a write after at most the TTL.
+
+Responses carry a strong ETag (hash of the body); a matching If-None-Match gets a 304.
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, Tuple
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from config import settings
+from loguru import logger
+from services.singleflight import SingleFlight
+
+_VERSION_KEY = "analytics:version"
+_MAX_MEMORY_ENTRIES = 256
+
+
+class _MemoryBackend:
+    name = "memory"
+
+    def __init__(self):
+        self._version = 0
+        self._entries: "OrderedDict[str, Tuple[float, int, bytes]]" = OrderedDict()
+
+    async def lookup(self, key: str) -> Tuple[int, Optional[Tuple[int, bytes]]]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] < time.monotonic():
+            del self._entries[key]
+            entry = None
+        return self._version, entry[1:] if entry else None
+
+    async def store(self, key: str, version: int, body: bytes, ttl: int):
+        self._entries[key] = (time.monotonic() + ttl, version, body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > _MAX_MEMORY_ENTRIES:
+            self._entries.popitem(last=False)
+
+    async def bump(self):
+        self._version += 1
+        self._entries.clear()
+
+
+class _RedisBackend:
+    name = "redis"
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+        self._redis = redis.from_url(url)
+
+    async def lookup(self, key: str) -> Tuple[int, Optional[Tuple[int, bytes]]]:
+        version, entry = await self._redis.mget(_VERSION_KEY, key)
+        if entry is None:
+            return int(version or 0), None
+        entry_version, body = entry.split(b"\n", 1)
+        return int(version or 0), (int(entry_version), body)
+
+    async def store(self, key: str, version: int, body: bytes, ttl: int):
+        await self._redis.set(key, str(version).encode() + b"\n" + body, ex=ttl)
+
+    async def bump(self):
+        await self._redis.incr(_VERSION_KEY)
+
+
+def _make_backend():
+    choice = settings.ANALYTICS_CACHE_BACKEND
+    if choice == "off":
+        return None
+    if choice == "redis" or (choice == "auto" and settings.REDIS_URL):
+        return _RedisBackend(settings.REDIS_URL)
+    return _MemoryBackend()
+
+
+_backend = _make_backend()
+_flights = SingleFlight("analytics_cache")
+_stats = {"hits": 0, "misses": 0, "not_modified": 0, "invalidations": 0, "errors": 0}
+
+
+async def bump():
+    """Invalidate every cached analytics response (call after committing a change)."""
+    if _backend is None:
+        return
+    try:
+        await _backend.bump()
+        _stats["invalidations"] += 1
+    except Exception as e:
+        _stats["errors"] += 1
+        logger.warning(f"Analytics cache: version bump failed: {e}")
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {t.strip().removeprefix("W/") for t in header.split(",")}
+    return "*" in tags or etag in tags
+
+
+async def respond(request: Request, name: str, compute: Callable[[], Awaitable[Any]]) -> Response:
+    """JSON response for `compute()`, served from the cache when the data hasn't changed."""
+    query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+    key = f"analytics:{name}:{query}"
+
+    body = None
+    version = None
+    if _backend is not None:
+        try:
+            version, entry = await _backend.lookup(key)
+            if entry is not None and entry[0] == version:
+                body = entry[1]
+        except Exception as e:
+            _stats["errors"] += 1
+            logger.warning(f"Analytics cache: lookup failed, computing directly: {e}")
+
+    if body is not None:
+        _stats["hits"] += 1
+    else:
+        _stats["misses"] += 1
+
+        async def render() -> bytes:
+            return json.dumps(jsonable_encoder(await compute()), separators=(",", ":")).encode()
+
+        # Concurrent misses for the same key (e.g. every tab after an invalidation) compute once
+        body = await _flights.do((key, version), render)
+        if version is not None:
+            try:
+                await _backend.store(key, version, body, settings.ANALYTICS_CACHE_TTL_SECONDS)
+            except Exception as e:
+                _stats["errors"] += 1
+                logger.warning(f"Analytics cache: store failed: {e}")
+
+    etag = _etag(body)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _not_modified(request, etag):
+        _stats["not_modified"] += 1
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def cache_stats() -> dict:
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        "backend": _backend.name if _backend is not None else "off",
+        "ttl_seconds": settings.ANALYTICS_CACHE_TTL_SECONDS,
+        **_stats,
+        "hit_rate": round(_stats["hits"] / lookups, 3) if lookups else 0.0,
+    }
@@ -0,0 +1,298 @@
+"""
+Hourly and daily analytics rollups.
+Every write that changes what the dashboard reports — new conversations and messages
+(write-behind batches), status changes (escalation) and deletes — adds its deltas to
+per-(bucket, channel, status, emotion) counters in analytics_hourly and analytics_daily
+with one dialect upsert per table, in the same transaction as the write. The summary
+and timeline then read a few hundred rollup rows in a single query instead of
+aggregating the raw tables.
+
+Hourly rows older than ROLLUP_HOURLY_RETENTION_DAYS are compacted away (the daily
+rollup keeps the history). Rollups can be re-derived from the raw tables for any range
+still in the database (rebuilds start at the archive horizon, see services.archival):
+    python -m services.analytics_rollups --rebuild [--since 2026-01-01] [--compact]
+"""
+
+import argparse
+import asyncio
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import and_, case, delete, func, insert, literal, select, true, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import settings
+from loguru import logger
+from models.database import async_session, engine
+from models.entities import AnalyticsDaily, AnalyticsHourly, Conversation, Message
+from services import analytics_cache, archival
+
+GRANULARITIES = {"hour": AnalyticsHourly, "day": AnalyticsDaily}
+STEPS = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+_KEYS = ("bucket", "channel", "status", "emotion")
+_MEASURES = ("conversations", "messages", "urgent_messages", "sentiment_sum", "sentiment_count")
+
+
+def truncate(ts: datetime, granularity: str) -> datetime:
+    ts = ts.replace(minute=0, second=0, microsecond=0)
+    return ts.replace(hour=0) if granularity == "day" else ts
+
+
+# ── Incremental updates ──────────────────────────────────
+class RollupDelta:
+    """Measure deltas keyed by (granularity, bucket, channel, status, emotion)."""
+
+    def __init__(self):
+        self.rows: Dict[tuple, List[float]] = defaultdict(lambda: [0, 0, 0, 0.0, 0])
+
+    def _add(self, ts: datetime, channel: str, status: str, emotion: str, values):
+        for granularity in GRANULARITIES:
+            measures = self.rows[(granularity, truncate(ts, granularity), channel, status, emotion)]
+            for i, v in enumerate(values):
+                measures[i] += v
+
+    def conversation(self, started_at: datetime, channel: str, status: str, sign: int = 1):
+        self._add(started_at, channel, status, "", (sign, 0, 0, 0.0, 0))
+
+    def message(self, created_at: datetime, channel: str, emotion: Optional[str], is_urgent: bool,
+                sentiment_score: Optional[float], sign: int = 1):
+        scored = sentiment_score is not None
+        self._add(created_at, channel, "", emotion or "", (
+            0, sign, sign * bool(is_urgent), sign * (sentiment_score or 0.0), sign * scored,
+        ))
+
+
+def _upsert(table):
+    dialect = postgresql if engine.dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=list(_KEYS),
+        set_={m: table.c[m] + stmt.excluded[m] for m in _MEASURES},
+    )
+
+
+async def apply(db: AsyncSession, delta: RollupDelta):
+    """Upsert `delta` into both rollups, in the caller's transaction."""
+    for granularity, model in GRANULARITIES.items():
+        rows = [
+            {**dict(zip(_KEYS, key[1:])), **dict(zip(_MEASURES, measures))}
+            for key, measures in delta.rows.items() if key[0] == granularity
+        ]
+        if rows:
+            await db.execute(_upsert(model.__table__), rows)
+
+
+async def record_writes(db: AsyncSession, conversations: List[dict], messages: List[dict]):
+    """Roll up newly inserted conversation / message rows (write-behind batches)."""
+    delta = RollupDelta()
+    channels = {}
+    for c in conversations:
+        delta.conversation(c["started_at"], c["channel"], c["status"])
+        channels[c["id"]] = c["channel"]
+    missing = {m["conversation_id"] for m in messages} - channels.keys()
+    if missing:
+        channels.update((await db.execute(
+            select(Conversation.id, Conversation.channel).where(Conversation.id.in_(missing))
+        )).all())
+    for m in messages:
+        delta.message(m["created_at"], channels.get(m["conversation_id"], ""), m["emotion"],
+                      m["is_urgent"], m["sentiment_score"])
+    await apply(db, delta)
+
+
+async def set_status(db: AsyncSession, conv: Conversation, status: str) -> bool:
+    """Set conv.status and move the conversation between status counters.
+
+    The status is changed with a compare-and-set UPDATE on the status last read, so of
+    two concurrent changes only the one that actually moved the row applies its delta;
+    the other re-reads the row and finds it done. Returns whether this call changed it.
+    """
+    while conv.status != status:
+        old = conv.status
+        result = await db.execute(
+            update(Conversation)
+            .where(Conversation.id == conv.id, Conversation.status == old)
+            .values(status=status)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            conv.status = status
+            delta = RollupDelta()
+            delta.conversation(conv.started_at, conv.channel, old, sign=-1)
+            delta.conversation(conv.started_at, conv.channel, status)
+            await apply(db, delta)
+            return True
+        await db.refresh(conv, ["status"])  # changed under us: retry from the current status
+    return False
+
+
+async def record_conversation_delete(db: AsyncSession, conv: Conversation):
+    """Take a conversation off its counter (its messages go through delete_messages)."""
+    delta = RollupDelta()
+    delta.conversation(conv.started_at, conv.channel, conv.status, sign=-1)
+    await apply(db, delta)
+
+
+# ── Queries ──────────────────────────────────────────────
+async def summary(db: AsyncSession) -> dict:
+    """Dashboard totals from the daily rollup in one grouped query."""
+    d = AnalyticsDaily
+    today = truncate(datetime.utcnow(), "day")
+
+    def total(column, *conditions):
+        value = case((and_(*conditions), column), else_=0) if conditions else column
+        return func.coalesce(func.sum(value), 0)
+
+    rows = (await db.execute(
+        select(
+            d.emotion,
+            total(d.conversations),
+            total(d.conversations, d.status == "active"),
+            total(d.conversations, d.status == "escalated"),
+            total(d.conversations, d.bucket >= today),
+            total(d.messages),
+            total(d.urgent_messages),
+            total(d.sentiment_sum),
+            total(d.sentiment_count),
+        ).group_by(d.emotion)
+    )).all()
+
+    sums = [sum(r[i] for r in rows) for i in range(1, 9)]
+    sentiment_sum, sentiment_count = sums[6], sums[7]
+    emotions = sorted(((r[0], r[5]) for r in rows if r[0] and r[5] > 0), key=lambda e: -e[1])
+    return {
+        "total_conversations": sums[0],
+        "active_conversations": sums[1],
+        "escalated_conversations": sums[2],
+        "conversations_today": sums[3],
+        "total_messages": sums[4],
+        "urgent_messages": sums[5],
+        "avg_sentiment": round(sentiment_sum / sentiment_count, 4) if sentiment_count else 0.0,
+        "top_emotions": dict(emotions[:5]),
+    }
+
+
+async def timeline(db: AsyncSession, start: datetime, end: datetime, granularity: str = "day") -> List[dict]:
+    """Conversations and messages per bucket in [start, end), zero-filled."""
+    model, step = GRANULARITIES[granularity], STEPS[granularity]
+    start = truncate(start, granularity)
+    rows = (await db.execute(
+        select(model.bucket, func.sum(model.conversations), func.sum(model.messages))
+        .where(model.bucket >= start, model.bucket < end)
+        .group_by(model.bucket)
+    )).all()
+    counts = {bucket: (conversations, messages) for bucket, conversations, messages in rows}
+
+    label = "%Y-%m-%d" if granularity == "day" else "%Y-%m-%d %H:00"
+    data, bucket = [], start
+    while bucket < end:
+        conversations, messages = counts.get(bucket, (0, 0))
+        data.append({"date": bucket.strftime(label), "conversations": conversations, "messages": messages})
+        bucket += step
+    return data
+
+
+# ── Rebuild / compaction ─────────────────────────────────
+def _bucket(column, granularity: str):
+    if engine.dialect.name == "postgresql":
+        return func.date_trunc(granularity, column)
+    # Same text format SQLAlchemy stores DateTime in, so rebuilt keys match upserted ones
+    return func.strftime("%Y-%m-%d %H:00:00.000000" if granularity == "hour" else "%Y-%m-%d 00:00:00.000000",
+                         column)
+
+
+def _rebuild_statements(start: Optional[datetime], end: Optional[datetime]) -> list:
+    def within(column):
+        return and_(true(), *([column >= start] if start else []), *([column < end] if end else []))
+
+    statements = []
+    for granularity, model in GRANULARITIES.items():
+        table = model.__table__
+        statements.append(delete(table).where(within(table.c.bucket)))
+
+        bucket = _bucket(Conversation.started_at, granularity)
+        statements.append(insert(table).from_select(list(_KEYS) + ["conversations"], (
+            select(bucket, Conversation.channel, Conversation.status, literal(""), func.count())
+            .where(within(Conversation.started_at))
+            .group_by(bucket, Conversation.channel, Conversation.status)
+        )))
+
+        bucket = _bucket(Message.created_at, granularity)
+        emotion = func.coalesce(Message.emotion, "")
+        statements.append(insert(table).from_select(list(_KEYS) + list(_MEASURES[1:]), (
+            select(
+                bucket, Conversation.channel, literal(""), emotion, func.count(),
+                func.sum(case((Message.is_urgent == True, 1), else_=0)),  # noqa: E712
+                func.coalesce(func.sum(Message.sentiment_score), 0.0), func.count(Message.sentiment_score),
+            )
+            .join(Conversation, Conversation.id == Message.conversation_id)
+            .where(within(Message.created_at))
+            .group_by(bucket, Conversation.channel, emotion)
+        )))
+    return statements
+
+
+async def rebuild(since: Optional[date] = None, until: Optional[date] = None) -> float:
+    """Re-derive both rollups from the raw tables for whole days in [since, until)."""
+    start = datetime.combine(since, datetime.min.time()) if since else None
+    end = datetime.combine(until, datetime.min.time()) if until else None
+    horizon = archival.archive_horizon()
+    if horizon and (start is None or start < horizon):
+        # Archived messages are no longer in the raw tables; their rollups stay as they are
+        logger.warning(f"Messages before {horizon:%Y-%m-%d} are archived; rebuilding from there")
+        start = horizon
+        if end and end <= start:
+            return 0.0
+    started = time.perf_counter()
+    async with async_session() as db:
+        for statement in _rebuild_statements(start, end):
+            await db.execute(statement)
+        await db.commit()
+    await analytics_cache.bump()
+    elapsed = time.perf_counter() - started
+    logger.info(f"Analytics rollups rebuilt from {start or 'the beginning'} in {elapsed:.2f}s")
+    return elapsed
+
+
+async def compact() -> int:
+    """Drop hourly rows past the retention window; the daily rollup still covers them."""
+    cutoff = truncate(datetime.utcnow() - timedelta(days=settings.ROLLUP_HOURLY_RETENTION_DAYS), "day")
+    async with async_session() as db:
+        result = await db.execute(delete(AnalyticsHourly).where(AnalyticsHourly.bucket < cutoff))
+        await db.commit()
+    if result.rowcount:
+        logger.info(f"Analytics rollups: compacted {result.rowcount} hourly rows before {cutoff:%Y-%m-%d}")
+    return result.rowcount
+
+
+async def run_compaction():
+    """Background loop started from the app lifespan."""
+    while True:
+        try:
+            await compact()
+        except Exception as e:
+            logger.error(f"Analytics rollup compaction failed: {e}")
+        await asyncio.sleep(settings.ROLLUP_COMPACT_INTERVAL_SECONDS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rebuild", action="store_true", help="re-derive rollups from raw tables")
+    parser.add_argument("--since", type=date.fromisoformat, default=None, help="first day to rebuild (YYYY-MM-DD)")
+    parser.add_argument("--compact", action="store_true", help="drop hourly rows past retention")
+    args = parser.parse_args()
+    if not (args.rebuild or args.compact):
+        parser.error("nothing to do: pass --rebuild and/or --compact")
+
+    async def run():
+        if args.rebuild:
+            await rebuild(args.since)
+        if args.compact:
+            await compact()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,455 @@
+"""
+Monthly partitions for messages and analytics_events, and archival of cold months.
+On PostgreSQL both tables are range-partitioned by month on created_at (migration
+0007); ensure_partitions() keeps PARTITION_MONTHS_AHEAD future months created so new
+rows never land in the default partition. SQLite has no partitioning, so there the
+tables simply hold the hot months and a month is cut out by its time range.
+
+archive() moves every month older than ARCHIVE_RETENTION_MONTHS (full months kept
+besides the current one; 0 disables archival) out of the database. Rows are streamed
+into a gzip NDJSON file under ARCHIVE_DIR/<table>/ with a pending JSON manifest beside
+it; only then are they removed, by dropping the month's partition on PostgreSQL or a
+range DELETE on SQLite, and only if the count removed matches the count written. The
+manifest is published (renamed into place) after that commit, and a run interrupted
+in between is settled by the next one.
+Every worker runs the job, but only one archives at a time: an advisory lock on
+PostgreSQL, an exclusive lock on ARCHIVE_DIR/.lock on SQLite; the others skip the run.
+
+Archiving is not deleting: message_count and the analytics rollups keep counting
+archived rows, and rollup rebuilds start at the archive horizon. Transcript exports and
+message windows read the database, i.e. the hot months. Archives are read back on
+demand with read_archive(), the admin archive endpoints, or the CLI:
+    python -m services.archival --archive [--dry-run]
+    python -m services.archival --list
+    python -m services.archival --query messages --since 2026-01-01 --until 2026-02-01 [--conversation ID]
+"""
+
+import argparse
+import asyncio
+import fcntl
+import glob
+import gzip
+import json
+import os
+import sys
+import time
+import uuid
+import zlib
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timezone
+from typing import AsyncIterator, Iterator, List, Optional
+from sqlalchemy import delete, func, select, text
+from config import settings
+from loguru import logger
+from models.database import async_session, engine
+from models.entities import AnalyticsEvent, Message
+
+ARCHIVED_TABLES = {"messages": Message.__table__, "analytics_events": AnalyticsEvent.__table__}
+
+_LOCK_KEY = 0x61726368  # pg_advisory_lock key of the archiver ("arch")
+
+_stats = {"months_archived": 0, "rows_archived": 0, "bytes_written": 0, "partitions_created": 0,
+          "errors": 0, "skipped_runs": 0, "recovered": 0, "last_run": None}
+
+
+def month_start(ts: datetime) -> datetime:
+    return datetime(ts.year, ts.month, 1)
+
+
+def add_months(month: datetime, n: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + n
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    return f"{table}_{month:%Y_%m}"
+
+
+def _naive_utc(ts: Optional[datetime]) -> Optional[datetime]:
+    if ts is not None and ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def _is_postgres() -> bool:
+    return engine.dialect.name == "postgresql"
+
+
+# ── PostgreSQL partitions ────────────────────────────────
+async def _partitions(db, table: str) -> set:
+    rows = await db.execute(text(
+        "SELECT c.relname FROM pg_inherits i"
+        " JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent"
+        " WHERE p.relname = :table"
+    ), {"table": table})
+    return set(rows.scalars())
+
+
+async def ensure_partitions(months_ahead: Optional[int] = None) -> List[str]:
+    """Create the monthly partitions from the current month to `months_ahead` ahead (PostgreSQL)."""
+    if not _is_postgres():
+        return []
+    months_ahead = settings.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    first = month_start(datetime.utcnow())
+    created = []
+    for table in ARCHIVED_TABLES:
+        async with async_session() as db:
+            existing = await _partitions(db, table)
+        for month in (add_months(first, i) for i in range(months_ahead + 1)):
+            name = partition_name(table, month)
+            if name in existing:
+                continue
+            # One transaction each: a month whose rows already sit in the default
+            # partition can't be split out, and shouldn't stop the others
+            try:
+                async with engine.begin() as conn:
+                    await conn.execute(text(
+                        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table}"
+                        f" FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+                    ))
+                created.append(name)
+            except Exception as e:
+                _stats["errors"] += 1
+                logger.error(f"Partitions: could not create {name}: {e}")
+    if created:
+        _stats["partitions_created"] += len(created)
+        logger.info(f"Partitions: created {', '.join(created)}")
+    return created
+
+
+# ── Archive files ────────────────────────────────────────
+def _table_dir(table: str) -> str:
+    return os.path.join(settings.ARCHIVE_DIR, table)
+
+
+def list_archives(table: Optional[str] = None) -> List[dict]:
+    """Manifests of the archived months, oldest first. Files without one are incomplete."""
+    manifests = []
+    for name in [table] if table else ARCHIVED_TABLES:
+        for path in sorted(glob.glob(os.path.join(_table_dir(name), "*.json"))):
+            with open(path) as f:
+                manifests.append(json.load(f))
+    return manifests
+
+
+def archive_horizon(table: str = "messages") -> Optional[datetime]:
+    """Start of the first month of `table` still in the database, if any month was archived."""
+    months = [datetime.strptime(m["month"], "%Y-%m") for m in list_archives(table)]
+    return add_months(max(months), 1) if months else None
+
+
+def read_archive(
+    table: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    conversation_id: Optional[str] = None,
+) -> Iterator[dict]:
+    """Archived rows of `table` created in [start, end), optionally of one conversation."""
+    start, end = _naive_utc(start), _naive_utc(end)  # stored timestamps are naive UTC
+    # Naive isoformat strings sort like the timestamps, so rows are compared unparsed
+    since, until = start and start.isoformat(), end and end.isoformat()
+    for manifest in list_archives(table):
+        month = datetime.strptime(manifest["month"], "%Y-%m")
+        if (end and month >= end) or (start and add_months(month, 1) <= start):
+            continue
+        with gzip.open(os.path.join(_table_dir(table), manifest["file"]), "rt") as f:
+            for line in f:
+                if conversation_id and conversation_id not in line:
+                    continue  # skips decoding nearly every line of a one-conversation lookup
+                row = json.loads(line)
+                if conversation_id and row["conversation_id"] != conversation_id:
+                    continue
+                if (since and row["created_at"] < since) or (until and row["created_at"] >= until):
+                    continue
+                yield row
+
+
+async def _write_month(table: str, month: datetime, path: str) -> dict:
+    """Stream the month's rows into a gzip NDJSON file at `path`; returns the manifest fields."""
+    columns = ARCHIVED_TABLES[table].c
+    names = [c.name for c in columns]
+    created_at = columns.created_at
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    rows, written, first, last = 0, 0, None, None
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "wb") as out:
+            async with async_session() as db:
+                result = await db.stream(
+                    select(*columns)
+                    .where(created_at >= month, created_at < add_months(month, 1))
+                    .order_by(created_at)
+                    .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+                )
+                async for partition in result.partitions():
+                    lines = "".join(
+                        json.dumps(dict(zip(names, row)), default=datetime.isoformat) + "\n" for row in partition
+                    )
+                    written += out.write(compressor.compress(lines.encode()))
+                    first = first or partition[0].created_at
+                    last = partition[-1].created_at
+                    rows += len(partition)
+            written += out.write(compressor.flush())
+            out.flush()
+            os.fsync(out.fileno())
+    except BaseException:
+        os.remove(tmp)
+        raise
+    os.replace(tmp, path)
+    return {
+        "rows": rows,
+        "bytes": written,
+        "first_created_at": first.isoformat() if first else None,
+        "last_created_at": last.isoformat() if last else None,
+    }
+
+
+async def _remove_month(db, table: str, month: datetime) -> int:
+    """Take the month out of the database in the caller's transaction; returns the rows removed."""
+    model = ARCHIVED_TABLES[table]
+    removed = 0
+    if _is_postgres():
+        name = partition_name(table, month)
+        if name in await _partitions(db, table):
+            # Locked before counting so no row can slip in between the count and the drop
+            await db.execute(text("SET LOCAL lock_timeout = '10s'"))
+            await db.execute(text(f"LOCK TABLE {name} IN ACCESS EXCLUSIVE MODE"))
+            removed += (await db.execute(text(f"SELECT count(*) FROM {name}"))).scalar()
+            await db.execute(text(f"DROP TABLE {name}"))
+    # SQLite; on PostgreSQL, any of the month's rows sitting in the default partition
+    result = await db.execute(
+        delete(model).where(model.c.created_at >= month, model.c.created_at < add_months(month, 1))
+    )
+    return removed + result.rowcount
+
+
+def _fsync_dir(path: str):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_json(path: str, data: dict):
+    """Write `data` to `path` atomically: readers see the old file or the whole new one."""
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    _fsync_dir(os.path.dirname(path))
+
+
+async def archive_month(table: str, month: datetime) -> Optional[dict]:
+    """Move one month of `table` into an archive file; None if the month held no rows.
+
+    The manifest is first written as <stem>.json.pending, which list_archives() ignores,
+    and renamed to <stem>.json only after the database delete commits. A crash in
+    between leaves a pending manifest that the next run settles (see _recover), so a
+    month is never both in the database and in a listed archive.
+    """
+    os.makedirs(_table_dir(table), exist_ok=True)
+    # Unique per run, so no other run's file is ever written over or cleaned up
+    stem = f"{month:%Y-%m}.{datetime.utcnow():%Y%m%dT%H%M%S}.{uuid.uuid4().hex[:8]}"
+    path = os.path.join(_table_dir(table), stem + ".ndjson.gz")
+    manifest_path = os.path.join(_table_dir(table), stem + ".json")
+    pending_path = manifest_path + ".pending"
+    created = []  # files this run wrote, the only ones its cleanup may remove
+    started = time.perf_counter()
+    try:
+        written = await _write_month(table, month, path)
+        created.append(path)
+        manifest = {"table": table, "month": f"{month:%Y-%m}", "file": os.path.basename(path),
+                    **written, "archived_at": datetime.utcnow().isoformat()}
+        if written["rows"]:
+            _write_json(pending_path, manifest)
+            created.append(pending_path)
+
+        async with async_session() as db:
+            removed = await _remove_month(db, table, month)
+            if removed != written["rows"]:
+                await db.rollback()
+                raise RuntimeError(f"{removed} rows in the database but {written['rows']} archived; retrying later")
+            await db.commit()
+    except Exception:
+        for leftover in reversed(created):
+            os.remove(leftover)
+        raise
+
+    if not written["rows"]:
+        os.remove(path)
+        return None
+    os.replace(pending_path, manifest_path)  # the archive becomes visible only now
+    _fsync_dir(_table_dir(table))
+    _stats["months_archived"] += 1
+    _stats["rows_archived"] += written["rows"]
+    _stats["bytes_written"] += written["bytes"]
+    logger.info(f"Archived {table} {month:%Y-%m}: {written['rows']} rows, {written['bytes']} bytes"
+                f" in {time.perf_counter() - started:.1f}s")
+    return manifest
+
+
+async def _recover(table: str):
+    """Settle what an interrupted run left in the table's archive directory (archiver lock held).
+
+    A pending manifest whose first row is still in the database belongs to a run whose
+    delete never committed: it and its data file are removed and the month is archived
+    again. One whose row is gone committed but wasn't renamed yet, so it is published.
+    Data and temp files without any manifest are removed.
+    """
+    directory = _table_dir(table)
+    if not os.path.isdir(directory):
+        return
+    model = ARCHIVED_TABLES[table]
+    for pending_path in sorted(glob.glob(os.path.join(directory, "*.json.pending"))):
+        with open(pending_path) as f:
+            manifest = json.load(f)
+        path = os.path.join(directory, manifest["file"])
+        with gzip.open(path, "rt") as f:
+            first = json.loads(f.readline())
+        async with async_session() as db:
+            still_there = (await db.execute(select(func.count()).select_from(model).where(
+                model.c.id == first["id"], model.c.created_at == datetime.fromisoformat(first["created_at"]),
+            ))).scalar()
+        if still_there:
+            os.remove(pending_path)
+            os.remove(path)
+            logger.warning(f"Archival: discarded the uncommitted archive of {table} {manifest['month']}")
+        else:
+            os.replace(pending_path, pending_path[:-len(".pending")])
+            logger.warning(f"Archival: published the committed archive of {table} {manifest['month']}")
+        _stats["recovered"] += 1
+    for name in os.listdir(directory):
+        stem = name[:-len(".ndjson.gz")] if name.endswith(".ndjson.gz") else None
+        if name.endswith(".tmp") or (stem and not os.path.exists(os.path.join(directory, stem + ".json"))):
+            os.remove(os.path.join(directory, name))
+    _fsync_dir(directory)
+
+
+async def cold_months(table: str, cutoff: datetime) -> List[datetime]:
+    """Months of `table` before `cutoff` that still have rows (or, on PostgreSQL, a partition)."""
+    created_at = ARCHIVED_TABLES[table].c.created_at
+    months = set()
+    async with async_session() as db:
+        oldest = (await db.execute(select(func.min(created_at)).where(created_at < cutoff))).scalar()
+        if _is_postgres():
+            for name in await _partitions(db, table):
+                suffix = name[len(table) + 1:]
+                if suffix != "default":
+                    months.add(datetime.strptime(suffix, "%Y_%m"))
+    if oldest is not None:
+        month = month_start(oldest)
+        while month < cutoff:
+            months.add(month)
+            month = add_months(month, 1)
+    return sorted(m for m in months if m < cutoff)
+
+
+@asynccontextmanager
+async def _archiver_lock() -> AsyncIterator[bool]:
+    """Yields whether this process holds the archiver lock (held until the block exits)."""
+    if _is_postgres():
+        async with engine.connect() as conn:
+            held = (await conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": _LOCK_KEY})).scalar()
+            try:
+                yield held
+            finally:
+                if held:
+                    await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _LOCK_KEY})
+        return
+    os.makedirs(settings.ARCHIVE_DIR, exist_ok=True)
+    with open(os.path.join(settings.ARCHIVE_DIR, ".lock"), "w") as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+async def archive(dry_run: bool = False) -> List[dict]:
+    """Archive every month older than the retention window; returns the manifests written."""
+    if settings.ARCHIVE_RETENTION_MONTHS <= 0:
+        return []
+    cutoff = add_months(month_start(datetime.utcnow()), -settings.ARCHIVE_RETENTION_MONTHS)
+    manifests = []
+    async with _archiver_lock() as held:
+        if not held:
+            _stats["skipped_runs"] += 1
+            logger.info("Archival: another archiver is running, skipping this run")
+            return []
+        for table in ARCHIVED_TABLES:
+            if not dry_run:
+                await _recover(table)
+            for month in await cold_months(table, cutoff):
+                if dry_run:
+                    logger.info(f"Would archive {table} {month:%Y-%m}")
+                    continue
+                manifest = await archive_month(table, month)
+                if manifest:
+                    manifests.append(manifest)
+    _stats["last_run"] = datetime.utcnow().isoformat()
+    return manifests
+
+
+async def run_archival():
+    """Background loop started from the app lifespan."""
+    while True:
+        try:
+            await ensure_partitions()
+            await archive()
+        except Exception as e:
+            _stats["errors"] += 1
+            logger.error(f"Archival failed: {e}")
+        await asyncio.sleep(settings.ARCHIVE_INTERVAL_SECONDS)
+
+
+def archival_stats() -> dict:
+    return {
+        "retention_months": settings.ARCHIVE_RETENTION_MONTHS,
+        "archived_months": len(list_archives()),
+        **_stats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--archive", action="store_true", help="archive months past ARCHIVE_RETENTION_MONTHS")
+    parser.add_argument("--dry-run", action="store_true", help="with --archive: only list the months")
+    parser.add_argument("--partitions", action="store_true", help="create upcoming monthly partitions (PostgreSQL)")
+    parser.add_argument("--list", action="store_true", help="print the archive manifests")
+    parser.add_argument("--query", choices=list(ARCHIVED_TABLES), default=None,
+                        help="print archived rows of this table as NDJSON")
+    parser.add_argument("--since", type=date.fromisoformat, default=None, help="with --query: first day (YYYY-MM-DD)")
+    parser.add_argument("--until", type=date.fromisoformat, default=None, help="with --query: day after the last")
+    parser.add_argument("--conversation", default=None, help="with --query: one conversation's rows")
+    args = parser.parse_args()
+    if not (args.archive or args.partitions or args.list or args.query):
+        parser.error("nothing to do: pass --archive, --partitions, --list and/or --query")
+
+    if args.list:
+        for manifest in list_archives():
+            print(json.dumps(manifest))
+    if args.query:
+        start = datetime.combine(args.since, datetime.min.time()) if args.since else None
+        end = datetime.combine(args.until, datetime.min.time()) if args.until else None
+        for row in read_archive(args.query, start, end, args.conversation):
+            sys.stdout.write(json.dumps(row) + "\n")
+
+    async def run():
+        if args.partitions:
+            await ensure_partitions()
+        if args.archive:
+            await archive(args.dry_run)
+
+    if args.archive or args.partitions:
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
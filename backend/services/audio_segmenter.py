@@ -0,0 +1,124 @@
+"""
+Silence-aware audio segmentation for long recordings.
+Audio is decoded to 16 kHz mono PCM (WAV natively, anything else through ffmpeg when
+it is installed), cut at the quietest point near each segment boundary and re-encoded
+as small WAV files that can be transcribed in parallel.
+"""
+
+import io
+import shutil
+import subprocess
+import wave
+from typing import List, Optional, Tuple
+import numpy as np
+
+SAMPLE_RATE = 16000
+_FRAME_SECONDS = 0.02
+_SEARCH_SECONDS = 5.0  # how far back from the hard limit to look for a silence
+
+_FFMPEG = shutil.which("ffmpeg")
+
+
+def _decode_wav(audio_bytes: bytes) -> Optional[Tuple[np.ndarray, int]]:
+    with wave.open(io.BytesIO(audio_bytes)) as w:
+        if w.getsampwidth() != 2:
+            return None
+        rate, channels = w.getframerate(), w.getnchannels()
+        samples = np.frombuffer(w.readframes(w.getnframes()), dtype="<i2")
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    return samples, rate
+
+
+def _decode_ffmpeg(audio_bytes: bytes) -> Optional[Tuple[np.ndarray, int]]:
+    proc = subprocess.run(
+        [_FFMPEG, "-hide_banner", "-loglevel", "error", "-i", "pipe:0",
+         "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1"],
+        input=audio_bytes, capture_output=True, timeout=30,
+    )
+    if proc.returncode != 0:
+        return None
+    return np.frombuffer(proc.stdout, dtype="<i2"), SAMPLE_RATE
+
+
+def decode(audio_bytes: bytes) -> Optional[Tuple[np.ndarray, int]]:
+    """
+    Decode to (int16 mono samples, sample rate), or None when the format can't be
+    decoded here (non-PCM WAV, or compressed audio without ffmpeg). Blocking.
+    """
+    try:
+        if audio_bytes[:4] == b"RIFF" and audio_bytes[8:12] == b"WAVE":
+            decoded = _decode_wav(audio_bytes)
+            if decoded is not None:
+                return decoded
+        if _FFMPEG:
+            return _decode_ffmpeg(audio_bytes)
+    except (wave.Error, EOFError, OSError, subprocess.SubprocessError, ValueError):
+        pass
+    return None
+
+
+def encode_wav(samples: np.ndarray, rate: int) -> bytes:
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(samples.astype("<i2").tobytes())
+    return buf.getvalue()
+
+
+def split_points(samples: np.ndarray, rate: int, max_seconds: float, overlap_seconds: float) -> List[Tuple[int, int]]:
+    """
+    (start, end) sample ranges of at most `max_seconds` (+ overlap) each. Every cut
+    lands on the lowest-energy frame within the last few seconds before the limit;
+    each segment after the first starts `overlap_seconds` early so a word clipped by
+    a cut is heard whole in one of the two segments.
+    """
+    frame = max(1, int(rate * _FRAME_SECONDS))
+    n_frames = len(samples) // frame
+    if n_frames == 0:
+        return [(0, len(samples))]
+    energy = np.sqrt(
+        np.mean(samples[: n_frames * frame].astype(np.float32).reshape(n_frames, frame) ** 2, axis=1)
+    )
+
+    max_frames = max(1, int(max_seconds / _FRAME_SECONDS))
+    search = min(max_frames // 2, int(_SEARCH_SECONDS / _FRAME_SECONDS))
+    overlap = int(overlap_seconds * rate)
+
+    cuts = []
+    start_frame = 0
+    while n_frames - start_frame > max_frames:
+        limit = start_frame + max_frames
+        # Latest quietest frame, so audio without real pauses is still cut near the limit
+        cut = limit - 1 - int(np.argmin(energy[limit - search:limit][::-1]))
+        cuts.append(cut * frame)
+        start_frame = cut
+
+    bounds = [0] + cuts + [len(samples)]
+    return [
+        (max(0, bounds[i] - (overlap if i else 0)), bounds[i + 1])
+        for i in range(len(bounds) - 1)
+    ]
+
+
+def segment(
+    audio_bytes: bytes,
+    max_seconds: float,
+    overlap_seconds: float,
+    max_bytes: int,
+) -> Optional[List[bytes]]:
+    """
+    Split audio into WAV segments, each under `max_bytes`. Returns None if the audio
+    can't be decoded or is short enough to send whole. Blocking — run in a thread.
+    """
+    decoded = decode(audio_bytes)
+    if decoded is None:
+        return None
+    samples, rate = decoded
+    # 16-bit mono WAV: 2 bytes per sample plus a 44-byte header
+    max_seconds = min(max_seconds, (max_bytes - 44) / (2 * rate) - overlap_seconds)
+    if len(samples) <= max_seconds * rate * 1.5:
+        return None
+    return [encode_wav(samples[a:b], rate) for a, b in split_points(samples, rate, max_seconds, overlap_seconds)]
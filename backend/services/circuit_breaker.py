@@ -0,0 +1,155 @@
+"""
+Circuit breakers for upstream calls (OpenAI, Whisper, ElevenLabs, integrations).
+Each upstream tracks its failure rate over a sliding time window. Past the threshold
+the breaker opens and calls fail instantly with CircuitOpenError, so callers drop
+straight to their fallback instead of waiting out a timeout. After a cool-down one
+probe call is let through (half-open); its outcome closes or re-opens the breaker.
+"""
+
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, TypeVar
+from config import settings
+from loguru import logger
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose breaker is open."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"Circuit '{name}' is open (retry in {retry_in:.1f}s)")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = None,
+        min_calls: int = None,
+        window_seconds: float = None,
+        open_seconds: float = None,
+    ):
+        self.name = name
+        self.failure_rate = failure_rate if failure_rate is not None else settings.CIRCUIT_FAILURE_RATE
+        self.min_calls = min_calls if min_calls is not None else settings.CIRCUIT_MIN_CALLS
+        self.window_seconds = window_seconds if window_seconds is not None else settings.CIRCUIT_WINDOW_SECONDS
+        self.open_seconds = open_seconds if open_seconds is not None else settings.CIRCUIT_OPEN_SECONDS
+
+        self.state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._outcomes = deque()  # (timestamp, ok)
+        self.calls = 0
+        self.failures = 0
+        self.rejected = 0
+        self.opened = 0
+        _breakers[name] = self  # a rebuilt client's breaker replaces the old one
+
+    # ── window ───────────────────────────────────────────
+    def _trim(self, now: float):
+        cutoff = now - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            self._outcomes.popleft()
+
+    def _window_failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(1 for _, ok in self._outcomes if not ok) / len(self._outcomes)
+
+    # ── transitions ──────────────────────────────────────
+    def _open(self, now: float):
+        self.state = OPEN
+        self._opened_at = now
+        self.opened += 1
+        logger.warning(f"Circuit '{self.name}' opened ({self._window_failure_rate():.0%} failures)")
+
+    def _close(self):
+        self.state = CLOSED
+        self._outcomes.clear()
+        logger.info(f"Circuit '{self.name}' closed")
+
+    def _admit(self) -> bool:
+        """Decide whether a call may go upstream; True if it is the half-open probe."""
+        now = time.monotonic()
+        if self.state == OPEN:
+            if now - self._opened_at < self.open_seconds:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, self.open_seconds - (now - self._opened_at))
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN:
+            if self._probe_in_flight:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, 0.0)
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def _record(self, ok: bool, probe: bool):
+        now = time.monotonic()
+        self.calls += 1
+        if not ok:
+            self.failures += 1
+        if probe:
+            self._probe_in_flight = False
+            if ok:
+                self._close()
+            else:
+                self._open(now)
+            return
+        if self.state != CLOSED:
+            return  # a call admitted before the breaker opened
+        self._outcomes.append((now, ok))
+        self._trim(now)
+        if len(self._outcomes) >= self.min_calls and self._window_failure_rate() >= self.failure_rate:
+            self._open(now)
+
+    # ── public API ───────────────────────────────────────
+    def allows(self) -> bool:
+        """True unless the breaker is open and still cooling down (does not consume the probe)."""
+        if self.state == OPEN:
+            return time.monotonic() - self._opened_at >= self.open_seconds
+        return not (self.state == HALF_OPEN and self._probe_in_flight)
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run `fn` through the breaker. Raises CircuitOpenError without calling it when open."""
+        probe = self._admit()
+        try:
+            result = await fn()
+        except Exception:
+            self._record(False, probe)
+            raise
+        except BaseException:
+            # Cancelled: says nothing about upstream health, just free the probe slot
+            if probe:
+                self._probe_in_flight = False
+            raise
+        self._record(True, probe)
+        return result
+
+    def stats(self) -> dict:
+        self._trim(time.monotonic())
+        return {
+            "state": self.state,
+            "window_calls": len(self._outcomes),
+            "window_failure_rate": round(self._window_failure_rate(), 3),
+            "calls": self.calls,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "opened": self.opened,
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def breaker_stats() -> dict:
+    """State and counters of every circuit breaker, keyed by upstream name."""
+    return {name: b.stats() for name, b in _breakers.items()}
@@ -0,0 +1,117 @@
+"""
+Running aggregates per conversation.
+Each user turn folds its score into count / sum / min / EWMA / last emotion with a
+single UPDATE that reads the previous values inside the database, so concurrent turns
+never lose an update and nothing scans the conversation's messages. The statement is
+executed in the same transaction as the turn's message insert. message_count is kept
+the same way: incremented with every message insert, decremented by delete_messages.
+"""
+
+from collections import Counter
+from typing import Iterable
+from sqlalchemy import bindparam, case, delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import settings
+from models.entities import Conversation, Message
+from services.analytics_rollups import RollupDelta, apply as apply_rollups
+
+
+def turn_update(conversation_id: str, sentiment: dict):
+    """UPDATE statement folding one scored user message into its conversation."""
+    score = float(sentiment["sentiment_score"])
+    alpha = settings.SENTIMENT_EWMA_ALPHA
+    # SET expressions all see the row's previous values
+    return (
+        update(Conversation)
+        .where(Conversation.id == conversation_id)
+        .values(
+            sentiment_count=Conversation.sentiment_count + 1,
+            sentiment_sum=Conversation.sentiment_sum + score,
+            sentiment_avg=(Conversation.sentiment_sum + score) / (Conversation.sentiment_count + 1),
+            sentiment_min=case(
+                (Conversation.sentiment_min.is_(None), score),
+                (Conversation.sentiment_min > score, score),
+                else_=Conversation.sentiment_min,
+            ),
+            sentiment_ewma=case(
+                (Conversation.sentiment_ewma.is_(None), score),
+                else_=alpha * score + (1 - alpha) * Conversation.sentiment_ewma,
+            ),
+            last_emotion=sentiment["emotion"],
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def rebuild(db: AsyncSession, conversation_ids: Iterable[str]):
+    """Recompute aggregates from stored messages (after re-scoring history)."""
+    alpha = settings.SENTIMENT_EWMA_ALPHA
+    for conversation_id in conversation_ids:
+        rows = (await db.execute(
+            select(Message.sentiment_score, Message.emotion)
+            .where(
+                Message.conversation_id == conversation_id,
+                Message.role == "user",
+                Message.sentiment_score.isnot(None),
+            )
+            .order_by(Message.created_at)
+        )).all()
+        values = {
+            "sentiment_count": len(rows), "sentiment_sum": 0.0, "sentiment_avg": 0.0,
+            "sentiment_min": None, "sentiment_ewma": None, "last_emotion": None,
+        }
+        for score, emotion in rows:
+            values["sentiment_sum"] += score
+            values["sentiment_min"] = score if values["sentiment_min"] is None else min(values["sentiment_min"], score)
+            ewma = values["sentiment_ewma"]
+            values["sentiment_ewma"] = score if ewma is None else alpha * score + (1 - alpha) * ewma
+            values["last_emotion"] = emotion
+        if rows:
+            values["sentiment_avg"] = values["sentiment_sum"] / len(rows)
+        await db.execute(
+            update(Conversation)
+            .where(Conversation.id == conversation_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+
+
+# ── Message counts ───────────────────────────────────────
+# Core statement so one executemany covers every conversation in a batch
+_count_delta = (
+    update(Conversation.__table__)
+    .where(Conversation.__table__.c.id == bindparam("conversation"))
+    .values(message_count=Conversation.__table__.c.message_count + bindparam("delta"))
+)
+
+
+async def add_message_counts(db: AsyncSession, conversation_ids: Iterable[str], sign: int = 1):
+    """Adjust message_count by one per id given (ids may repeat), in the caller's transaction."""
+    counts = Counter(conversation_ids)
+    if counts:
+        await db.execute(_count_delta, [{"conversation": c, "delta": sign * n} for c, n in counts.items()])
+
+
+async def delete_messages(db: AsyncSession, *criteria) -> int:
+    """
+    Delete the messages matching `criteria` and take them off their conversations'
+    counts and the analytics rollups.
+    """
+    deleted = (await db.execute(
+        delete(Message).where(*criteria)
+        .returning(Message.conversation_id, Message.created_at, Message.emotion,
+                   Message.is_urgent, Message.sentiment_score)
+        .execution_options(synchronize_session=False)
+    )).all()
+    await add_message_counts(db, (m.conversation_id for m in deleted), sign=-1)
+
+    channels = dict((await db.execute(
+        select(Conversation.id, Conversation.channel)
+        .where(Conversation.id.in_({m.conversation_id for m in deleted}))
+    )).all()) if deleted else {}
+    delta = RollupDelta()
+    for m in deleted:
+        delta.message(m.created_at, channels.get(m.conversation_id, ""), m.emotion, m.is_urgent,
+                      m.sentiment_score, sign=-1)
+    await apply_rollups(db, delta)
+    return len(deleted)
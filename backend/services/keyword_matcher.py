@@ -0,0 +1,73 @@
+"""
+Precompiled whole-word keyword matcher.
+All keys are compiled once into a single alternation so a lookup is one regex pass
+over the text instead of one compile + search per key.
+"""
+
+import re
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+
+class KeywordMatcher:
+    """
+    Case-insensitive, whole-word matcher over a fixed, ordered set of keys.
+
+    The order of `keys` is the priority order used by `first()` and to break
+    ties in `longest()` — i.e. the same semantics as looping over a dict.
+    """
+
+    def __init__(self, keys: Iterable[str]):
+        self._rank = {}
+        for key in keys:
+            self._rank.setdefault(key.lower(), len(self._rank))
+
+        # Longest-first alternation: at any position the regex reports the longest key
+        ordered = sorted(self._rank, key=len, reverse=True)
+        alternation = "|".join(re.escape(k) for k in ordered) or r"(?!)"
+        self._pattern = re.compile(r"(?=\b(" + alternation + r")\b)", re.IGNORECASE)
+
+        # Shorter keys that also end on a word boundary inside a longer key
+        # ("database" inside "database design") match at the same position
+        self._implied = {
+            key: [
+                short for short in ordered
+                if len(short) < len(key) and key.startswith(short) and not key[len(short)].isalnum()
+            ]
+            for key in ordered
+        }
+
+    def __len__(self) -> int:
+        return len(self._rank)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[str, int, int]]:
+        """Yield (key, start, end) for every key occurrence in `text`."""
+        for m in self._pattern.finditer(text):
+            key = m.group(1).lower()
+            start = m.start(1)
+            yield key, start, m.end(1)
+            for short in self._implied.get(key, ()):
+                yield short, start, start + len(short)
+
+    def matches(self, text: str) -> List[str]:
+        """All distinct keys present in `text`, in priority order."""
+        return sorted({key for key, _, _ in self.iter_matches(text)}, key=self._rank.__getitem__)
+
+    def first(self, text: str) -> Optional[str]:
+        """The highest-priority key present in `text`."""
+        best = None
+        for key, _, _ in self.iter_matches(text):
+            if best is None or self._rank[key] < self._rank[best]:
+                best = key
+        return best
+
+    def longest(self, text: str) -> Optional[str]:
+        """The longest key present in `text`; ties go to the higher-priority key."""
+        best = None
+        for key, _, _ in self.iter_matches(text):
+            if best is None or (-len(key), self._rank[key]) < (-len(best), self._rank[best]):
+                best = key
+        return best
+
+    def spans(self, text: str) -> List[Tuple[int, int]]:
+        """Character spans of every match in `text`."""
+        return [(start, end) for _, start, end in self.iter_matches(text)]
@@ -0,0 +1,222 @@
+"""
+Pluggable OpenAI-compatible LLM providers with hedging and failover.
+The primary is OpenAI (or any endpoint at OPENAI_BASE_URL); an optional backup can be
+a second model or a local OpenAI-compatible server. When the primary runs past its
+rolling p95 latency a backup request is fired, the first answer wins and the loser
+is cancelled. A primary error fails over to the backup straight away.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Dict, List, Optional
+import openai
+from config import settings
+from loguru import logger
+from services.circuit_breaker import CircuitBreaker
+
+
+# ── Key validation ────────────────────────────────────────
+def is_real_api_key(key: str) -> bool:
+    """Return True only if the key looks like a genuine OpenAI API key."""
+    if not key:
+        return False
+    if "your" in key.lower():
+        return False
+    if not key.startswith("sk-"):
+        return False
+    if len(key) < 30:
+        return False
+    return True
+
+
+class LLMProvider:
+    """One chat-completions endpoint plus rolling latency windows per model."""
+
+    def __init__(self, name: str, model: str, api_key: str, base_url: Optional[str] = None, max_retries: int = 2):
+        self.name = name
+        self.model = model
+        self.base_url = base_url or None
+        self.client = openai.AsyncOpenAI(
+            api_key=api_key,
+            base_url=self.base_url,
+            timeout=settings.LLM_REQUEST_TIMEOUT_SECONDS,
+            max_retries=max_retries,
+        )
+        self.breaker = CircuitBreaker(f"llm:{name}")
+        self._latencies: Dict[str, deque] = {}
+        self.calls = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.wins = 0
+
+    def _window(self, model: str) -> deque:
+        window = self._latencies.get(model)
+        if window is None:
+            window = self._latencies[model] = deque(maxlen=settings.LLM_LATENCY_WINDOW)
+        return window
+
+    async def complete(
+        self, messages: List[Dict[str, str]], temperature: float, max_tokens: int, model: Optional[str] = None,
+    ) -> str:
+        model = model or self.model
+        window = self._window(model)
+        self.calls += 1
+        started = time.perf_counter()
+        try:
+            response = await self.breaker.call(lambda: self.client.chat.completions.create(
+                model=model, messages=messages, temperature=temperature, max_tokens=max_tokens,
+            ))
+        except asyncio.CancelledError:
+            # A cancelled (hedged-out) call ran at least this long — keep it as a lower bound
+            # so slow stretches still pull the p95 up
+            self.cancelled += 1
+            window.append(time.perf_counter() - started)
+            raise
+        except Exception:
+            self.errors += 1
+            raise
+        window.append(time.perf_counter() - started)
+        return response.choices[0].message.content.strip()
+
+    def p95(self, model: Optional[str] = None) -> Optional[float]:
+        """Rolling p95 latency of `model` in seconds, or None until enough samples exist."""
+        window = self._latencies.get(model or self.model, ())
+        if len(window) < settings.LLM_HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(window)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def stats(self) -> dict:
+        return {
+            "model": self.model,
+            "base_url": self.base_url,
+            "calls": self.calls,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "wins": self.wins,
+            "p95_ms": {
+                model: round(p95 * 1000, 1) if (p95 := self.p95(model)) is not None else None
+                for model in self._latencies
+            },
+        }
+
+
+_providers: Optional[List[LLMProvider]] = None
+_stats = {"requests": 0, "hedges": 0, "hedge_wins": 0, "failovers": 0}
+
+
+def get_providers() -> List[LLMProvider]:
+    """Configured providers, primary first. Empty when nothing is configured (demo mode)."""
+    global _providers
+    if _providers is None:
+        providers = []
+        has_backup = bool(settings.LLM_BACKUP_MODEL)
+        # With a backup configured, failover replaces the SDK's own retries
+        retries = 0 if has_backup else 2
+        if settings.OPENAI_BASE_URL or is_real_api_key(settings.OPENAI_API_KEY):
+            providers.append(LLMProvider(
+                "primary", settings.OPENAI_MODEL, settings.OPENAI_API_KEY or "local",
+                settings.OPENAI_BASE_URL, max_retries=retries,
+            ))
+        if has_backup:
+            backup_key = settings.LLM_BACKUP_API_KEY or settings.OPENAI_API_KEY
+            if settings.LLM_BACKUP_BASE_URL or is_real_api_key(backup_key):
+                providers.append(LLMProvider(
+                    "backup", settings.LLM_BACKUP_MODEL, backup_key or "local",
+                    settings.LLM_BACKUP_BASE_URL, max_retries=retries,
+                ))
+            else:
+                logger.warning("LLM_BACKUP_MODEL set without a usable key or base URL; backup disabled")
+        _providers = providers
+    return _providers
+
+
+def reset_providers():
+    """Drop cached providers so the next call rebuilds them from settings."""
+    global _providers
+    _providers = None
+
+
+def _hedge_delay(provider: LLMProvider, model: Optional[str]) -> float:
+    p95 = provider.p95(model)
+    if p95 is None:
+        return settings.LLM_HEDGE_DEFAULT_DELAY_SECONDS
+    return max(settings.LLM_HEDGE_MIN_DELAY_SECONDS, p95)
+
+
+async def hedged_complete(
+    messages: List[Dict[str, str]],
+    temperature: float = 0.7,
+    max_tokens: int = 500,
+    model: Optional[str] = None,
+) -> str:
+    """
+    Complete `messages` on the primary provider, hedging to the backup once the
+    primary exceeds its rolling p95 and failing over on errors. Without a backup
+    the hedge is a second request to the primary. `model` (the router's pick, an
+    OPENAI_MODEL / FAST_MODEL name) applies to the configured primary only; the
+    backup always runs its own LLM_BACKUP_MODEL, whichever order they are tried in.
+    Raises the last error if every attempt fails.
+    """
+    providers = get_providers()
+    if not providers:
+        raise RuntimeError("No LLM provider configured")
+    configured_primary = providers[0]
+
+    def model_for(provider: LLMProvider) -> Optional[str]:
+        return model if provider is configured_primary else None
+
+    # A provider whose breaker is open goes to the back of the line
+    providers = sorted(providers, key=lambda p: not p.breaker.allows())
+    primary = providers[0]
+    backup = providers[1] if len(providers) > 1 else primary
+    _stats["requests"] += 1
+
+    first = asyncio.ensure_future(primary.complete(messages, temperature, max_tokens, model_for(primary)))
+    owners = {first: primary}
+    pending = {first}
+    second_sent = False
+    error: Optional[BaseException] = None
+
+    try:
+        while pending:
+            timeout = None if second_sent or not settings.LLM_HEDGE_ENABLED else _hedge_delay(primary, model_for(primary))
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                if task.exception() is None:
+                    winner = owners[task]
+                    winner.wins += 1
+                    if task is not first:
+                        _stats["hedge_wins"] += 1
+                    return task.result()
+                error = task.exception()
+                logger.warning(f"LLM provider '{owners[task].name}' failed: {error}")
+
+            if second_sent:
+                continue
+            if not done:
+                _stats["hedges"] += 1
+                logger.info(f"LLM hedge: '{primary.name}' slower than {timeout:.2f}s, firing '{backup.name}'")
+            elif backup is not primary:
+                _stats["failovers"] += 1
+                logger.info(f"LLM failover: '{primary.name}' -> '{backup.name}'")
+            else:
+                break
+            second = asyncio.ensure_future(backup.complete(messages, temperature, max_tokens, model_for(backup)))
+            owners[second] = backup
+            pending.add(second)
+            second_sent = True
+    finally:
+        for task in pending:
+            task.cancel()
+
+    raise error
+
+
+def provider_stats() -> dict:
+    return {
+        **_stats,
+        "providers": {p.name: {**p.stats(), "circuit": p.breaker.state} for p in get_providers()},
+    }
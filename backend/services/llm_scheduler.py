@@ -0,0 +1,168 @@
+"""
+Priority-aware admission scheduler for LLM calls.
+Caps concurrent upstream requests, enforces a token-per-minute budget, and serves
+urgent voice turns before ordinary voice turns before text chat. Requests that can't
+be admitted before their deadline fail fast with SchedulerTimeout, which the routes
+report to the user as busy.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+from config import settings
+from loguru import logger
+
+PRIORITY_URGENT_VOICE = 0
+PRIORITY_VOICE = 1
+PRIORITY_TEXT = 2
+
+PRIORITY_NAMES = {
+    PRIORITY_URGENT_VOICE: "urgent_voice",
+    PRIORITY_VOICE: "voice",
+    PRIORITY_TEXT: "text",
+}
+
+VOICE_CHANNELS = {"voice", "phone"}
+
+
+def priority_for(channel: str, is_urgent: bool = False) -> int:
+    """Map a turn's channel and urgency flag to a priority class."""
+    if channel in VOICE_CHANNELS:
+        return PRIORITY_URGENT_VOICE if is_urgent else PRIORITY_VOICE
+    return PRIORITY_TEXT
+
+
+def estimate_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+    """Rough prompt + completion token count (~4 characters per token)."""
+    return sum(len(m["content"]) for m in messages) // 4 + max_tokens
+
+
+class SchedulerTimeout(Exception):
+    """Raised when a request could not be admitted before its deadline."""
+
+
+class _Waiter:
+    __slots__ = ("priority", "tokens", "future", "enqueued_at")
+
+    def __init__(self, priority: int, tokens: int, future: asyncio.Future):
+        self.priority = priority
+        self.tokens = tokens
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+
+class LLMScheduler:
+    def __init__(self, max_concurrency: int, tokens_per_minute: int):
+        self.max_concurrency = max_concurrency
+        self.capacity = float(tokens_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._refilled_at = time.monotonic()
+        self._queue: list = []
+        self._seq = itertools.count()
+        self._active = 0
+        self._refill_timer: Optional[asyncio.TimerHandle] = None
+
+        self._admitted = {p: 0 for p in PRIORITY_NAMES}
+        self._timeouts = {p: 0 for p in PRIORITY_NAMES}
+        self._wait_total = {p: 0.0 for p in PRIORITY_NAMES}
+        self._wait_max = {p: 0.0 for p in PRIORITY_NAMES}
+
+    # ── token bucket ─────────────────────────────────────
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._refilled_at) * self.capacity / 60.0)
+        self._refilled_at = now
+
+    def _dispatch(self):
+        self._refill()
+        while self._queue and self._active < self.max_concurrency:
+            _, _, waiter = self._queue[0]
+            if waiter.future.done():  # timed out or cancelled while queued
+                heapq.heappop(self._queue)
+                continue
+            # A request bigger than the whole bucket is admitted once the bucket is full
+            needed = min(waiter.tokens, self.capacity)
+            if self._tokens < needed:
+                self._schedule_refill((needed - self._tokens) * 60.0 / self.capacity)
+                return
+            heapq.heappop(self._queue)
+            self._tokens -= waiter.tokens
+            self._active += 1
+            waiter.future.set_result(None)
+
+    def _schedule_refill(self, delay: float):
+        if self._refill_timer is None:
+            def _fire():
+                self._refill_timer = None
+                self._dispatch()
+            self._refill_timer = asyncio.get_running_loop().call_later(delay, _fire)
+
+    # ── public API ───────────────────────────────────────
+    @asynccontextmanager
+    async def slot(self, priority: int, tokens: int, timeout: Optional[float] = None):
+        """
+        Wait for an admission slot. Raises SchedulerTimeout if none is granted within
+        `timeout` seconds (default LLM_QUEUE_TIMEOUT_SECONDS).
+        """
+        timeout = settings.LLM_QUEUE_TIMEOUT_SECONDS if timeout is None else timeout
+        waiter = _Waiter(priority, tokens, asyncio.get_running_loop().create_future())
+        heapq.heappush(self._queue, (priority, next(self._seq), waiter))
+        self._dispatch()
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+        except asyncio.TimeoutError:
+            if not waiter.future.done():
+                waiter.future.cancel()
+                self._timeouts[priority] += 1
+                logger.warning(f"LLM admission timed out after {timeout}s ({PRIORITY_NAMES[priority]})")
+                raise SchedulerTimeout(f"No LLM capacity within {timeout}s")
+        except asyncio.CancelledError:
+            if not waiter.future.done():
+                waiter.future.cancel()
+                raise
+            # Admitted just as the caller was cancelled — give the slot back
+            self._release()
+            raise
+
+        waited = time.monotonic() - waiter.enqueued_at
+        self._admitted[priority] += 1
+        self._wait_total[priority] += waited
+        self._wait_max[priority] = max(self._wait_max[priority], waited)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _release(self):
+        self._active -= 1
+        self._dispatch()
+
+    def stats(self) -> dict:
+        self._refill()
+        depth = {name: 0 for name in PRIORITY_NAMES.values()}
+        for _, _, waiter in self._queue:
+            if not waiter.future.done():
+                depth[PRIORITY_NAMES[waiter.priority]] += 1
+        return {
+            "active": self._active,
+            "max_concurrency": self.max_concurrency,
+            "tokens_available": int(self._tokens),
+            "tokens_per_minute": int(self.capacity),
+            "queue_depth": depth,
+            "classes": {
+                name: {
+                    "admitted": self._admitted[p],
+                    "timeouts": self._timeouts[p],
+                    "avg_wait_ms": round(self._wait_total[p] / self._admitted[p] * 1000, 3) if self._admitted[p] else 0.0,
+                    "max_wait_ms": round(self._wait_max[p] * 1000, 3),
+                }
+                for p, name in PRIORITY_NAMES.items()
+            },
+        }
+
+
+scheduler = LLMScheduler(settings.LLM_MAX_CONCURRENCY, settings.LLM_TOKENS_PER_MINUTE)
@@ -0,0 +1,109 @@
+"""
+Complexity-based model routing for LLM turns.
+Each turn is scored from cheap features — length, intent cues, RAG hit, urgency and
+channel — and routed to the fast model with a tight token cap when it is simple,
+or to the full model when it needs depth. No extra model call is made to decide.
+"""
+
+import time
+from typing import Dict, List, Optional
+from config import settings
+from services import text_signals
+
+FAST = "fast"
+FULL = "full"
+
+# Cues that a turn needs explanation or multi-step reasoning
+_COMPLEX_CUES = [
+    "why", "explain", "compare", "difference", "how do i", "how can i", "how does",
+    "step by step", "steps", "troubleshoot", "not working", "doesn't work", "error",
+    "refund", "policy", "contract", "billing", "invoice", "charged twice", "dispute",
+    "cancel my", "escalate", "complaint", "summarize", "detail*", "pros and cons",
+]
+
+# Acknowledgements and chit-chat a small model answers just as well
+_SIMPLE_CUES = [
+    "hi", "hello", "hey", "thanks", "thank you", "thx", "ok", "okay", "yes", "yeah",
+    "yep", "no", "nope", "sure", "bye", "goodbye", "great", "cool", "got it", "perfect",
+]
+
+text_signals.register_family("complexity", {
+    "complex": _COMPLEX_CUES,
+    "simple": _SIMPLE_CUES,
+})
+
+_stats: Dict[str, Dict[str, float]] = {
+    tier: {"count": 0, "total_ms": 0.0, "max_tokens": 0} for tier in (FAST, FULL)
+}
+
+
+def classify_turn(
+    text: str,
+    knowledge_context: Optional[str] = None,
+    voice: bool = False,
+) -> dict:
+    """
+    Score a user turn and pick a tier. Returns
+    {"tier", "model", "max_tokens", "score", "reasons"}.
+    """
+    signals = text_signals.scan(text)
+    cues = signals.get("complexity", ())
+    words = len(text_signals.tokenize(text))
+
+    score = 0
+    reasons: List[str] = []
+    if "complex" in cues:
+        score += 2
+        reasons.append("complex_intent")
+    if words > 25:
+        score += 2
+        reasons.append("long")
+    elif words > 12:
+        score += 1
+        reasons.append("medium_length")
+    if text.count("?") > 1:
+        score += 1
+        reasons.append("multi_question")
+    if knowledge_context:
+        score += 1
+        reasons.append("rag_hit")
+    if signals.get("urgency"):
+        # Urgent callers always get the strongest model
+        score += settings.MODEL_ROUTER_THRESHOLD
+        reasons.append("urgent")
+    if "simple" in cues and words <= 6:
+        score -= 1
+        reasons.append("acknowledgement")
+
+    if settings.MODEL_ROUTER_ENABLED and settings.FAST_MODEL and score < settings.MODEL_ROUTER_THRESHOLD:
+        tier, model = FAST, settings.FAST_MODEL
+        max_tokens = settings.FAST_MAX_TOKENS if words > 6 else min(settings.FAST_MAX_TOKENS, 80)
+    else:
+        tier, model = FULL, settings.OPENAI_MODEL
+        max_tokens = settings.FULL_MAX_TOKENS
+
+    if voice:
+        # Spoken replies past a few sentences only add TTS time
+        max_tokens = min(max_tokens, settings.VOICE_MAX_TOKENS)
+
+    return {"tier": tier, "model": model, "max_tokens": max_tokens, "score": score, "reasons": reasons}
+
+
+def record(tier: str, started: float, max_tokens: int):
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    s = _stats[tier]
+    s["count"] += 1
+    s["total_ms"] += elapsed_ms
+    s["max_tokens"] += max_tokens
+
+
+def get_model_router_stats() -> dict:
+    """Per-tier turn counts, average latency and average token cap."""
+    return {
+        tier: {
+            "count": s["count"],
+            "avg_ms": round(s["total_ms"] / s["count"], 3) if s["count"] else 0.0,
+            "avg_max_tokens": round(s["max_tokens"] / s["count"], 1) if s["count"] else 0.0,
+        }
+        for tier, s in _stats.items()
+    }
@@ -0,0 +1,60 @@
+"""
+Offline speech-recognition engine, run inside worker processes.
+Decodes audio, finds voiced frames and recognizes them with faster-whisper when it
+is installed. Otherwise a deterministic stand-in maps the audio content to a fixed
+phrase: same audio, same transcript, no network. Everything here is
+module-level and picklable so it can run under a ProcessPoolExecutor.
+"""
+
+import hashlib
+from typing import Optional, Sequence
+import numpy as np
+from services import audio_segmenter
+
+try:
+    from faster_whisper import WhisperModel
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    FASTER_WHISPER_AVAILABLE = False
+
+_VOICED_RMS = 300.0  # int16 RMS above which a 20 ms frame counts as speech
+_model = None  # per worker process
+
+
+def _voiced_seconds(samples: np.ndarray, rate: int) -> float:
+    frame = max(1, int(rate * 0.02))
+    n = len(samples) // frame
+    if n == 0:
+        return 0.0
+    rms = np.sqrt(np.mean(samples[: n * frame].astype(np.float32).reshape(n, frame) ** 2, axis=1))
+    return float(np.count_nonzero(rms > _VOICED_RMS)) * 0.02
+
+
+def _whisper(samples: np.ndarray, rate: int, language: Optional[str], model_name: str) -> str:
+    global _model
+    if _model is None:
+        _model = WhisperModel(model_name, device="cpu", compute_type="int8")
+    audio = samples.astype(np.float32) / 32768.0
+    if rate != audio_segmenter.SAMPLE_RATE:
+        # Linear resample to the 16 kHz the model expects
+        n = int(len(audio) * audio_segmenter.SAMPLE_RATE / rate)
+        audio = np.interp(np.linspace(0, len(audio) - 1, n), np.arange(len(audio)), audio).astype(np.float32)
+    segments, _ = _model.transcribe(audio, language=language)
+    return " ".join(s.text.strip() for s in segments).strip()
+
+
+def recognize(audio_bytes: bytes, language: Optional[str], model_name: str, phrases: Sequence[str]) -> str:
+    """
+    Transcribe one recording. Returns "" for audio without speech.
+    Raises ValueError when the audio can't be decoded.
+    """
+    decoded = audio_segmenter.decode(audio_bytes)
+    if decoded is None:
+        raise ValueError("Unsupported audio format for offline STT (WAV, or install ffmpeg)")
+    samples, rate = decoded
+    if _voiced_seconds(samples, rate) == 0.0:
+        return ""
+    if FASTER_WHISPER_AVAILABLE:
+        return _whisper(samples, rate, language, model_name)
+    digest = hashlib.sha256(samples.tobytes()).digest()
+    return phrases[int.from_bytes(digest[:8], "big") % len(phrases)]
@@ -0,0 +1,29 @@
+"""
+Opaque cursors for keyset pagination.
+A cursor is the sort key of the last row on a page, JSON-encoded and base64url'd, so
+the next page is a range seek on an index (WHERE key < cursor) instead of an OFFSET
+that reads and discards every earlier row. Clients pass it back untouched.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+
+def encode_cursor(*values) -> str:
+    payload = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types) -> tuple:
+    """Decode a cursor into values of `types`; raises ValueError if it is malformed."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except Exception as e:
+        raise ValueError("Malformed cursor") from e
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError("Malformed cursor")
+    # Datetimes travel as ISO strings; every other value as its own JSON type
+    if not all(isinstance(v, str if t is datetime else t) for v, t in zip(values, types)):
+        raise ValueError("Malformed cursor")
+    return tuple(datetime.fromisoformat(v) if t is datetime else v for v, t in zip(values, types))
@@ -0,0 +1,131 @@
+"""
+Versioned knowledge / canned-response data pack for the demo engine.
+The pack is a JSON file loaded lazily on first use, compiled into keyword matchers once
+per load, and hot-reloaded when the file changes — editing an answer needs no deploy.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Union
+from config import settings
+from loguru import logger
+from services import text_signals
+from services.keyword_matcher import KeywordMatcher
+
+SUPPORTED_FORMATS = (1,)
+
+_DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "response_pack.json")
+
+
+class ResponsePack:
+    """One immutable, fully indexed snapshot of the data pack."""
+
+    def __init__(self, data: dict, path: str, mtime: float):
+        fmt = data.get("format")
+        if fmt not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported response pack format: {fmt!r}")
+
+        self.path = path
+        self.mtime = mtime
+        self.loaded_at = time.time()
+        self.version: str = str(data.get("version", "unknown"))
+        self.knowledge: Dict[str, Union[str, List[str]]] = data["knowledge"]
+        self.capitals: Dict[str, str] = data["capitals"]
+        self.support: Dict[str, List[str]] = data["support"]
+        self.emotions: Dict[str, List[str]] = data["emotions"]
+        self.feelings: Dict[str, List[str]] = data["feelings"]
+
+        missing = [f for f in self.feelings if f not in self.emotions]
+        if missing:
+            raise ValueError(f"Feelings without emotion responses: {missing}")
+
+        # Matcher index — compiled once per load, shared by every turn
+        self.capital_matcher = KeywordMatcher(c for c in self.capitals if c != "default")
+        self.knowledge_matcher = KeywordMatcher(self.knowledge)
+        self.support_matcher = KeywordMatcher(self.support)
+
+    def info(self) -> dict:
+        return {
+            "version": self.version,
+            "path": self.path,
+            "loaded_at": self.loaded_at,
+            "knowledge_entries": len(self.knowledge),
+            "capitals": len(self.capital_matcher),
+            "support_topics": len(self.support),
+            "feelings": len(self.feelings),
+        }
+
+
+_pack: Optional[ResponsePack] = None
+_last_check = 0.0
+_rejected_mtime: Optional[float] = None  # last broken file we refused, to avoid re-parsing it
+_lock = threading.Lock()
+
+
+def pack_path() -> str:
+    return settings.RESPONSE_PACK_PATH or _DEFAULT_PATH
+
+
+def _load(path: str) -> ResponsePack:
+    started = time.perf_counter()
+    mtime = os.stat(path).st_mtime
+    with open(path, encoding="utf-8") as f:
+        pack = ResponsePack(json.load(f), path, mtime)
+    text_signals.register_family("feeling", pack.feelings)
+    logger.info(
+        f"Response pack v{pack.version} loaded from {path} "
+        f"in {(time.perf_counter() - started) * 1000:.1f}ms"
+    )
+    return pack
+
+
+def reload_pack() -> ResponsePack:
+    """Force a reload from disk. On failure the previous pack stays active."""
+    global _pack, _last_check, _rejected_mtime
+    with _lock:
+        path = pack_path()
+        try:
+            _pack = _load(path)
+            _rejected_mtime = None
+        except Exception as e:
+            if _pack is None:
+                raise
+            try:
+                _rejected_mtime = os.stat(path).st_mtime
+            except OSError:
+                _rejected_mtime = None
+            logger.error(f"Response pack reload failed, keeping v{_pack.version}: {e}")
+        _last_check = time.monotonic()
+        return _pack
+
+
+def get_pack() -> ResponsePack:
+    """
+    Return the active pack, loading it on first use. At most every
+    RESPONSE_PACK_RELOAD_SECONDS the file's mtime is checked and a changed
+    pack is swapped in atomically.
+    """
+    global _last_check
+    pack = _pack
+    if pack is None:
+        return reload_pack()
+
+    interval = settings.RESPONSE_PACK_RELOAD_SECONDS
+    if interval > 0 and time.monotonic() - _last_check >= interval:
+        _last_check = time.monotonic()
+        try:
+            mtime = os.stat(pack_path()).st_mtime
+            changed = (mtime != pack.mtime or pack_path() != pack.path) and mtime != _rejected_mtime
+        except OSError as e:
+            logger.warning(f"Response pack stat failed: {e}")
+            changed = False
+        if changed:
+            return reload_pack()
+    return pack
+
+
+def pack_info() -> dict:
+    """Metadata of the active pack, or a not-loaded marker (does not trigger a load)."""
+    return _pack.info() if _pack is not None else {"loaded": False, "path": pack_path()}
@@ -0,0 +1,205 @@
+"""
+Tiered response router that sits in front of the LLM.
+Cheap, deterministic intents (small talk, arithmetic, linear equations, capitals)
+are answered by the local engine when it is confident; everything else escalates to GPT.
+"""
+
+import asyncio
+import re
+import random
+import time
+from typing import List, Dict, Optional, Tuple
+from config import settings
+from loguru import logger
+from services import ai_service
+from services.llm_scheduler import PRIORITY_TEXT, SchedulerTimeout
+from services.response_pack import get_pack
+
+# Tokens that carry no intent of their own — they never lower a matcher's confidence
+_FILLER = {
+    "a", "an", "the", "is", "are", "was", "of", "to", "for", "and", "so", "very", "much",
+    "please", "pls", "can", "could", "you", "u", "me", "tell", "what", "whats", "what's",
+    "how", "hi", "hello", "hey", "there", "ok", "okay", "just", "quick", "question",
+    "calculate", "compute", "solve", "find", "evaluate", "equals", "equal", "answer",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+|[=+\-*/%^]", re.IGNORECASE)
+
+# (patterns, responses) pairs that can be answered without any context
+_SMALL_TALK = [
+    (ai_service._GREETINGS, ai_service._GREETING_RESPONSES),
+    (ai_service._HOWAREYOU, ai_service._HOWAREYOU_RESPONSES),
+    (ai_service._THANKS, ai_service._THANKS_RESPONSES),
+    (ai_service._GOODBYE, ai_service._GOODBYE_RESPONSES),
+]
+
+_CAPITAL_RE = re.compile(r"\bcapital\b", re.IGNORECASE)
+
+TIERS = ("local", "llm")
+
+_stats = {tier: {"count": 0, "total_ms": 0.0, "max_ms": 0.0} for tier in TIERS}
+_busy = {"count": 0}  # turns turned away because the LLM queue timed out
+
+
+# ─────────────────────────────────────────────────────────
+#  CONFIDENCE SCORING
+# ─────────────────────────────────────────────────────────
+
+def _coverage(text: str, spans: List[Tuple[int, int]], extra_ok=None) -> float:
+    """
+    Fraction of the message's tokens explained by the matched spans, filler words,
+    or tokens accepted by `extra_ok`. 1.0 means nothing in the message is left unanswered.
+    """
+    tokens = list(_TOKEN_RE.finditer(text))
+    if not tokens:
+        return 0.0
+    explained = 0
+    for tok in tokens:
+        word = tok.group(0).lower()
+        if word in _FILLER or any(s <= tok.start() and tok.end() <= e for s, e in spans):
+            explained += 1
+        elif extra_ok is not None and extra_ok(word):
+            explained += 1
+    return explained / len(tokens)
+
+
+def _spans(text: str, patterns) -> List[Tuple[int, int]]:
+    return [m.span() for m in ai_service._family_regex(tuple(patterns)).finditer(text)]
+
+
+# ─────────────────────────────────────────────────────────
+#  LOCAL MATCHERS — each returns (response, confidence) or None
+# ─────────────────────────────────────────────────────────
+
+def _match_small_talk(text: str) -> Optional[Tuple[str, float]]:
+    for patterns, responses in _SMALL_TALK:
+        spans = _spans(text, patterns)
+        if spans:
+            return random.choice(responses), _coverage(text, spans)
+    return None
+
+
+async def _match_math(text: str) -> Optional[Tuple[str, float]]:
+    spans = [
+        m.span()
+        for m in (ai_service._WORD_MATH_PATTERN.search(text), ai_service._MATH_PATTERN.search(text))
+        if m
+    ]
+    if not spans:
+        return None
+    answer = await ai_service._try_math_async(text)
+    if answer is None:
+        return None
+    return answer, _coverage(text, spans)
+
+
+def _is_equation_token(word: str) -> bool:
+    return len(word) == 1 or any(ch.isdigit() for ch in word)
+
+
+def _match_linear_equation(text: str) -> Optional[Tuple[str, float]]:
+    if "=" not in text:
+        return None
+    answer = ai_service._try_linear_equation(text)
+    if answer is None:
+        return None
+    return answer, _coverage(text, [], extra_ok=_is_equation_token)
+
+
+def _match_capital(text: str) -> Optional[Tuple[str, float]]:
+    # A bare country mention ("calling from India") is not a capital question
+    cap_match = _CAPITAL_RE.search(text)
+    if not cap_match:
+        return None
+    pack = get_pack()
+    answer = ai_service._find_capital(text)
+    if answer is None or answer == pack.capitals["default"]:
+        return None
+    country_spans = pack.capital_matcher.spans(text)
+    return answer, _coverage(text, [cap_match.span()] + country_spans)
+
+
+_LOCAL_MATCHERS = [_match_small_talk, _match_math, _match_linear_equation, _match_capital]
+
+
+async def local_answer(text: str) -> Optional[Tuple[str, float]]:
+    """Return the most confident local answer for `text`, or None if nothing matched."""
+    best = None
+    for matcher in _LOCAL_MATCHERS:
+        try:
+            candidate = matcher(text)
+            if asyncio.iscoroutine(candidate):
+                candidate = await candidate
+        except Exception as e:
+            logger.warning(f"Local matcher {matcher.__name__} failed: {e}")
+            continue
+        if candidate and (best is None or candidate[1] > best[1]):
+            best = candidate
+    return best
+
+
+# ─────────────────────────────────────────────────────────
+#  ROUTER
+# ─────────────────────────────────────────────────────────
+
+def _record(tier: str, started: float):
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    s = _stats[tier]
+    s["count"] += 1
+    s["total_ms"] += elapsed_ms
+    s["max_ms"] = max(s["max_ms"], elapsed_ms)
+
+
+async def route_response(
+    messages: List[Dict[str, str]],
+    knowledge_context: Optional[str] = None,
+    language: str = "en",
+    priority: int = PRIORITY_TEXT,
+) -> str:
+    """
+    Answer the latest user turn locally when a cheap matcher is confident,
+    otherwise fall through to `ai_service.generate_response`, admitted by the
+    LLM scheduler at `priority`. Raises SchedulerTimeout when no LLM capacity frees
+    up in time; the routes report that to the user as busy.
+    """
+    started = time.perf_counter()
+    last_msg = ""
+    for m in reversed(messages):
+        if m["role"] == "user":
+            last_msg = m["content"]
+            break
+
+    # Local answers are English-only canned text
+    if settings.LOCAL_ROUTER_ENABLED and last_msg and language in ("en", "auto"):
+        candidate = await local_answer(last_msg.lower().strip())
+        if candidate and candidate[1] >= settings.LOCAL_ROUTER_MIN_CONFIDENCE:
+            _record("local", started)
+            logger.info(f"[ROUTER] local ({candidate[1]:.2f}) '{last_msg[:40]}'")
+            return candidate[0]
+
+    try:
+        response = await ai_service.generate_response(messages, knowledge_context, language, priority)
+    except SchedulerTimeout:
+        _busy["count"] += 1
+        raise
+    _record("llm", started)
+    return response
+
+
+def get_router_stats() -> dict:
+    """Per-tier request counts and latency, the share answered locally, and busy rejections."""
+    total = sum(s["count"] for s in _stats.values())
+    tiers = {
+        tier: {
+            "count": s["count"],
+            "avg_ms": round(s["total_ms"] / s["count"], 3) if s["count"] else 0.0,
+            "max_ms": round(s["max_ms"], 3),
+        }
+        for tier, s in _stats.items()
+    }
+    return {
+        "tiers": tiers,
+        "total": total,
+        "local_ratio": round(_stats["local"]["count"] / total, 4) if total else 0.0,
+        "busy": _busy["count"],
+    }
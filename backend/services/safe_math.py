@@ -0,0 +1,144 @@
+"""
+Cost-bounded arithmetic evaluator for user-supplied expressions.
+Every expression is checked against static limits (input length, AST size and depth)
+and every operation against result-size limits *before* it runs, so a hostile
+utterance like "9 ^ 9 ^ 9" is rejected in microseconds instead of pinning a worker.
+"""
+
+import ast
+import asyncio
+import math
+import operator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Union
+from config import settings
+
+Number = Union[int, float]
+
+MAX_INPUT_CHARS = 200
+MAX_NODES = 64
+MAX_DEPTH = 16
+MAX_EXPONENT = 4096
+MAX_RESULT_BITS = 4096
+
+_BIN_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow,
+    ast.Mod: operator.mod,
+}
+
+_UNARY_OPS = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+# Heavy expressions are evaluated here so the event loop never runs them
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="safe-math")
+
+
+class MathLimitError(ValueError):
+    """Raised when an expression exceeds the evaluator's cost limits."""
+
+
+def _check_bits(value: Number) -> Number:
+    if isinstance(value, int) and value.bit_length() > MAX_RESULT_BITS:
+        raise MathLimitError("Result too large")
+    if isinstance(value, float) and not math.isfinite(value):
+        raise MathLimitError("Result too large")
+    return value
+
+
+def _check_pow(base: Number, exp: Number):
+    if abs(exp) > MAX_EXPONENT:
+        raise MathLimitError("Exponent too large")
+    if isinstance(base, int) and isinstance(exp, int) and exp > 0:
+        # |base ** exp| needs at least (bit_length(base) - 1) * exp bits
+        if (abs(base).bit_length() - 1) * exp > MAX_RESULT_BITS:
+            raise MathLimitError("Result too large")
+
+
+def _check_mul(a: Number, b: Number):
+    if isinstance(a, int) and isinstance(b, int):
+        # |a * b| needs at least bit_length(a) + bit_length(b) - 1 bits
+        if abs(a).bit_length() + abs(b).bit_length() - 1 > MAX_RESULT_BITS:
+            raise MathLimitError("Result too large")
+
+
+def parse(expr: str) -> ast.Expression:
+    """Parse `expr` and validate it against the static size limits."""
+    if len(expr) > MAX_INPUT_CHARS:
+        raise MathLimitError("Expression too long")
+    tree = ast.parse(expr, mode="eval")
+
+    nodes = 0
+    stack = [(tree.body, 1)]
+    while stack:
+        node, depth = stack.pop()
+        nodes += 1
+        if nodes > MAX_NODES:
+            raise MathLimitError("Expression too complex")
+        if depth > MAX_DEPTH:
+            raise MathLimitError("Expression nested too deeply")
+        if isinstance(node, ast.Constant):
+            if type(node.value) not in (int, float):
+                raise ValueError("Unsupported constant")
+            _check_bits(node.value)
+        elif isinstance(node, ast.BinOp):
+            if type(node.op) not in _BIN_OPS:
+                raise ValueError("Unsupported op")
+            stack.append((node.left, depth + 1))
+            stack.append((node.right, depth + 1))
+        elif isinstance(node, ast.UnaryOp):
+            if type(node.op) not in _UNARY_OPS:
+                raise ValueError("Unsupported unary op")
+            stack.append((node.operand, depth + 1))
+        else:
+            raise ValueError("Unsupported node")
+    return tree
+
+
+def _eval(node) -> Number:
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.UnaryOp):
+        return _UNARY_OPS[type(node.op)](_eval(node.operand))
+    left, right = _eval(node.left), _eval(node.right)
+    if isinstance(node.op, ast.Pow):
+        _check_pow(left, right)
+    elif isinstance(node.op, ast.Mult):
+        _check_mul(left, right)
+    result = _BIN_OPS[type(node.op)](left, right)
+    if isinstance(result, complex):
+        raise ValueError("Complex result")
+    return _check_bits(result)
+
+
+def evaluate(expr: str) -> Number:
+    """
+    Evaluate an arithmetic expression synchronously.
+    Raises MathLimitError when limits are exceeded, and ValueError / ArithmeticError
+    for anything that isn't plain arithmetic or can't be computed.
+    """
+    return _eval(parse(expr).body)
+
+
+def is_heavy(tree: ast.Expression) -> bool:
+    """Exponentiation is the only operation whose cost grows faster than its operands."""
+    return any(isinstance(n, ast.BinOp) and isinstance(n.op, ast.Pow) for n in ast.walk(tree))
+
+
+async def evaluate_async(expr: str, timeout: Optional[float] = None) -> Number:
+    """
+    Evaluate without blocking the event loop. Light expressions run inline;
+    heavy ones run on a worker thread and are abandoned after `timeout` seconds
+    (asyncio.TimeoutError). The static limits keep abandoned work short-lived.
+    """
+    tree = parse(expr)
+    if not is_heavy(tree):
+        return _eval(tree.body)
+    loop = asyncio.get_running_loop()
+    timeout = settings.MATH_EVAL_TIMEOUT_SECONDS if timeout is None else timeout
+    return await asyncio.wait_for(loop.run_in_executor(_executor, _eval, tree.body), timeout)
@@ -0,0 +1,106 @@
+"""
+Re-score stored user messages with the current sentiment scorer.
+Walks the messages table in primary-key order, scores each batch in one vectorized
+pass and writes sentiment, emotion and urgency back with a bulk update, moving each
+changed row between the analytics rollup counters in the same transaction, then
+rebuilds each touched conversation's sentiment aggregates.
+
+Run from backend/:
+    python -m services.sentiment_backfill [--missing-only] [--rebuild-aggregates] [--batch-size 1000] [--dry-run]
+"""
+
+import argparse
+import asyncio
+import time
+from sqlalchemy import select, update
+from config import settings
+from loguru import logger
+from models.database import async_session
+from models.entities import Conversation, Message
+from services import analytics_cache
+from services.analytics_rollups import RollupDelta, apply
+from services.conversation_aggregates import rebuild
+from services.sentiment_service import analyze_sentiment_batch
+
+
+async def rescore_messages(
+    batch_size: int = None,
+    missing_only: bool = False,
+    dry_run: bool = False,
+    rebuild_all: bool = False,
+) -> dict:
+    """
+    Re-score user messages. Returns counts of scanned / changed rows. Conversations
+    with a changed message get their aggregates rebuilt — every scanned one with
+    `rebuild_all` (e.g. to seed aggregates for history written before they existed).
+    """
+    batch_size = batch_size or settings.SENTIMENT_BACKFILL_BATCH
+    result = {"scanned": 0, "changed": 0, "conversations": 0, "seconds": 0.0}
+    started = time.perf_counter()
+    last_id = ""
+    touched = set()
+
+    while True:
+        async with async_session() as db:
+            query = (
+                select(Message.id, Message.conversation_id, Message.content, Message.created_at,
+                       Message.sentiment_score, Message.emotion, Message.is_urgent, Conversation.channel)
+                .join(Conversation, Conversation.id == Message.conversation_id)
+                .where(Message.role == "user", Message.id > last_id)
+                .order_by(Message.id)
+                .limit(batch_size)
+            )
+            if missing_only:
+                query = query.where(Message.sentiment_score.is_(None))
+            rows = (await db.execute(query)).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            result["scanned"] += len(rows)
+            if rebuild_all:
+                touched.update(r.conversation_id for r in rows)
+
+            scores = analyze_sentiment_batch([r.content for r in rows])
+            changes = []
+            delta = RollupDelta()
+            for r, s in zip(rows, scores):
+                if (r.sentiment_score, r.emotion, bool(r.is_urgent)) != (
+                    s["sentiment_score"], s["emotion"], s["is_urgent"]
+                ):
+                    changes.append({"id": r.id, **s})
+                    touched.add(r.conversation_id)
+                    delta.message(r.created_at, r.channel, r.emotion, r.is_urgent, r.sentiment_score, sign=-1)
+                    delta.message(r.created_at, r.channel, s["emotion"], s["is_urgent"], s["sentiment_score"])
+            result["changed"] += len(changes)
+            if changes and not dry_run:
+                await db.execute(update(Message), changes)
+                await apply(db, delta)
+                await db.commit()
+                await analytics_cache.bump()
+
+    if touched and not dry_run:
+        async with async_session() as db:
+            await rebuild(db, touched)
+            await db.commit()
+    result["conversations"] = len(touched)
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    logger.info(
+        f"Sentiment backfill: {result['changed']}/{result['scanned']} messages re-scored, "
+        f"{result['conversations']} conversations{' (dry run)' if dry_run else ''} in {result['seconds']}s"
+    )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--missing-only", action="store_true", help="only messages without a score")
+    parser.add_argument("--dry-run", action="store_true", help="count changes without writing")
+    parser.add_argument("--rebuild-aggregates", action="store_true",
+                        help="rebuild sentiment aggregates of every scanned conversation")
+    args = parser.parse_args()
+    asyncio.run(rescore_messages(args.batch_size, args.missing_only, args.dry_run, args.rebuild_aggregates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Precompiled lexicon sentiment scorer.
+Compiles TextBlob's English sentiment lexicon (the same word scores TextBlob's
+PatternAnalyzer uses) into NumPy arrays once, then scores whole batches of texts with
+array operations: intensifiers ("very good"), negation ("not good", "not a good"),
+exclamation boosts and emoticons follow TextBlob's rules, and the polarity is the mean
+over the assessed words. Single utterances take a plain-list path over the same
+arrays (NumPy call overhead outweighs the work for one short text) and are memoized
+in an LRU cache.
+"""
+
+import re
+from functools import lru_cache
+from typing import List, Sequence
+import numpy as np
+from config import settings
+from textblob._text import EMOTICONS
+from textblob.en import sentiment as _textblob_lexicon
+
+NEGATIONS = ("no", "not", "n't", "never")
+_EXCLAMATION_BOOST = 1.25
+_NEGATED_FACTOR = -0.5  # "not good" = slightly bad, "not bad" = slightly good
+
+
+def _compile():
+    """Vocabulary and per-token arrays. Two reserved ids mark unknown words."""
+    vocab = {}
+    polarity, intensity, known, modifier, negation = [], [], [], [], []
+
+    def add(token, p=0.0, i=1.0, is_known=False, is_modifier=False):
+        vocab[token] = len(polarity)
+        polarity.append(p)
+        intensity.append(i)
+        known.append(is_known)
+        modifier.append(is_modifier)
+        negation.append(token in NEGATIONS)
+
+    for word, senses in _textblob_lexicon.items():  # first access loads the XML
+        p, _, i = senses[None]
+        add(word, p, i, True, "RB" in senses)
+    for (_, p), faces in EMOTICONS.items():
+        for face in faces:
+            if face.lower() not in vocab:
+                add(face.lower(), p, 1.0, True)
+    for word in NEGATIONS + ("!",):
+        if word not in vocab:
+            add(word)
+
+    unknown, unknown_short = len(polarity), len(polarity) + 1
+    polarity += [0.0, 0.0]
+    intensity += [1.0, 1.0]
+    known += [False, False]
+    modifier += [False, False]
+    negation += [False, False]
+    short = np.zeros(len(polarity), dtype=bool)
+    short[unknown_short] = True  # "not a good": negation carries over one-letter words
+
+    return (
+        vocab, unknown, unknown_short,
+        np.array(polarity, dtype=np.float64), np.array(intensity, dtype=np.float64),
+        np.array(known), np.array(modifier), np.array(negation), short,
+    )
+
+
+(_VOCAB, _UNKNOWN, _UNKNOWN_SHORT,
+ _POLARITY, _INTENSITY, _KNOWN, _MODIFIER, _NEGATION, _SHORT) = _compile()
+_EXCLAMATION_ID = _VOCAB["!"]
+
+_faces = sorted({f.lower() for faces in EMOTICONS.values() for f in faces}, key=len, reverse=True)
+_TOKEN_RE = re.compile(
+    r"(?<!\S)(?:" + "|".join(map(re.escape, _faces)) + r")(?!\S)"
+    r"|[a-z0-9]+(?:[-'][a-z0-9]+)*|!"
+)
+
+
+def _token_ids(text: str) -> List[int]:
+    text = text.lower().replace("’", "'").replace("n't", " n't")
+    get = _VOCAB.get
+    return [
+        get(t, _UNKNOWN_SHORT if len(t.strip("'")) <= 1 else _UNKNOWN)
+        for t in _TOKEN_RE.findall(text)
+    ]
+
+
+def score_batch(texts: Sequence[str]) -> np.ndarray:
+    """Polarity in [-1, 1] for each text (0.0 when no word is in the lexicon)."""
+    n_docs = len(texts)
+    per_doc = [_token_ids(t or "") for t in texts]
+    lengths = np.fromiter((len(ids) for ids in per_doc), dtype=np.int64, count=n_docs)
+    if lengths.sum() == 0:
+        return np.zeros(n_docs)
+    ids = np.fromiter((i for doc_ids in per_doc for i in doc_ids), dtype=np.int64, count=int(lengths.sum()))
+    doc = np.repeat(np.arange(n_docs), lengths)
+    n = len(ids)
+
+    # Token j's predecessor (and the one before it) within the same text
+    prev = np.empty(n, dtype=np.int64)
+    prev[0], prev[1:] = _UNKNOWN, ids[:-1]
+    prev[np.r_[True, doc[1:] != doc[:-1]]] = _UNKNOWN
+    prev2 = np.empty(n, dtype=np.int64)
+    prev2[0] = _UNKNOWN
+    prev2[1:] = prev[:-1]
+
+    known = _KNOWN[ids]
+    polarity = _POLARITY[ids]
+
+    # "very good": a known word right after a known intensifier absorbs it
+    merged = known & _KNOWN[prev] & _MODIFIER[prev]
+    polarity = np.where(merged, np.clip(polarity * _INTENSITY[prev], -1.0, 1.0), polarity)
+    assessed = known & ~np.r_[merged[1:], False]
+
+    # "not good" / "not a good"; a negated intensifier negates its whole phrase ("not very good")
+    negated = known & (_NEGATION[prev] | (_SHORT[prev] & _NEGATION[prev2]))
+    phrase = np.cumsum(~merged) - 1  # tokens merged into one assessment share an id
+    negated = negated[~merged][phrase] & known
+
+    # "good!!": each exclamation mark boosts the latest assessed word of its text
+    positions = np.arange(n)
+    latest = np.maximum.accumulate(np.where(assessed, positions, -1))
+    bangs = positions[ids == _EXCLAMATION_ID]
+    targets = latest[bangs]
+    targets = targets[(targets >= 0) & (doc[np.maximum(targets, 0)] == doc[bangs])]
+    if len(targets):
+        boosts = np.bincount(targets, minlength=n)
+        polarity = np.clip(polarity * _EXCLAMATION_BOOST ** boosts, -1.0, 1.0)
+
+    polarity = np.where(negated, polarity * _NEGATED_FACTOR, polarity)
+    sums = np.bincount(doc[assessed], weights=polarity[assessed], minlength=n_docs)
+    counts = np.bincount(doc[assessed], minlength=n_docs)
+    return sums / np.maximum(counts, 1)
+
+
+# Plain-list views for the single-text path, where per-call NumPy overhead dominates
+_POLARITY_L, _INTENSITY_L = _POLARITY.tolist(), _INTENSITY.tolist()
+_KNOWN_L, _MODIFIER_L, _NEGATION_L, _SHORT_L = _KNOWN.tolist(), _MODIFIER.tolist(), _NEGATION.tolist(), _SHORT.tolist()
+
+
+def _score_ids(ids: List[int]) -> float:
+    """The score_batch rules applied token by token to one text."""
+    phrases = []  # [polarity, negated] per assessed phrase
+    prev = prev2 = _UNKNOWN
+    for i in ids:
+        if _KNOWN_L[i]:
+            if _KNOWN_L[prev] and _MODIFIER_L[prev]:
+                phrases[-1][0] = max(-1.0, min(_POLARITY_L[i] * _INTENSITY_L[prev], 1.0))
+            else:
+                negated = _NEGATION_L[prev] or (_SHORT_L[prev] and _NEGATION_L[prev2])
+                phrases.append([_POLARITY_L[i], negated])
+        elif i == _EXCLAMATION_ID and phrases:
+            phrases[-1][0] = max(-1.0, min(phrases[-1][0] * _EXCLAMATION_BOOST, 1.0))
+        prev2, prev = prev, i
+    if not phrases:
+        return 0.0
+    return sum(p * _NEGATED_FACTOR if negated else p for p, negated in phrases) / len(phrases)
+
+
+@lru_cache(maxsize=settings.SENTIMENT_CACHE_SIZE)
+def score(text: str) -> float:
+    """Polarity of one utterance, memoized for repeated phrases."""
+    return _score_ids(_token_ids(text or ""))
+
+
+def cache_stats() -> dict:
+    info = score.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "vocabulary": len(_VOCAB),
+        "cache_hits": info.hits,
+        "cache_misses": info.misses,
+        "cache_hit_rate": round(info.hits / lookups, 3) if lookups else 0.0,
+        "cache_entries": info.currsize,
+    }
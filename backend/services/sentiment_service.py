@@ -1,9 +1,12 @@
 """
 Sentiment analysis and emotion / urgency detection.
+Polarity comes from the precompiled lexicon scorer (TextBlob's lexicon and rules,
+without building a TextBlob per message).
 """
 
-from textblob import TextBlob
+from typing import List, Sequence
 from loguru import logger
+from services import sentiment_lexicon, text_signals
 
 URGENCY_KEYWORDS = [
     "urgent", "emergency", "immediately", "asap", "critical", "help me",
@@ -13,6 +16,8 @@ URGENCY_KEYWORDS = [
     "turant", "jaldi", "madad", "bachao", "emergency",
 ]
 
+text_signals.register_family("urgency", URGENCY_KEYWORDS)
+
 EMOTION_MAP = {
     (0.5, 1.0): "very_positive",
     (0.1, 0.5): "positive",
@@ -22,34 +27,37 @@ EMOTION_MAP = {
 }
 
 
+def _emotion(polarity: float) -> str:
+    for (lo, hi), label in EMOTION_MAP.items():
+        if lo <= polarity < hi or polarity == hi == 1.0:
+            return label
+    return "neutral"
+
+
+def _result(text: str, polarity: float) -> dict:
+    return {
+        "sentiment_score": round(polarity, 4),
+        "emotion": _emotion(polarity),
+        # Urgency detection (whole words — "know" no longer counts as "now")
+        "is_urgent": bool(text_signals.scan(text)["urgency"]),
+    }
+
+
 def analyze_sentiment(text: str) -> dict:
     """
     Return sentiment score, detected emotion label, and urgency flag.
     """
     try:
-        blob = TextBlob(text)
-        polarity = blob.sentiment.polarity  # -1.0 … 1.0
-
-        # Emotion label
-        emotion = "neutral"
-        for (lo, hi), label in EMOTION_MAP.items():
-            if lo <= polarity < hi:
-                emotion = label
-                break
-
-        # Urgency detection
-        lower = text.lower()
-        is_urgent = any(kw in lower for kw in URGENCY_KEYWORDS)
-
-        result = {
-            "sentiment_score": round(polarity, 4),
-            "emotion": emotion,
-            "is_urgent": is_urgent,
-        }
-
+        result = _result(text, sentiment_lexicon.score(text))
         logger.debug(f"Sentiment: {result}")
         return result
 
     except Exception as e:
         logger.error(f"Sentiment analysis error: {e}")
         return {"sentiment_score": 0.0, "emotion": "neutral", "is_urgent": False}
+
+
+def analyze_sentiment_batch(texts: Sequence[str]) -> List[dict]:
+    """analyze_sentiment for many texts in one vectorized pass (backfills, re-scoring)."""
+    polarities = sentiment_lexicon.score_batch(texts)
+    return [_result(text or "", float(p)) for text, p in zip(texts, polarities)]
@@ -0,0 +1,75 @@
+"""
+Request coalescing ("singleflight") for identical concurrent upstream calls.
+While a call for a key is in flight, later callers with the same key wait for its
+result instead of issuing their own request to OpenAI / ElevenLabs.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, List, TypeVar
+from config import settings
+
+T = TypeVar("T")
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one upstream request.
+
+    At most `max_waiters` callers attach to a flight; beyond that, callers make their
+    own request rather than piling onto an unbounded waiter list.
+    """
+
+    def __init__(self, name: str, max_waiters: int = None):
+        self.name = name
+        self.max_waiters = max_waiters if max_waiters is not None else settings.SINGLEFLIGHT_MAX_WAITERS
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self.calls = 0
+        self.upstream_calls = 0
+        self.coalesced = 0
+        self.overflow = 0
+        _groups.append(self)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run `fn` for `key`, or share the result of an identical call already in flight."""
+        self.calls += 1
+        flight = self._inflight.get(key)
+        if flight is not None:
+            if flight.waiters < self.max_waiters:
+                flight.waiters += 1
+                self.coalesced += 1
+                return await asyncio.shield(flight.task)
+            self.overflow += 1
+            self.upstream_calls += 1
+            return await fn()
+
+        # The upstream call runs as its own task so a cancelled caller doesn't cancel it for everyone
+        self.upstream_calls += 1
+        task = asyncio.ensure_future(fn())
+        self._inflight[key] = _Flight(task)
+        task.add_done_callback(lambda _t, k=key: self._inflight.pop(k, None))
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "upstream_calls": self.upstream_calls,
+            "saved_calls": self.coalesced,
+            "overflow": self.overflow,
+            "in_flight": len(self._inflight),
+        }
+
+
+_groups: List[SingleFlight] = []
+
+
+def singleflight_stats() -> dict:
+    """Coalescing counters for every SingleFlight group, keyed by name."""
+    return {group.name: group.stats() for group in _groups}
@@ -0,0 +1,186 @@
+"""
+Speech-to-text providers.
+STT_PROVIDER selects the engine per deployment: "openai" (Whisper API) or "offline"
+(a local CPU engine in a process pool, with a bounded queue so bursts are rejected
+instead of piling up). Both share one interface: `await provider.transcribe(...)`.
+"""
+
+import asyncio
+import io
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Sequence
+import openai
+from config import settings
+from loguru import logger
+from services import offline_stt
+from services.circuit_breaker import CircuitBreaker
+from services.llm_providers import is_real_api_key
+
+
+class STTBusyError(Exception):
+    """Raised when the offline engine's queue is full."""
+
+
+class STTProvider:
+    name = "base"
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+
+    async def _transcribe(self, audio_bytes: bytes, filename: str, language: Optional[str]) -> str:
+        raise NotImplementedError
+
+    async def transcribe(self, audio_bytes: bytes, filename: str, language: Optional[str]) -> str:
+        """Transcribe one recording; `language` None or "auto" means detect."""
+        if language == "auto":
+            language = None
+        self.calls += 1
+        started = time.perf_counter()
+        try:
+            return await self._transcribe(audio_bytes, filename, language)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.total_ms += (time.perf_counter() - started) * 1000
+
+    def stats(self) -> dict:
+        return {
+            "provider": self.name,
+            "calls": self.calls,
+            "errors": self.errors,
+            "avg_ms": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+        }
+
+    def shutdown(self):
+        pass
+
+
+class OpenAIWhisperProvider(STTProvider):
+    name = "openai"
+
+    def __init__(self, api_key: str):
+        super().__init__()
+        self.client = openai.AsyncOpenAI(api_key=api_key)
+        self.breaker = CircuitBreaker("whisper")
+
+    async def _transcribe(self, audio_bytes: bytes, filename: str, language: Optional[str]) -> str:
+        audio_file = io.BytesIO(audio_bytes)
+        audio_file.name = filename
+
+        kwargs = {"model": settings.WHISPER_MODEL, "file": audio_file}
+        if language:
+            kwargs["language"] = language
+
+        transcript = await self.breaker.call(lambda: self.client.audio.transcriptions.create(**kwargs))
+        return transcript.text.strip()
+
+
+class OfflineSTTProvider(STTProvider):
+    """
+    Runs decoding and recognition in worker processes so the event loop never blocks.
+    At most `workers + queue_size` recordings are admitted; more raise STTBusyError.
+    """
+
+    name = "offline"
+
+    def __init__(self, phrases: Sequence[str], workers: int, queue_size: int, timeout: float):
+        super().__init__()
+        self.phrases = list(phrases)
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.timeout = timeout
+        self.in_flight = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a process that runs an event loop and threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+            )
+            engine = "faster-whisper" if offline_stt.FASTER_WHISPER_AVAILABLE else "deterministic stand-in"
+            logger.info(f"Offline STT: {self.workers} worker processes ({engine})")
+        return self._executor
+
+    def _release(self, _future):
+        self.in_flight -= 1
+
+    async def _transcribe(self, audio_bytes: bytes, filename: str, language: Optional[str]) -> str:
+        if self.in_flight >= self.capacity:
+            self.rejected += 1
+            raise STTBusyError(f"Offline STT queue full ({self.capacity} in flight)")
+        loop = asyncio.get_running_loop()
+        job = self._pool().submit(
+            offline_stt.recognize, audio_bytes, language, settings.STT_OFFLINE_MODEL, self.phrases,
+        )
+        self.in_flight += 1
+        # The slot is held until the worker is done with the job, not until this caller
+        # stops waiting: a timed-out recording still occupies its process
+        job.add_done_callback(lambda f: loop.call_soon_threadsafe(self._release, f))
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(job), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+
+    def stats(self) -> dict:
+        return {
+            **super().stats(),
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_provider: Optional[STTProvider] = None
+_resolved = False
+
+
+def get_stt_provider(phrases: Sequence[str]) -> Optional[STTProvider]:
+    """
+    The configured provider, built on first use. None means demo mode
+    ("openai" selected without a usable API key).
+    """
+    global _provider, _resolved
+    if not _resolved:
+        _resolved = True
+        choice = settings.STT_PROVIDER.lower()
+        if choice == "offline":
+            _provider = OfflineSTTProvider(
+                phrases,
+                workers=settings.STT_OFFLINE_WORKERS,
+                queue_size=settings.STT_OFFLINE_QUEUE,
+                timeout=settings.STT_OFFLINE_TIMEOUT_SECONDS,
+            )
+        elif choice == "openai":
+            if is_real_api_key(settings.OPENAI_API_KEY):
+                _provider = OpenAIWhisperProvider(settings.OPENAI_API_KEY)
+        else:
+            raise ValueError(f"Unknown STT_PROVIDER: {settings.STT_PROVIDER!r} (use 'openai' or 'offline')")
+    return _provider
+
+
+def stt_stats() -> dict:
+    if _provider is None:
+        return {"provider": settings.STT_PROVIDER, "active": False}
+    return _provider.stats()
+
+
+def shutdown_stt():
+    """Stop worker processes (offline provider) on app shutdown."""
+    if _provider is not None:
+        _provider.shutdown()
@@ -1,15 +1,20 @@
 """
-Whisper-based speech-to-text service.
-Falls back to demo mode if OPENAI_API_KEY is not configured or is a placeholder.
+Speech-to-text service.
+Transcribes with the provider selected by STT_PROVIDER (OpenAI Whisper or the offline
+engine). Falls back to demo mode if Whisper is selected without a real OPENAI_API_KEY.
+The offline engine is deterministic, so its errors and rejections (STTBusyError) are
+raised to the caller rather than replaced with a demo phrase.
 """
 
-import openai
-import io
+import asyncio
 import random
+import re
+import weakref
+from typing import List, Optional
 from config import settings
 from loguru import logger
-
-client = None
+from services import audio_segmenter
+from services.stt_providers import STTBusyError, STTProvider, get_stt_provider
 
 DEMO_PHRASES = [
     "Hello, I need help with my recent order.",
@@ -25,56 +30,103 @@ DEMO_PHRASES = [
 ]
 
 
-def _is_real_api_key(key: str) -> bool:
-    """Return True only if the key looks like a genuine OpenAI API key."""
-    if not key:
-        return False
-    if "your" in key.lower():
-        return False
-    if not key.startswith("sk-"):
-        return False
-    if len(key) < 30:
-        return False
-    return True
+# Per-session upload caps; a session's semaphore lives only while its uploads do
+_session_limits: "weakref.WeakValueDictionary[str, asyncio.Semaphore]" = weakref.WeakValueDictionary()
+
+_WORD_RE = re.compile(r"[^\W_]+(?:'[^\W_]+)*")
+_MAX_OVERLAP_WORDS = 12
 
 
-def _get_client():
-    global client
-    if client is None:
-        if not _is_real_api_key(settings.OPENAI_API_KEY):
-            return None
-        client = openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-    return client
+def _session_limit(session_id: Optional[str]) -> asyncio.Semaphore:
+    if session_id is None:
+        return asyncio.Semaphore(settings.STT_SESSION_CONCURRENCY)
+    sem = _session_limits.get(session_id)
+    if sem is None:
+        sem = asyncio.Semaphore(settings.STT_SESSION_CONCURRENCY)
+        _session_limits[session_id] = sem
+    return sem
 
 
-async def transcribe_audio(audio_bytes: bytes, language: str = "en") -> str:
+def _stitch(parts: List[str]) -> str:
     """
-    Transcribe raw audio bytes using OpenAI Whisper.
-    Falls back to demo phrases if API key is not configured or is a placeholder.
+    Join segment transcripts in order. Segments overlap by a fraction of a second,
+    so the longest run of words ending one part and starting the next is dropped
+    from the next.
     """
-    ai_client = _get_client()
+    out: List[str] = []
+    for part in parts:
+        words = part.split()
+        if out and words:
+            tail = [w.lower() for w in _WORD_RE.findall(" ".join(out[-_MAX_OVERLAP_WORDS:]).lower())]
+            head = [w.lower() for w in _WORD_RE.findall(" ".join(words[:_MAX_OVERLAP_WORDS]).lower())]
+            for k in range(min(len(tail), len(head)), 0, -1):
+                if tail[-k:] == head[:k]:
+                    # Drop the first k word tokens (raw words may carry punctuation)
+                    dropped, i = 0, 0
+                    while i < len(words) and dropped < k:
+                        dropped += len(_WORD_RE.findall(words[i]))
+                        i += 1
+                    words = words[i:]
+                    break
+        out.extend(words)
+    return " ".join(out)
+
+
+async def _transcribe_segmented(provider: STTProvider, audio_bytes: bytes, language: str, session_id: Optional[str]) -> Optional[str]:
+    """Split long audio at silences and transcribe the pieces concurrently; None if not split."""
+    if len(audio_bytes) < settings.STT_SEGMENT_THRESHOLD_BYTES:
+        return None
+    segments = await asyncio.to_thread(
+        audio_segmenter.segment,
+        audio_bytes,
+        settings.STT_SEGMENT_SECONDS,
+        settings.STT_SEGMENT_OVERLAP_SECONDS,
+        settings.STT_MAX_UPLOAD_BYTES,
+    )
+    if not segments:
+        return None
+
+    sem = _session_limit(session_id)
+
+    async def run(i: int, seg: bytes) -> str:
+        async with sem:
+            return await provider.transcribe(seg, f"segment-{i}.wav", language)
+
+    parts = await asyncio.gather(*(run(i, seg) for i, seg in enumerate(segments)))
+    logger.info(f"STT: {len(segments)} segments transcribed concurrently")
+    return _stitch(parts)
+
+
+async def transcribe_audio(audio_bytes: bytes, language: str = "en", session_id: Optional[str] = None) -> str:
+    """
+    Transcribe raw audio bytes with the configured STT provider.
+    Long recordings are split at silences and transcribed in parallel (at most
+    STT_SESSION_CONCURRENCY uploads per session).
+    Falls back to demo phrases if API key is not configured or is a placeholder, or
+    when Whisper fails. Raises STTBusyError when the offline engine sheds load.
+    """
+    provider = get_stt_provider(DEMO_PHRASES)
 
     # Demo mode — no real API key
-    if ai_client is None:
+    if provider is None:
         phrase = random.choice(DEMO_PHRASES)
         logger.info(f"[DEMO MODE] Simulated transcription: '{phrase}'")
         return phrase
 
     try:
-        audio_file = io.BytesIO(audio_bytes)
-        audio_file.name = "audio.webm"
-
-        kwargs = {"model": settings.WHISPER_MODEL, "file": audio_file}
-        if language and language != "auto":
-            kwargs["language"] = language
-
-        transcript = await ai_client.audio.transcriptions.create(**kwargs)
-        text = transcript.text.strip()
+        text = await _transcribe_segmented(provider, audio_bytes, language, session_id)
+        if text is None:
+            async with _session_limit(session_id):
+                text = await provider.transcribe(audio_bytes, "audio.webm", language)
         logger.info(f"STT transcription: '{text[:80]}...'")
         return text
 
+    except STTBusyError:
+        raise  # load shedding is reported to the client, never papered over
     except Exception as e:
         logger.error(f"STT error: {e}")
+        if provider.name == "offline":
+            raise
         # Fall back to demo phrase instead of returning empty string
         phrase = random.choice(DEMO_PHRASES)
         logger.info(f"[DEMO FALLBACK] Using demo phrase: '{phrase}'")
@@ -0,0 +1,134 @@
+"""
+Fused single-pass text signal scanner.
+Urgency keywords, fraud phrases and feeling cues are compiled into one token trie;
+a message is lowercased and tokenized once and every family is matched in a single walk.
+Results are cached per normalized text, so each consumer in a turn reads the same scan.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Tuple, Union
+
+# Words with optional inner apostrophes ("can't", "don't"); Unicode-aware
+_TOKEN_RE = re.compile(r"[^\W_]+(?:'[^\W_]+)*")
+
+
+class _Node:
+    __slots__ = ("children", "prefixes", "hits")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.prefixes: List[Tuple[str, "_Node"]] = []
+        self.hits: List[Tuple[str, str]] = []
+
+
+# family -> {label: [phrase, ...]}
+_families: Dict[str, Dict[str, List[str]]] = {}
+_root = _Node()
+_generation = 0
+
+
+def tokenize(text: str) -> Tuple[str, ...]:
+    """Lowercase and split text into word tokens."""
+    return tuple(_TOKEN_RE.findall(text.lower().replace("’", "'")))
+
+
+def _insert(phrase: str, family: str, label: str):
+    """
+    Add a phrase to the trie. Words are matched whole; a trailing '*' on a word
+    makes it a prefix match ("depress*" matches "depressed", "depression").
+    """
+    node = _root
+    for word in _split_prefixed(phrase):
+        if word.endswith("*"):
+            stem = word[:-1]
+            nxt = next((n for p, n in node.prefixes if p == stem), None)
+            if nxt is None:
+                nxt = _Node()
+                node.prefixes.append((stem, nxt))
+        else:
+            nxt = node.children.get(word)
+            if nxt is None:
+                nxt = node.children[word] = _Node()
+        node = nxt
+    if node is not _root and (family, label) not in node.hits:
+        node.hits.append((family, label))
+
+
+def _split_prefixed(phrase: str) -> List[str]:
+    words = []
+    for raw in phrase.split():
+        prefix = raw.endswith("*")
+        toks = tokenize(raw.rstrip("*"))
+        if prefix and toks:
+            toks = list(toks[:-1]) + [toks[-1] + "*"]
+        words.extend(toks)
+    return words
+
+
+def _rebuild():
+    global _root, _generation
+    _root = _Node()
+    for family, labels in _families.items():
+        for label, phrases in labels.items():
+            for phrase in phrases:
+                _insert(phrase, family, label)
+    _generation += 1
+
+
+def register_family(family: str, phrases: Union[Mapping[str, Iterable[str]], Iterable[str]]):
+    """
+    Register (or replace) a pattern family.
+    `phrases` is either a mapping of label -> phrases, or a flat iterable of phrases
+    where each phrase is its own label.
+    """
+    if isinstance(phrases, Mapping):
+        table = {label: list(items) for label, items in phrases.items()}
+    else:
+        table = {p: [p] for p in phrases}
+    _families[family] = table
+    _rebuild()
+
+
+def families() -> List[str]:
+    return list(_families)
+
+
+def _walk(tokens: Tuple[str, ...]) -> Dict[str, List[str]]:
+    found: Dict[str, List[str]] = {family: [] for family in _families}
+    n = len(tokens)
+    for start in range(n):
+        frontier = [_root]
+        i = start
+        while frontier and i < n:
+            tok = tokens[i]
+            nxt = []
+            for node in frontier:
+                child = node.children.get(tok)
+                if child is not None:
+                    nxt.append(child)
+                for stem, child in node.prefixes:
+                    if tok.startswith(stem):
+                        nxt.append(child)
+            for node in nxt:
+                for family, label in node.hits:
+                    labels = found[family]
+                    if label not in labels:
+                        labels.append(label)
+            frontier = nxt
+            i += 1
+    return found
+
+
+@lru_cache(maxsize=2048)
+def _scan_cached(normalized: str, generation: int) -> Dict[str, Tuple[str, ...]]:
+    found = _walk(tokenize(normalized))
+    return {family: tuple(labels) for family, labels in found.items()}
+
+
+def scan(text: str) -> Dict[str, Tuple[str, ...]]:
+    """
+    Return {family: matched labels in order of first appearance} for every
+    registered family. The result is shared between callers — treat it as read-only.
+    """
+    return _scan_cached(" ".join(tokenize(text)), _generation)
@@ -0,0 +1,183 @@
+"""
+Bulk export of conversation transcripts as NDJSON or CSV, optionally gzip-compressed.
+One query joins conversations to their messages in transcript order and is read
+through a server-side cursor EXPORT_BATCH_SIZE rows at a time (yield_per); rows are
+encoded and compressed into fixed-size chunks as they arrive, so memory stays flat
+whatever the size of the export.
+
+NDJSON: a {"type": "conversation", ...} line followed by one {"type": "message", ...}
+line per message. CSV: one row per message with the conversation columns repeated
+(a conversation without messages gets one row with empty message columns).
+
+Run from backend/:
+    python -m services.transcript_export [--format ndjson|csv] [--gzip] [--since 2026-01-01]
+        [--until 2026-02-01] [--status closed] [-o transcripts.ndjson.gz]
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import json
+import sys
+import time
+import zlib
+from datetime import date, datetime, timezone
+from typing import AsyncIterator, Optional
+from sqlalchemy import select
+from config import settings
+from loguru import logger
+from models.database import async_session
+from models.entities import Conversation, Message
+
+FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+CONVERSATION_FIELDS = ["id", "channel", "language", "status", "started_at", "ended_at",
+                       "message_count", "sentiment_avg"]
+MESSAGE_FIELDS = ["id", "role", "content", "created_at", "sentiment_score", "emotion", "is_urgent"]
+CSV_HEADER = ["conversation_" + f for f in CONVERSATION_FIELDS] + ["message_" + f for f in MESSAGE_FIELDS]
+
+_CHUNK_BYTES = 64 * 1024
+
+
+def _naive_utc(ts: Optional[datetime]) -> Optional[datetime]:
+    if ts is not None and ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def _query(start: Optional[datetime], end: Optional[datetime], status: Optional[str]):
+    start, end = _naive_utc(start), _naive_utc(end)  # stored timestamps are naive UTC
+    columns = [getattr(Conversation, f) for f in CONVERSATION_FIELDS] + [getattr(Message, f) for f in MESSAGE_FIELDS]
+    query = (
+        select(*columns)
+        .outerjoin(Message, Message.conversation_id == Conversation.id)
+        .order_by(Conversation.started_at, Conversation.id, Message.created_at)
+    )
+    if start:
+        query = query.where(Conversation.started_at >= start)
+    if end:
+        query = query.where(Conversation.started_at < end)
+    if status:
+        query = query.where(Conversation.status == status)
+    return query
+
+
+def _value(v):
+    return v.isoformat() if isinstance(v, datetime) else v
+
+
+class _NDJSONEncoder:
+    def __init__(self):
+        self._conversation = None
+
+    def header(self) -> str:
+        return ""
+
+    def row(self, row) -> str:
+        n = len(CONVERSATION_FIELDS)
+        out = []
+        if row[0] != self._conversation:
+            self._conversation = row[0]
+            out.append(json.dumps({"type": "conversation", **dict(zip(CONVERSATION_FIELDS, map(_value, row[:n])))}))
+        if row[n] is not None:
+            out.append(json.dumps({"type": "message", "conversation_id": row[0],
+                                   **dict(zip(MESSAGE_FIELDS, map(_value, row[n:])))}))
+        return "".join(line + "\n" for line in out)
+
+
+class _CSVEncoder:
+    def __init__(self):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def _take(self) -> str:
+        text = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return text
+
+    def header(self) -> str:
+        self._writer.writerow(CSV_HEADER)
+        return self._take()
+
+    def row(self, row) -> str:
+        self._writer.writerow(["" if v is None else _value(v) for v in row])
+        return self._take()
+
+
+async def stream_export(
+    fmt: str = "ndjson",
+    compress: bool = False,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    status: Optional[str] = None,
+    stats: Optional[dict] = None,
+) -> AsyncIterator[bytes]:
+    """Yield the export as byte chunks of 64 KB or more before compression. `stats` receives the row count."""
+    encoder = _NDJSONEncoder() if fmt == "ndjson" else _CSVEncoder()
+    gzip = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None  # wbits 31: gzip container
+    pending, size = [encoder.header()], 0
+    rows = 0
+
+    def flush(final: bool = False) -> bytes:
+        data = "".join(pending).encode()
+        pending.clear()
+        if gzip is not None:
+            data = gzip.compress(data) + (gzip.flush() if final else b"")
+        return data
+
+    async with async_session() as db:
+        result = await db.stream(
+            _query(start, end, status).execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+        async for partition in result.partitions():
+            for row in partition:
+                text = encoder.row(row)
+                pending.append(text)
+                size += len(text)
+            rows += len(partition)
+            if size >= _CHUNK_BYTES:
+                chunk = flush()
+                size = 0
+                if chunk:
+                    yield chunk
+    chunk = flush(final=True)
+    if chunk:
+        yield chunk
+    if stats is not None:
+        stats["rows"] = rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--format", choices=list(FORMATS), default="ndjson")
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("--since", type=date.fromisoformat, default=None,
+                        help="conversations started on or after this day (YYYY-MM-DD)")
+    parser.add_argument("--until", type=date.fromisoformat, default=None,
+                        help="conversations started before this day (YYYY-MM-DD)")
+    parser.add_argument("--status", default=None)
+    parser.add_argument("-o", "--output", default="-", help="file to write (default: stdout)")
+    args = parser.parse_args()
+
+    start = datetime.combine(args.since, datetime.min.time()) if args.since else None
+    end = datetime.combine(args.until, datetime.min.time()) if args.until else None
+
+    async def run():
+        out = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+        stats, written, started = {}, 0, time.perf_counter()
+        try:
+            async for chunk in stream_export(args.format, args.gzip, start, end, args.status, stats):
+                out.write(chunk)
+                written += len(chunk)
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+        logger.info(f"Exported {stats.get('rows', 0)} rows ({written} bytes) in {time.perf_counter() - started:.1f}s")
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Content-addressed cache for synthesized speech.
+Audio is keyed by a hash of everything that determines the bytes (text, voice, model,
+voice settings, output format) and stored on disk under a size-bounded LRU, with a
+small in-memory hot tier in front. A repeat phrase costs a dict lookup or a file read
+instead of an ElevenLabs round trip. All workers share the directory: a lookup checks
+the file itself, and the size bound is enforced against a scan of the directory.
+"""
+
+import asyncio
+import fcntl
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from config import settings
+from loguru import logger
+
+_RESCAN_SECONDS = 60.0  # how stale this worker's view of the shared directory may get
+
+
+def cache_key(text: str, voice_id: str, model_id: str, voice_settings: dict, output_format: str) -> str:
+    """Stable hash of every input that affects the synthesized audio."""
+    payload = json.dumps(
+        [text, voice_id, model_id, voice_settings, output_format],
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    def __init__(self, directory: str, max_bytes: int, memory_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.memory_bytes = memory_bytes
+
+        self._hot: "OrderedDict[str, bytes]" = OrderedDict()
+        self._hot_size = 0
+        self._index: Optional["OrderedDict[str, int]"] = None  # key -> size, oldest first
+        self._disk_size = 0
+        self._scanned_at = 0.0
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ── disk layout ──────────────────────────────────────
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.audio")
+
+    def _load_index(self):
+        """Scan the cache directory; last access (mtime) orders the LRU.
+
+        Every worker writes to the same directory, so the scan is the only size that
+        counts: it is redone before evicting and every _RESCAN_SECONDS, picking up
+        files other workers wrote (and dropping ones they evicted).
+        """
+        entries = []
+        if os.path.isdir(self.directory):
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    if name.endswith(".audio"):
+                        try:
+                            st = os.stat(os.path.join(root, name))
+                        except OSError:
+                            continue  # evicted by another worker mid-scan
+                        entries.append((st.st_mtime, name[:-len(".audio")], st.st_size))
+        entries.sort()
+        self._index = OrderedDict((key, size) for _, key, size in entries)
+        self._disk_size = sum(size for _, _, size in entries)
+        self._scanned_at = time.monotonic()
+
+    def _ensure_index(self):
+        if self._index is None:
+            self._load_index()
+            logger.info(f"TTS cache: {len(self._index)} entries, {self._disk_size / 1e6:.1f}MB in {self.directory}")
+
+    def _evict(self):
+        """Rescan the directory and remove least recently used files until it fits max_bytes."""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, ".evict.lock"), "w") as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return  # another worker is evicting from the same directory
+            try:
+                self._load_index()
+                while self._disk_size > self.max_bytes and len(self._index) > 1:
+                    old_key, size = self._index.popitem(last=False)
+                    self._disk_size -= size
+                    self.evictions += 1
+                    try:
+                        os.remove(self._path(old_key))
+                    except OSError:
+                        pass
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    # ── hot tier ─────────────────────────────────────────
+    def _remember(self, key: str, audio: bytes):
+        if len(audio) > self.memory_bytes:
+            return
+        old = self._hot.pop(key, None)
+        if old is not None:
+            self._hot_size -= len(old)
+        self._hot[key] = audio
+        self._hot_size += len(audio)
+        while self._hot_size > self.memory_bytes:
+            _, evicted = self._hot.popitem(last=False)
+            self._hot_size -= len(evicted)
+
+    # ── blocking disk operations (run off the event loop) ──
+    def _read(self, key: str) -> Optional[bytes]:
+        # The file, not this process's index, decides: another worker may have written it
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+            os.utime(path)  # touch: keeps LRU order across restarts and workers
+        except OSError:
+            with self._lock:
+                if self._index is not None and key in self._index:
+                    self._disk_size -= self._index.pop(key)
+            return None
+        with self._lock:
+            self._ensure_index()
+            if key not in self._index:
+                self._disk_size += len(audio)
+            self._index[key] = len(audio)
+            self._index.move_to_end(key)
+        return audio
+
+    def _write(self, key: str, audio: bytes):
+        with self._lock:
+            self._ensure_index()
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(audio)
+            os.replace(tmp, path)  # readers never see a partial file
+
+            self._disk_size -= self._index.pop(key, 0)
+            self._index[key] = len(audio)
+            self._disk_size += len(audio)
+            if self._disk_size > self.max_bytes or time.monotonic() - self._scanned_at > _RESCAN_SECONDS:
+                self._evict()
+
+    # ── public API ───────────────────────────────────────
+    async def get(self, key: str) -> Optional[bytes]:
+        audio = self._hot.get(key)
+        if audio is not None:
+            self._hot.move_to_end(key)
+            self.memory_hits += 1
+            return audio
+        audio = await asyncio.to_thread(self._read, key)
+        if audio is None:
+            self.misses += 1
+            return None
+        self.disk_hits += 1
+        self._remember(key, audio)
+        return audio
+
+    async def put(self, key: str, audio: bytes):
+        if not audio:
+            return
+        self._remember(key, audio)
+        try:
+            await asyncio.to_thread(self._write, key, audio)
+        except OSError as e:
+            logger.warning(f"TTS cache write failed: {e}")
+
+    async def contains(self, key: str) -> bool:
+        if key in self._hot:
+            return True
+        return await asyncio.to_thread(os.path.exists, self._path(key))
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+            "memory_entries": len(self._hot),
+            "memory_bytes": self._hot_size,
+            "disk_entries": len(self._index) if self._index is not None else None,
+            "disk_bytes": self._disk_size if self._index is not None else None,
+            "evictions": self.evictions,
+        }
+
+
+tts_cache = TTSCache(
+    settings.TTS_CACHE_DIR,
+    max_bytes=int(settings.TTS_CACHE_MAX_MB * 1024 * 1024),
+    memory_bytes=int(settings.TTS_CACHE_MEMORY_MB * 1024 * 1024),
+)
@@ -0,0 +1,140 @@
+"""
+Pre-synthesize canned responses into the TTS cache.
+Collects every fixed reply the assistant can speak — conversational responses and the
+data pack's support / emotion / capital / knowledge answers — and synthesizes the ones
+not cached yet, so their first use is a cache hit. (Twilio calls are voiced by Twilio's
+own <Say>, so their prompts never go through ElevenLabs and aren't prewarmed.)
+
+Every worker starts it when TTS_PREWARM_ON_STARTUP is set, but only one prewarms at a
+time (an exclusive lock on TTS_CACHE_DIR/.prewarm.lock); the others skip the run, so
+ElevenLabs is paid once per phrase.
+
+Run at startup (TTS_PREWARM_ON_STARTUP) or from the command line (from backend/):
+    python -m services.tts_prewarm [--groups conversational,support] [--dry-run]
+"""
+
+import argparse
+import asyncio
+import fcntl
+import os
+from typing import Dict, Iterable, List, Optional
+from config import settings
+from loguru import logger
+from services import ai_service
+from services.response_pack import get_pack
+from services.tts_cache import cache_key, tts_cache
+from services.tts_service import TTS_MODEL_ID, TTS_OUTPUT_FORMAT, TTS_VOICE_SETTINGS, synthesize_speech
+
+GROUPS = ("conversational", "support", "emotions", "capitals", "knowledge")
+
+
+def _flatten(values: Iterable) -> List[str]:
+    out = []
+    for v in values:
+        out.extend(v if isinstance(v, list) else [v])
+    return out
+
+
+def canned_phrases(groups: Iterable[str] = GROUPS) -> Dict[str, List[str]]:
+    """Fixed phrases per group, de-duplicated across groups in order."""
+    pack = get_pack()
+    sources = {
+        "conversational": lambda: (
+            ai_service._GREETING_RESPONSES + ai_service._HOWAREYOU_RESPONSES + ai_service._THANKS_RESPONSES
+            + ai_service._GOODBYE_RESPONSES + ai_service._AFFIRMATIVE_RESPONSES
+            + ai_service._NEGATIVE_RESPONSES + ai_service._FALLBACK
+        ),
+        "support": lambda: _flatten(pack.support.values()),
+        "emotions": lambda: _flatten(pack.emotions.values()),
+        "capitals": lambda: list(pack.capitals.values()),
+        "knowledge": lambda: _flatten(pack.knowledge.values()),
+    }
+
+    seen = set()
+    phrases: Dict[str, List[str]] = {}
+    for group in groups:
+        if group not in sources:
+            raise ValueError(f"Unknown prewarm group: {group!r} (choose from {', '.join(GROUPS)})")
+        unique = []
+        for text in sources[group]():
+            if text not in seen:
+                seen.add(text)
+                unique.append(text)
+        phrases[group] = unique
+    return phrases
+
+
+async def prewarm(
+    groups: Iterable[str] = GROUPS,
+    voice_id: Optional[str] = None,
+    concurrency: int = None,
+) -> dict:
+    """Synthesize every uncached canned phrase. Returns counts per outcome."""
+    voice_id = voice_id or settings.ELEVENLABS_VOICE_ID
+    concurrency = concurrency or settings.TTS_PREWARM_CONCURRENCY
+    result = {"cached": 0, "synthesized": 0, "failed": 0, "chars": 0}
+    if not settings.ELEVENLABS_API_KEY or not settings.TTS_CACHE_ENABLED:
+        logger.info("TTS prewarm skipped (no ElevenLabs key or cache disabled)")
+        return result
+
+    os.makedirs(settings.TTS_CACHE_DIR, exist_ok=True)
+    with open(os.path.join(settings.TTS_CACHE_DIR, ".prewarm.lock"), "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            logger.info("TTS prewarm: another worker is prewarming, skipping this run")
+            return result
+        try:
+            await _prewarm(groups, voice_id, concurrency, result)
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+    return result
+
+
+async def _prewarm(groups: Iterable[str], voice_id: str, concurrency: int, result: dict):
+    sem = asyncio.Semaphore(concurrency)
+
+    async def warm(text: str):
+        key = cache_key(text, voice_id, TTS_MODEL_ID, TTS_VOICE_SETTINGS, TTS_OUTPUT_FORMAT)
+        if await tts_cache.contains(key):
+            result["cached"] += 1
+            return
+        async with sem:
+            audio = await synthesize_speech(text, voice_id)
+        if audio:
+            result["synthesized"] += 1
+            result["chars"] += len(text)
+        else:
+            result["failed"] += 1
+
+    texts = [t for phrases in canned_phrases(groups).values() for t in phrases]
+    await asyncio.gather(*(warm(t) for t in texts))
+    logger.info(
+        f"TTS prewarm: {result['synthesized']} synthesized ({result['chars']} chars), "
+        f"{result['cached']} already cached, {result['failed']} failed"
+    )
+
+
+def parse_groups(value: str) -> List[str]:
+    return list(GROUPS) if value == "all" else [g.strip() for g in value.split(",") if g.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--groups", default=settings.TTS_PREWARM_GROUPS,
+                        help=f"comma-separated groups or 'all' ({', '.join(GROUPS)})")
+    parser.add_argument("--voice-id", default=None)
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--dry-run", action="store_true", help="list phrase counts and characters only")
+    args = parser.parse_args()
+
+    groups = parse_groups(args.groups)
+    if args.dry_run:
+        for group, phrases in canned_phrases(groups).items():
+            print(f"{group:<16}{len(phrases):>6} phrases{sum(map(len, phrases)):>9} chars")
+        return
+    asyncio.run(prewarm(groups, args.voice_id, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,43 @@ import httpx
 import base64
 from config import settings
 from loguru import logger
+from services.circuit_breaker import CircuitBreaker
+from services.singleflight import SingleFlight
+from services.tts_cache import cache_key, tts_cache
+
+TTS_MODEL_ID = "eleven_multilingual_v2"
+TTS_OUTPUT_FORMAT = "audio/mpeg"
+TTS_VOICE_SETTINGS = {
+    "stability": 0.5,
+    "similarity_boost": 0.75,
+    "style": 0.5,
+    "use_speaker_boost": True,
+}
+
+_tts_flight = SingleFlight("tts")
+_tts_breaker = CircuitBreaker("elevenlabs")
+
+
+async def _request_speech(text: str, voice_id: str) -> bytes:
+    url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
+
+    headers = {
+        "xi-api-key": settings.ELEVENLABS_API_KEY,
+        "Content-Type": "application/json",
+        "Accept": TTS_OUTPUT_FORMAT,
+    }
+
+    payload = {
+        "text": text,
+        "model_id": TTS_MODEL_ID,
+        "voice_settings": TTS_VOICE_SETTINGS,
+    }
+
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        response = await client.post(url, headers=headers, json=payload)
+        response.raise_for_status()
+        logger.info(f"TTS synthesized {len(response.content)} bytes")
+        return response.content
 
 
 async def synthesize_speech(text: str, voice_id: str = None) -> bytes:
@@ -19,31 +56,21 @@ async def synthesize_speech(text: str, voice_id: str = None) -> bytes:
         logger.warning("ELEVENLABS_API_KEY not set — TTS disabled")
         return b""
 
+    key = cache_key(text, voice_id, TTS_MODEL_ID, TTS_VOICE_SETTINGS, TTS_OUTPUT_FORMAT)
+    if settings.TTS_CACHE_ENABLED:
+        cached = await tts_cache.get(key)
+        if cached is not None:
+            return cached
+
+    async def _synthesize() -> bytes:
+        # An open breaker fails fast instead of waiting out the 30s timeout on every turn
+        audio = await _tts_breaker.call(lambda: _request_speech(text, voice_id))
+        if settings.TTS_CACHE_ENABLED:
+            await tts_cache.put(key, audio)
+        return audio
+
     try:
-        url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
-
-        headers = {
-            "xi-api-key": settings.ELEVENLABS_API_KEY,
-            "Content-Type": "application/json",
-            "Accept": "audio/mpeg",
-        }
-
-        payload = {
-            "text": text,
-            "model_id": "eleven_multilingual_v2",
-            "voice_settings": {
-                "stability": 0.5,
-                "similarity_boost": 0.75,
-                "style": 0.5,
-                "use_speaker_boost": True,
-            },
-        }
-
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            logger.info(f"TTS synthesized {len(response.content)} bytes")
-            return response.content
+        return await _tts_flight.do(key, _synthesize)
 
     except Exception as e:
         logger.error(f"TTS error: {e}")
@@ -8,6 +8,7 @@ import numpy as np
 from typing import List, Optional
 from config import settings
 from loguru import logger
+from services.circuit_breaker import CircuitBreaker
 
 try:
     import faiss
@@ -20,6 +21,7 @@ except ImportError:
 _index: Optional[object] = None
 _documents: List[dict] = []
 _dimension = 1536  # text-embedding-3-small dimension
+_embedding_breaker = CircuitBreaker("openai_embeddings")
 
 
 def _ensure_dir():
@@ -30,10 +32,10 @@ async def _get_embedding(text: str) -> List[float]:
     """Get embedding from OpenAI."""
     import openai
     client = openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-    response = await client.embeddings.create(
+    response = await _embedding_breaker.call(lambda: client.embeddings.create(
         model="text-embedding-3-small",
         input=text,
-    )
+    ))
     return response.data[0].embedding
 
 
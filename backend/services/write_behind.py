@@ -0,0 +1,354 @@
+"""
+Write-behind persistence for conversation turns.
+Request handlers hand their rows (conversation, messages, analytics events and the
+sentiment aggregate update) to a bounded in-process queue and return immediately. A
+single background writer groups queued turns from all sessions and commits them as
+multi-row INSERTs, flushing every WRITE_BEHIND_FLUSH_MS or once WRITE_BEHIND_MAX_ROWS
+rows are waiting. A full queue makes producers wait (backpressure) instead of growing
+without bound, and shutdown drains everything still queued.
+
+Turns are acknowledged before they are written, so a failed write never just drops
+them. Transient errors (connection loss, "database is locked", pool timeouts) retry the
+batch with capped exponential backoff for up to WRITE_BEHIND_RETRY_MAX_SECONDS while
+new turns wait in the queue. A batch that fails otherwise (e.g. an integrity error) is
+retried turn by turn to isolate the bad one; turns that still can't be written are
+appended to the WRITE_BEHIND_DEAD_LETTER_PATH file, replayed once the cause is fixed:
+    python -m services.write_behind --replay
+
+Rows become visible to readers up to one flush interval after the reply is sent.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import exc, insert
+from config import settings
+from loguru import logger
+from models.database import async_session
+from models.entities import AnalyticsEvent, Conversation, Message
+from services import analytics_cache
+from services.analytics_rollups import record_writes
+from services.conversation_aggregates import add_message_counts, turn_update
+
+
+def conversation_row(conversation_id: str, channel: str = "web", language: str = "en") -> dict:
+    """A complete conversations row (started_at fixed here so its rollup bucket is known)."""
+    return {
+        "id": conversation_id,
+        "channel": channel,
+        "language": language,
+        "status": "active",
+        "started_at": datetime.utcnow(),
+    }
+
+
+def message_row(
+    conversation_id: str,
+    role: str,
+    content: str,
+    created_at: Optional[datetime] = None,
+    sentiment: Optional[dict] = None,
+) -> dict:
+    """A complete messages row; every row carries every column so batches share one INSERT."""
+    sentiment = sentiment or {}
+    return {
+        "id": str(uuid.uuid4()),
+        "conversation_id": conversation_id,
+        "role": role,
+        "content": content,
+        "sentiment_score": sentiment.get("sentiment_score"),
+        "emotion": sentiment.get("emotion"),
+        "is_urgent": bool(sentiment.get("is_urgent", False)),
+        "audio_url": None,
+        "created_at": created_at or datetime.utcnow(),
+    }
+
+
+def event_row(event_type: str, data: dict, conversation_id: str) -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "event_type": event_type,
+        "event_data": json.dumps(data),
+        "conversation_id": conversation_id,
+        "created_at": datetime.utcnow(),
+    }
+
+
+class _Turn:
+    __slots__ = ("conversations", "messages", "events", "aggregates")
+
+    def __init__(self, conversations, messages, events, aggregates):
+        self.conversations: List[dict] = conversations
+        self.messages: List[dict] = messages
+        self.events: List[dict] = events
+        self.aggregates: List[Tuple[str, dict]] = aggregates
+
+    @property
+    def rows(self) -> int:
+        return len(self.conversations) + len(self.messages) + len(self.events)
+
+    def to_record(self, error: Exception) -> dict:
+        return {
+            "failed_at": datetime.utcnow().isoformat(),
+            "error": str(error),
+            "conversations": self.conversations,
+            "messages": self.messages,
+            "events": self.events,
+            "aggregates": self.aggregates,
+        }
+
+    @classmethod
+    def from_record(cls, record: dict) -> "_Turn":
+        def rows(key: str, column: str) -> List[dict]:
+            return [{**r, column: datetime.fromisoformat(r[column])} for r in record[key]]
+
+        return cls(
+            rows("conversations", "started_at"),
+            rows("messages", "created_at"),
+            rows("events", "created_at"),
+            [tuple(a) for a in record["aggregates"]],
+        )
+
+
+_STOP = object()
+_RETRY_BASE_SECONDS = 0.1
+_RETRY_MAX_DELAY_SECONDS = 5.0
+
+
+def _is_transient(e: Exception) -> bool:
+    """Errors worth retrying as-is: the database was unavailable, not the rows at fault."""
+    if isinstance(e, exc.DBAPIError):
+        return isinstance(e, (exc.OperationalError, exc.InterfaceError)) or e.connection_invalidated
+    return isinstance(e, (exc.TimeoutError, ConnectionError, asyncio.TimeoutError, OSError))
+
+
+class WriteBehindQueue:
+    def __init__(self, max_items: int, flush_ms: float, max_rows: int):
+        self.max_items = max_items
+        self.flush_seconds = flush_ms / 1000
+        self.max_rows = max_rows
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.enqueued = 0
+        self.backpressure_waits = 0
+        self.batches = 0
+        self.flushed_items = 0
+        self.flushed_rows = 0
+        self.retries = 0
+        self.dead_lettered = 0
+        self.failed_items = 0
+        self.total_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+
+    # ── lifecycle ────────────────────────────────────────
+    def start(self):
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.max_items)
+            self._task = asyncio.create_task(self._run())
+            logger.info(
+                f"Write-behind persistence: flush every {self.flush_seconds * 1000:.0f}ms "
+                f"or {self.max_rows} rows, queue {self.max_items} turns"
+            )
+
+    async def stop(self):
+        """Flush everything still queued, then stop the writer."""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        await self._queue.put(_STOP)
+        await task
+        # Producers that were waiting on a full queue may have queued behind the stop marker
+        leftover = []
+        while not self._queue.empty():
+            leftover.append(self._queue.get_nowait())
+        if leftover:
+            await self._flush(leftover)
+        logger.info(
+            f"Write-behind drained: {self.flushed_items} turns written, "
+            f"{self.dead_lettered} dead-lettered, {self.failed_items} lost"
+        )
+
+    # ── producer side ────────────────────────────────────
+    async def persist(
+        self,
+        conversations: Iterable[dict] = (),
+        messages: Iterable[dict] = (),
+        events: Iterable[dict] = (),
+        aggregates: Iterable[Tuple[str, dict]] = (),
+    ):
+        """
+        Queue one turn's rows, written together in one transaction. Returns once queued
+        (waits only while the queue is full). When the writer isn't running the turn is
+        written directly and a failure raises to the caller.
+        """
+        turn = _Turn(list(conversations), list(messages), list(events), list(aggregates))
+        if self._task is None:
+            started = time.perf_counter()
+            await self._write([turn])
+            await self._written([turn], started)
+            return
+        self.enqueued += 1
+        if self._queue.full():
+            self.backpressure_waits += 1
+        await self._queue.put(turn)
+
+    # ── writer ───────────────────────────────────────────
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            first = await self._queue.get()
+            if first is _STOP:
+                return
+            batch, rows, stopping = [first], first.rows, False
+            deadline = loop.time() + self.flush_seconds
+            while rows < self.max_rows:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    turn = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if turn is _STOP:
+                    stopping = True
+                    break
+                batch.append(turn)
+                rows += turn.rows
+            await self._flush(batch)
+            if stopping:
+                return
+
+    async def _write(self, batch: List[_Turn]):
+        conversations = [r for t in batch for r in t.conversations]
+        messages = [r for t in batch for r in t.messages]
+        async with async_session() as db:
+            # Parents first: a turn's conversation row may be in the same batch
+            for model, rows in (
+                (Conversation, conversations),
+                (Message, messages),
+                (AnalyticsEvent, [r for t in batch for r in t.events]),
+            ):
+                if rows:
+                    await db.execute(insert(model), rows)
+            await add_message_counts(db, (r["conversation_id"] for r in messages))
+            await record_writes(db, conversations, messages)
+            for conversation_id, sentiment in (a for t in batch for a in t.aggregates):
+                await db.execute(turn_update(conversation_id, sentiment))
+            await db.commit()
+
+    async def _flush(self, batch: List[_Turn]):
+        started = time.perf_counter()
+        deadline = time.monotonic() + settings.WRITE_BEHIND_RETRY_MAX_SECONDS
+        delay = _RETRY_BASE_SECONDS
+        while True:
+            try:
+                await self._write(batch)
+                break
+            except Exception as e:
+                if _is_transient(e) and time.monotonic() + delay < deadline:
+                    # The batch stays with the writer; new turns wait in the queue meanwhile
+                    self.retries += 1
+                    logger.warning(f"Write-behind: batch of {len(batch)} turns failed ({e}); retrying in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, _RETRY_MAX_DELAY_SECONDS)
+                    continue
+                if len(batch) > 1 and not _is_transient(e):
+                    # Isolate the bad turn so one conflict doesn't hold back the whole batch
+                    logger.warning(f"Write-behind: batch of {len(batch)} failed ({e}); retrying turn by turn")
+                    for turn in batch:
+                        await self._flush([turn])
+                    return
+                self._dead_letter(batch, e)
+                return
+        await self._written(batch, started)
+
+    def _dead_letter(self, batch: List[_Turn], error: Exception):
+        """Append turns that can't be written to the dead-letter file for a later replay."""
+        path = settings.WRITE_BEHIND_DEAD_LETTER_PATH
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "a") as f:
+                for turn in batch:
+                    f.write(json.dumps(turn.to_record(error), default=datetime.isoformat) + "\n")
+        except OSError as e:
+            self.failed_items += len(batch)
+            logger.error(f"Write-behind: lost {len(batch)} turns ({error}); dead-letter write failed: {e}")
+            return
+        self.dead_lettered += len(batch)
+        logger.error(f"Write-behind: {len(batch)} turns failed to persist ({error}); saved to {path}")
+
+    async def replay_dead_letters(self) -> dict:
+        """Write the dead-lettered turns; those that fail again go back to the file."""
+        path = settings.WRITE_BEHIND_DEAD_LETTER_PATH
+        replaying = path + ".replaying"
+        if not os.path.exists(replaying):  # otherwise an interrupted replay is finished first
+            if not os.path.exists(path):
+                return {"replayed": 0, "failed": 0}
+            os.replace(path, replaying)
+        replayed, failed = [], 0
+        with open(replaying) as f:
+            for line in f:
+                turn = _Turn.from_record(json.loads(line))
+                try:
+                    await self._write([turn])
+                    replayed.append(turn)
+                except Exception as e:
+                    self._dead_letter([turn], e)
+                    failed += 1
+        os.remove(replaying)
+        if replayed:
+            await analytics_cache.bump()
+        logger.info(f"Write-behind: replayed {len(replayed)} dead-lettered turns, {failed} failed again")
+        return {"replayed": len(replayed), "failed": failed}
+
+    async def _written(self, batch: List[_Turn], started: float):
+        elapsed = (time.perf_counter() - started) * 1000
+        await analytics_cache.bump()
+        self.batches += 1
+        self.flushed_items += len(batch)
+        self.flushed_rows += sum(t.rows for t in batch)
+        self.total_flush_ms += elapsed
+        self.max_flush_ms = max(self.max_flush_ms, elapsed)
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "enqueued": self.enqueued,
+            "backpressure_waits": self.backpressure_waits,
+            "batches": self.batches,
+            "flushed_turns": self.flushed_items,
+            "flushed_rows": self.flushed_rows,
+            "retries": self.retries,
+            "dead_lettered_turns": self.dead_lettered,
+            "failed_turns": self.failed_items,
+            "avg_batch_rows": round(self.flushed_rows / self.batches, 1) if self.batches else 0.0,
+            "avg_flush_ms": round(self.total_flush_ms / self.batches, 3) if self.batches else 0.0,
+            "max_flush_ms": round(self.max_flush_ms, 3),
+        }
+
+
+write_behind = WriteBehindQueue(
+    max_items=settings.WRITE_BEHIND_QUEUE_SIZE,
+    flush_ms=settings.WRITE_BEHIND_FLUSH_MS,
+    max_rows=settings.WRITE_BEHIND_MAX_ROWS,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--replay", action="store_true", help="write the turns in the dead-letter file")
+    args = parser.parse_args()
+    if not args.replay:
+        parser.error("nothing to do: pass --replay")
+    asyncio.run(write_behind.replay_dead_letters())
+
+
+if __name__ == "__main__":
+    main()